@@ -0,0 +1,117 @@
+"""
+Load test of the sync (FlaskApp, thread per request) and async (AsyncApp, awaited SRM calls) handlers.
+
+Each app is served by uvicorn in a subprocess and pointed at a stub SRM (also a uvicorn subprocess) with an artificial latency;
+the load generator keeps --concurrency requests in flight and reports requests/sec and latency percentiles.
+
+Usage:
+    python -m benchmarks.async_load_benchmark [--requests 1000] [--concurrency 50] [--srm-latency 0.2] [--path /edge-cloud-zones]
+"""
+
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import time
+import httpx
+
+APP_FACTORIES = {
+    "sync": "edge_cloud_management_api.app:get_app_instance",
+    "async": "edge_cloud_management_api.app:get_async_app_instance",
+}
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(factory, port, **env_overrides):
+    env = dict(os.environ, **env_overrides)
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "--factory", factory, "--port", str(port), "--log-level", "warning", "--no-access-log"],
+        env=env,
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.2):
+                return process
+        except OSError:
+            time.sleep(0.1)
+    process.kill()
+    raise RuntimeError(f"{factory} did not start listening on port {port}")
+
+
+async def generate_load(url, total, concurrency):
+    latencies = []
+    errors = 0
+    queue = asyncio.Queue()
+    for _ in range(total):
+        queue.put_nowait(None)
+
+    async def worker(client):
+        nonlocal errors
+        while not queue.empty():
+            queue.get_nowait()
+            start = time.perf_counter()
+            try:
+                response = await client.get(url)
+                if response.status_code != 200:
+                    errors += 1
+            except httpx.HTTPError:
+                errors += 1
+            latencies.append(time.perf_counter() - start)
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(limits=limits, timeout=120) as client:
+        await client.get(url)  # warm-up: spec parsing and first SRM connection are not part of the measurement
+        start = time.perf_counter()
+        await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+    return latencies, errors, elapsed
+
+
+def report(label, latencies, errors, elapsed):
+    latencies.sort()
+
+    def percentile(p):
+        return latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000
+
+    print(
+        f"{label:<6} {len(latencies) / elapsed:8.1f} req/s  p50={percentile(0.50):7.1f}ms  "
+        f"p99={percentile(0.99):7.1f}ms  max={latencies[-1] * 1000:7.1f}ms  errors={errors}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--srm-latency", type=float, default=0.2, help="seconds the stub SRM sleeps per request")
+    parser.add_argument("--path", default="/edge-cloud-zones")
+    args = parser.parse_args()
+
+    srm_port = free_port()
+    srm = start_server("benchmarks.stub_srm:make_asgi_app", srm_port, STUB_SRM_LATENCY=str(args.srm_latency))
+    try:
+        for label, factory in APP_FACTORIES.items():
+            port = free_port()
+            # the SRM read cache would hide the cost of the SRM calls this benchmark is about
+            server = start_server(factory, port, SRM_HOST=f"http://127.0.0.1:{srm_port}", SRM_CACHE_BACKEND="none")
+            try:
+                latencies, errors, elapsed = asyncio.run(generate_load(f"http://127.0.0.1:{port}{args.path}", args.requests, args.concurrency))
+                report(label, latencies, errors, elapsed)
+            finally:
+                server.terminate()
+                server.wait()
+    finally:
+        srm.terminate()
+        srm.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+Wall time of deploying an app to many zones: one SRM call after the other (one POST /appinstances per zone) against
+the capped concurrent fan-out behind POST /appinstances/batch.
+
+Usage:
+    python -m benchmarks.batch_deploy_benchmark [--zones 50] [--latency 0.05] [--concurrency 1 4 8 16]
+"""
+
+import argparse
+import time
+import uuid
+from benchmarks.stub_srm import StubSRM
+from edge_cloud_management_api.services.batch_deployment import batch_summary, deploy_zones, zone_deployments
+from edge_cloud_management_api.services.pi_edge_services import PiEdgeAPIClientFactory
+
+
+def batch_body(zones):
+    return {
+        "name": "instance_1",
+        "appId": str(uuid.UUID(int=1)),
+        "appZones": [{"EdgeCloudZone": {"edgeCloudZoneId": str(uuid.UUID(int=i))}, "kubernetesClusterRef": str(uuid.UUID(int=i % 7))} for i in range(zones)],
+    }
+
+
+def timed(label, deploy_all):
+    start = time.perf_counter()
+    results = deploy_all()
+    elapsed = time.perf_counter() - start
+    summary = batch_summary(results)
+    print(f"{label:<28} wall={elapsed * 1000:8.1f}ms succeeded={summary['succeeded']} failed={summary['failed']}")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--zones", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.05, help="artificial SRM latency per request, in seconds")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[4, 8, 16])
+    args = parser.parse_args()
+
+    with StubSRM(latency=args.latency) as srm:
+        api_client = PiEdgeAPIClientFactory().create_pi_edge_api_client(base_url=srm.base_url, username="", password="")
+        payloads = zone_deployments(batch_body(args.zones), max_zones=args.zones)
+        deploy = api_client.deploy_service_function
+        deploy(payloads[0])  # warm-up: open the first pooled connection
+
+        serial = timed("serial", lambda: deploy_zones(deploy, payloads, max_concurrency=1))
+        for concurrency in args.concurrency:
+            elapsed = timed(f"batch, {concurrency} in flight", lambda: deploy_zones(deploy, payloads, max_concurrency=concurrency))
+            print(f"{'':<28} speed-up x{serial / elapsed:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Cold start of a worker: import the package, build the app and serve the first request, each in a fresh interpreter,
+without the OpenAPI spec cache and with a warm one.
+
+Usage:
+    python -m benchmarks.cold_start_benchmark [--runs 5]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+# run in the child interpreter; prints its timings as JSON
+CHILD = """
+import json, time
+started = time.perf_counter()
+from edge_cloud_management_api.app import get_app_instance
+imported = time.perf_counter()
+app = get_app_instance()
+built = time.perf_counter()
+status = app.test_client().get("/deployment-jobs/unknown").status_code
+served = time.perf_counter()
+print(json.dumps({"import": imported - started, "build": built - imported, "first_request": served - built, "status": status}))
+"""
+
+
+def cold_start(spec_cache: bool, cache_dir: str) -> dict:
+    env = {**os.environ, "MONGO_URI": "", "SPEC_CACHE_ENABLED": str(spec_cache).lower(), "SPEC_CACHE_DIR": cache_dir}
+    started = time.perf_counter()
+    output = subprocess.run([sys.executable, "-c", CHILD], env=env, capture_output=True, text=True, check=True).stdout
+    timings = json.loads(output.strip().splitlines()[-1])
+    timings["process"] = time.perf_counter() - started
+    return timings
+
+
+def report(label, runs):
+    columns = ("import", "build", "first_request", "process")
+    medians = {column: statistics.median(run[column] for run in runs) * 1000 for column in columns}
+    print(f"{label:<22} " + "  ".join(f"{column}={medians[column]:7.1f}ms" for column in columns))
+    return medians
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        uncached = report("no spec cache", [cold_start(False, cache_dir) for _ in range(args.runs)])
+        report("spec cache, first boot", [cold_start(True, cache_dir)])
+        cached = report("spec cache, warm", [cold_start(True, cache_dir) for _ in range(args.runs)])
+    print(f"{'':<22} build x{uncached['build'] / cached['build']:.1f} faster, process {uncached['process'] - cached['process']:.0f}ms less")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Encode and decode throughput of the SRM /serviceFunction and /deployedServiceFunction listings: the stdlib json module
+as requests' response.json() and Flask's jsonify use it, against the JSON codecs of managers/json_provider.
+
+Usage:
+    python -m benchmarks.json_benchmark [--items 1000] [--rounds 50]
+"""
+
+import argparse
+import json
+import time
+from benchmarks.stub_srm import make_app_instances, make_service_functions
+from edge_cloud_management_api.managers.json_provider import STDLIB_JSON, build_json_codec
+
+
+def best_seconds(fn, rounds):
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=1000, help="elements of each listing")
+    parser.add_argument("--rounds", type=int, default=50)
+    args = parser.parse_args()
+
+    codecs = [STDLIB_JSON]
+    try:
+        codecs.append(build_json_codec("orjson"))
+    except RuntimeError:
+        print("orjson is not installed, measuring the stdlib codec only")
+
+    payloads = {"/serviceFunction": make_service_functions(args.items), "/deployedServiceFunction": make_app_instances(args.items)}
+    print(f"{'payload':<26} {'json':<16} {'size':>8} {'encode':>10} {'decode':>10}")
+    for path, payload in payloads.items():
+        raw = json.dumps(payload).encode()
+        megabytes = len(raw) / 1e6
+        # Flask's jsonify (sorted keys) and requests' response.json() (bytes decoded to str first)
+        encode = best_seconds(lambda: json.dumps(payload, sort_keys=True, separators=(",", ":")).encode(), args.rounds)
+        decode = best_seconds(lambda: json.loads(raw.decode()), args.rounds)
+        print(f"{path:<26} {'json module':<16} {megabytes:6.2f}MB {megabytes / encode:7.0f}MB/s {megabytes / decode:7.0f}MB/s")
+        for codec in codecs:
+            encode = best_seconds(lambda: codec.dumps(payload, sort_keys=True), args.rounds)
+            decode = best_seconds(lambda: codec.loads(raw), args.rounds)
+            print(f"{path:<26} {'codec ' + codec.name:<16} {megabytes:6.2f}MB {megabytes / encode:7.0f}MB/s {megabytes / decode:7.0f}MB/s")
+
+
+if __name__ == "__main__":
+    main()
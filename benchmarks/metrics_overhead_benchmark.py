@@ -0,0 +1,69 @@
+"""
+Cost of the metrics on the request path: one Counter.inc and Histogram.observe, the MetricsMiddleware around a
+trivial ASGI application, and rendering a scrape. Exits 1 when the per-request overhead exceeds the budget.
+
+Usage:
+    python -m benchmarks.metrics_overhead_benchmark [--requests 50000] [--budget-us 25]
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from edge_cloud_management_api.managers.metrics_manager import Counter, Histogram, MetricsMiddleware, Registry, registry
+
+
+def per_call_ns(fn, calls):
+    start = time.perf_counter_ns()
+    for _ in range(calls):
+        fn()
+    return (time.perf_counter_ns() - start) / calls
+
+
+async def application(scope, receive, send):
+    scope.setdefault("extensions", {})["connexion_routing"] = {"operation_id": "edge_cloud_management_api.controllers.app_controllers.get_apps"}
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"[]"})
+
+
+async def per_request_us(app, requests):
+    async def send(message):
+        pass
+
+    start = time.perf_counter()
+    for _ in range(requests):
+        await app({"type": "http", "path": "/apps", "method": "GET"}, None, send)
+    return (time.perf_counter() - start) / requests * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=50000)
+    parser.add_argument("--budget-us", type=float, default=25.0, help="allowed middleware overhead per request, in microseconds")
+    args = parser.parse_args()
+
+    scratch = Registry()
+    counter = scratch.register(Counter("bench_requests_total", "Requests", ("operation", "method", "status")))
+    histogram = scratch.register(Histogram("bench_latency_seconds", "Latency", ("operation", "method")))
+    print(f"{'Counter.inc':<28} {per_call_ns(lambda: counter.inc('get_apps', 'GET', '200'), args.requests):8.0f} ns")
+    print(f"{'Histogram.observe':<28} {per_call_ns(lambda: histogram.observe(0.012, 'get_apps', 'GET'), args.requests):8.0f} ns")
+
+    bare = asyncio.run(per_request_us(application, args.requests))
+    measured = asyncio.run(per_request_us(MetricsMiddleware(application), args.requests))
+    overhead = measured - bare
+    print(f"{'request, bare':<28} {bare:8.2f} us")
+    print(f"{'request, MetricsMiddleware':<28} {measured:8.2f} us  (overhead {overhead:.2f} us, budget {args.budget_us:.0f} us)")
+
+    for operation in range(50):
+        histogram.observe(0.01, f"operation_{operation}", "GET")
+    start = time.perf_counter()
+    text = scratch.render() + registry.render()
+    print(f"{'scrape, 50 operations':<28} {(time.perf_counter() - start) * 1000:8.2f} ms  ({len(text.splitlines())} lines)")
+
+    if overhead > args.budget_us:
+        print("metrics overhead is over budget")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
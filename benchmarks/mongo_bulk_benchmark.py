@@ -0,0 +1,71 @@
+"""
+Compare mirroring N documents into Mongo one write at a time against MongoManager.bulk_upsert / bulk_delete.
+
+Runs against mongomock by default; pass --mongo-uri to use a real mongod (the database is dropped afterwards).
+
+Usage:
+    python -m benchmarks.mongo_bulk_benchmark [--documents 2000] [--chunk-size 1000]
+    python -m benchmarks.mongo_bulk_benchmark --mongo-uri mongodb://localhost:27017/oeg_benchmark
+"""
+
+import argparse
+import time
+from contextlib import nullcontext
+from unittest.mock import patch
+from benchmarks.stub_srm import make_app_instances
+from edge_cloud_management_api.managers.db_manager import MongoClientRegistry, MongoManager
+
+COLLECTION = "benchmark_app_instances"
+
+
+def timed(label, fn, count):
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {elapsed * 1e3:9.1f}ms  ({count / elapsed:10.0f} docs/s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--documents", type=int, default=2000)
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--mongo-uri", default=None, help="real mongod to benchmark against instead of mongomock")
+    args = parser.parse_args()
+
+    if args.mongo_uri:
+        backend = nullcontext()
+        mongo_uri = args.mongo_uri
+    else:
+        import mongomock
+
+        backend = patch("edge_cloud_management_api.managers.db_manager.MongoClient", new=mongomock.MongoClient)
+        mongo_uri = "mongodb://localhost:27017/oeg_benchmark"
+
+    documents = [dict(instance, _id=instance["appInstanceId"]) for instance in make_app_instances(args.documents)]
+    keys = [document["_id"] for document in documents]
+    print(f"backend: {args.mongo_uri or 'mongomock'}, {args.documents} documents, chunks of {args.chunk_size}")
+
+    with backend:
+        db = MongoManager(mongo_uri)
+        db.db.drop_collection(COLLECTION)
+
+        def upsert_one_by_one():
+            for document in documents:
+                db.db[COLLECTION].replace_one({"_id": document["_id"]}, document, upsert=True)
+
+        def delete_one_by_one():
+            for key in keys:
+                db.delete_document(COLLECTION, {"_id": key})
+
+        timed("replace_one x N", upsert_one_by_one, args.documents)
+        timed("delete_one x N", delete_one_by_one, args.documents)
+        timed("bulk_upsert", lambda: db.bulk_upsert(COLLECTION, documents, chunk_size=args.chunk_size), args.documents)
+        timed("bulk_upsert (all existing)", lambda: db.bulk_upsert(COLLECTION, documents, chunk_size=args.chunk_size), args.documents)
+        timed("bulk_delete", lambda: db.bulk_delete(COLLECTION, keys, chunk_size=args.chunk_size), args.documents)
+
+        db.db.client.drop_database(db.db.name)
+        MongoClientRegistry.close_all()
+
+
+if __name__ == "__main__":
+    main()
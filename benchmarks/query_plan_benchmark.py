@@ -0,0 +1,58 @@
+"""
+Explain every controller query shape (mongo_indexes.QUERY_SHAPES) against a real mongod, before and after applying
+the registered indexes, and exit with status 1 if a shape still does a collection scan once indexed.
+
+mongomock has no query planner, so this needs a mongod; the database is dropped afterwards.
+
+Usage:
+    python -m benchmarks.query_plan_benchmark --mongo-uri mongodb://localhost:27017/oeg_benchmark [--documents 20000]
+"""
+
+import argparse
+import sys
+from benchmarks.stub_srm import make_app_instances, make_service_functions
+from edge_cloud_management_api.managers.db_manager import MongoClientRegistry, MongoManager
+from edge_cloud_management_api.managers.mongo_indexes import QUERY_SHAPES, apply_indexes, plan_stages
+
+
+def report(db, label):
+    scans = []
+    print(f"-- {label}")
+    for shape in QUERY_SHAPES:
+        explanation = db.explain_find(shape["collection"], shape["query"], sort_key=shape.get("sort"), limit=101)
+        stages = list(plan_stages(explanation["queryPlanner"]["winningPlan"]))
+        stats = explanation.get("executionStats", {})
+        print(
+            f"{shape['name']:<34} docs examined={stats.get('totalDocsExamined', '?'):>7} "
+            f"time={stats.get('executionTimeMillis', '?'):>4}ms  {' <- '.join(stages)}"
+        )
+        if "COLLSCAN" in stages:
+            scans.append(shape["name"])
+    return scans
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mongo-uri", required=True)
+    parser.add_argument("--documents", type=int, default=20000)
+    args = parser.parse_args()
+
+    with MongoManager(args.mongo_uri) as db:
+        db.db.client.drop_database(db.db.name)
+        db.db["apps"].insert_many(make_service_functions(args.documents // 10))
+        db.db["appinstances"].insert_many(make_app_instances(args.documents))
+
+        report(db, "without indexes")
+        apply_indexes(db)
+        scans = report(db, "with the registered indexes")
+
+        db.db.client.drop_database(db.db.name)
+    MongoClientRegistry.close_all()
+
+    if scans:
+        print(f"collection scans: {', '.join(scans)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
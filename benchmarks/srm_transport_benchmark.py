@@ -0,0 +1,51 @@
+"""
+Compare per-request latency of the module-level requests API against the shared pooled SRM session.
+
+Usage:
+    python -m benchmarks.srm_transport_benchmark [--requests 2000]
+"""
+
+import argparse
+import statistics
+import time
+import requests
+from benchmarks.stub_srm import StubSRM
+from edge_cloud_management_api.services.srm_transport import build_srm_session
+
+
+def run(label, send, count):
+    send()  # warm-up, so the pooled variant starts from an open connection like it would in steady state
+    latencies = []
+    for _ in range(count):
+        start = time.perf_counter()
+        send().raise_for_status()
+        latencies.append(time.perf_counter() - start)
+    latencies.sort()
+    print(
+        f"{label:<24} mean={statistics.mean(latencies) * 1e6:8.1f}us "
+        f"p50={latencies[len(latencies) // 2] * 1e6:8.1f}us "
+        f"p99={latencies[int(len(latencies) * 0.99)] * 1e6:8.1f}us"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+
+    with StubSRM() as srm:
+        url = f"{srm.base_url}/node"
+
+        before = srm.connections_opened
+        run("requests.get (no pool)", lambda: requests.get(url, verify=False), args.requests)
+        print(f"{'':<24} connections opened: {srm.connections_opened - before}")
+
+        session = build_srm_session(proxy="")
+        before = srm.connections_opened
+        run("shared pooled session", lambda: session.get(url, verify=False), args.requests)
+        print(f"{'':<24} connections opened: {srm.connections_opened - before}")
+        session.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Compare the peak memory of serving a large GET /appinstances listing as one buffered JSON document
+against streaming it (STREAMING_RESPONSES=true) from the SRM to the client.
+
+Each mode runs in its own process so that ru_maxrss, the peak resident set size, is not shared between them.
+
+Usage:
+    python -m benchmarks.streaming_benchmark [--instances 100000]
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+from benchmarks.async_load_benchmark import free_port, start_server
+
+MODES = {"buffered": "false", "streamed": "true"}
+
+
+def peak_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def serve_once():
+    """
+    Child process: call the handler once and consume its body, then print its peak RSS as JSON.
+    """
+    from edge_cloud_management_api.app import get_app_instance
+    from edge_cloud_management_api.controllers.app_controllers import get_app_instance as get_app_instances_controller
+
+    flask_app = get_app_instance().app
+    baseline = peak_rss_mb()
+    start = time.perf_counter()
+    with flask_app.test_request_context():
+        response, status = get_app_instances_controller()
+        size = sum(len(chunk) for chunk in response.iter_encoded())
+    print(json.dumps({"status": status, "bytes": size, "seconds": time.perf_counter() - start, "baseline_mb": baseline, "peak_mb": peak_rss_mb()}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--instances", type=int, default=100000)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        serve_once()
+        return
+
+    srm_port = free_port()
+    srm = start_server("benchmarks.stub_srm:make_asgi_app", srm_port, STUB_SRM_APP_INSTANCES=str(args.instances))
+    try:
+        for mode, streaming in MODES.items():
+            env = dict(os.environ, SRM_HOST=f"http://127.0.0.1:{srm_port}", SRM_CACHE_BACKEND="none", STREAMING_RESPONSES=streaming)
+            output = subprocess.run(
+                [sys.executable, "-m", "benchmarks.streaming_benchmark", "--child"], env=env, check=True, capture_output=True, text=True
+            ).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            print(
+                f"{mode:<10} status={result['status']} body={result['bytes'] / 1e6:7.1f}MB "
+                f"time={result['seconds'] * 1e3:8.1f}ms peak RSS={result['peak_mb']:7.1f}MB (after imports {result['baseline_mb']:.1f}MB)"
+            )
+    finally:
+        srm.terminate()
+        srm.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+"""
+Minimal in-process stand-in for the PiEdge Service Resource Manager, used by the benchmarks.
+
+It speaks HTTP/1.1 with keep-alive so that pooled and unpooled clients can be compared
+on connection reuse alone, and it can add an artificial per-request latency.
+"""
+
+import asyncio
+import json
+import os
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def make_nodes(count):
+    return [
+        {
+            "edgeCloudZoneId": str(uuid.UUID(int=i)),
+            "edgeCloudZoneName": f"zone-{i}",
+            "edgeCloudZoneStatus": ("active", "inactive", "unknown")[i % 3],
+            "edgeCloudProvider": "stub-provider",
+            "edgeCloudRegion": f"region-{i % 10}",
+        }
+        for i in range(count)
+    ]
+
+
+def make_service_functions(count):
+    return [
+        {
+            "appId": str(uuid.UUID(int=i)),
+            "name": f"app_{i}",
+            "appProvider": "stub_provider",
+            "version": "1.0.0",
+            "packageType": "CONTAINER",
+            "appRepo": {"type": "PUBLICREPO", "imagePath": f"https://registry.example.com/app-{i}:1.0.0"},
+            "componentSpec": [
+                {
+                    "componentName": f"component_{i}",
+                    "networkInterfaces": [{"interfaceId": "eth0", "protocol": "TCP", "port": 8080, "visibilityType": "VISIBILITY_EXTERNAL"}],
+                }
+            ],
+        }
+        for i in range(count)
+    ]
+
+
+def make_app_instances(count):
+    return [
+        {
+            "appInstanceId": str(uuid.UUID(int=i)),
+            "name": f"instance_{i}",
+            "appId": str(uuid.UUID(int=i % 100)),
+            "appProvider": "stub_provider",
+            "status": "ready",
+            "componentEndpointInfo": [{"interfaceId": "eth0", "accessPoints": {"fqdn": f"instance-{i}.example.com", "port": 8080}}],
+            "kubernetesClusterRef": str(uuid.UUID(int=i % 7)),
+            "edgeCloudZone": {
+                "edgeCloudZoneId": str(uuid.UUID(int=i % 50)),
+                "edgeCloudZoneName": f"zone-{i % 50}",
+                "edgeCloudZoneStatus": "active",
+                "edgeCloudProvider": "stub-provider",
+                "edgeCloudRegion": f"region-{i % 10}",
+            },
+        }
+        for i in range(count)
+    ]
+
+
+class StubHTTPServer(ThreadingHTTPServer):
+    # the default backlog of 5 drops SYNs as soon as a few dozen clients connect at once
+    request_queue_size = 1024
+
+
+class StubSRM:
+    """
+    Serve canned SRM payloads on 127.0.0.1 from a background thread.
+
+    Example:
+        with StubSRM(latency=0.005) as srm:
+            requests.get(f"{srm.base_url}/node")
+    """
+
+    def __init__(self, nodes=50, service_functions=50, app_instances=50, latency=0.0):
+        self.latency = latency
+        self.requests_served = 0
+        self.connections_opened = 0
+        self.payloads = {
+            "/node": json.dumps(make_nodes(nodes)).encode(),
+            "/serviceFunction": json.dumps(make_service_functions(service_functions)).encode(),
+            "/deployedServiceFunction": json.dumps(make_app_instances(app_instances)).encode(),
+        }
+        self._lock = threading.Lock()
+        self._server = StubHTTPServer(("127.0.0.1", 0), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _handler_class(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # headers and body go out in separate writes; without this, delayed ACKs add ~40ms per kept-alive request
+            disable_nagle_algorithm = True
+
+            def setup(self):
+                super().setup()
+                with stub._lock:
+                    stub.connections_opened += 1
+
+            def log_message(self, format, *args):
+                pass
+
+            def _reply(self, status, body):
+                if stub.latency:
+                    time.sleep(stub.latency)
+                with stub._lock:
+                    stub.requests_served += 1
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _read_body(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                return self.rfile.read(length) if length else b""
+
+            def do_GET(self):
+                path = self.path.split("?")[0]
+                if path in stub.payloads:
+                    self._reply(200, stub.payloads[path])
+                    return
+                for prefix in ("/serviceFunction/", "/deployedServiceFunction/"):
+                    if path.startswith(prefix):
+                        self._reply(200, json.dumps({"id": path[len(prefix) :]}).encode())
+                        return
+                self._reply(404, b'{"error": "not found"}')
+
+            def do_POST(self):
+                self._read_body()
+                if self.path == "/authentication":
+                    self._reply(200, json.dumps({"token": uuid.uuid4().hex, "expires_in": 3600}).encode())
+                    return
+                self._reply(201, json.dumps({"id": str(uuid.uuid4())}).encode())
+
+            def do_DELETE(self):
+                self._reply(204, b"")
+
+        return Handler
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+
+def make_asgi_app():
+    """
+    ASGI flavour of the stub for load tests, where a thread per connection would make the stub the bottleneck.
+    Sizes and latency come from the STUB_SRM_NODES, STUB_SRM_SERVICE_FUNCTIONS, STUB_SRM_APP_INSTANCES and STUB_SRM_LATENCY env vars.
+
+    Usage:
+        python -m uvicorn --factory benchmarks.stub_srm:make_asgi_app --port 9000
+    """
+    latency = float(os.getenv("STUB_SRM_LATENCY", 0))
+    payloads = {
+        "/node": json.dumps(make_nodes(int(os.getenv("STUB_SRM_NODES", 50)))).encode(),
+        "/serviceFunction": json.dumps(make_service_functions(int(os.getenv("STUB_SRM_SERVICE_FUNCTIONS", 50)))).encode(),
+        "/deployedServiceFunction": json.dumps(make_app_instances(int(os.getenv("STUB_SRM_APP_INSTANCES", 50)))).encode(),
+    }
+
+    async def app(scope, receive, send):
+        if scope["type"] != "http":
+            return
+        path, method = scope["path"], scope["method"]
+        if latency:
+            await asyncio.sleep(latency)
+        status, body = 404, b'{"error": "not found"}'
+        if method == "GET" and path in payloads:
+            status, body = 200, payloads[path]
+        elif method == "GET" and path.startswith(("/serviceFunction/", "/deployedServiceFunction/")):
+            status, body = 200, json.dumps({"id": path.rsplit("/", 1)[-1]}).encode()
+        elif method == "POST":
+            status, body = 201, json.dumps({"id": str(uuid.uuid4())}).encode()
+        elif method == "DELETE":
+            status, body = 204, b""
+        await send({"type": "http.response.start", "status": status, "headers": [(b"content-type", b"application/json")]})
+        await send({"type": "http.response.body", "body": body})
+
+    return app
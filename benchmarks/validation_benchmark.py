@@ -0,0 +1,94 @@
+"""
+Per-operation cost of connexion's request validation (parameters and body, strict), with connexion's validators
+built per request and with the validators compiled once per operation schema, plus what the pydantic pass the
+controllers no longer repeat behind connexion used to cost.
+
+Usage:
+    python -m benchmarks.validation_benchmark [--requests 2000]
+"""
+
+import argparse
+import asyncio
+import json
+import time
+import uuid
+from pathlib import Path
+from connexion.middleware.request_validation import RequestValidationAPI
+from connexion.spec import Specification
+from connexion.validators import VALIDATOR_MAP as CONNEXION_VALIDATOR_MAP
+from edge_cloud_management_api.controllers.edge_cloud_controller import EdgeCloudQueryParams
+from edge_cloud_management_api.managers.request_validation import VALIDATOR_MAP
+from edge_cloud_management_api.managers.spec_cache import load_specification
+
+OPERATIONS = "edge_cloud_management_api.controllers."
+APP_MANIFEST = Path(__file__).resolve().parent.parent / "tests" / "fixtures" / "submit-app-sample.json"
+APP_ID = str(uuid.uuid4())
+APP_MANIFEST_BODY = json.loads(APP_MANIFEST.read_text())
+# the sample predates the infraKind discriminator of RequiredResources
+APP_MANIFEST_BODY["requiredResources"]["infraKind"] = "kubernetes"
+ZONE = {"edgeCloudZoneId": str(uuid.uuid4()), "edgeCloudZoneName": "zone", "edgeCloudProvider": "provider_1"}
+
+# operationId: (path parameters, query string, body)
+CASES = {
+    "app_controllers.submit_app": ({}, b"", APP_MANIFEST_BODY),
+    "app_controllers.get_apps": ({}, b"limit=50", None),
+    "app_controllers.get_app": ({"appId": APP_ID}, b"", None),
+    "app_controllers.create_app_instance": ({}, b"", {"name": "instance_1", "appId": APP_ID, "edgeCloudZoneId": ZONE["edgeCloudZoneId"]}),
+    "app_controllers.create_app_instances_batch": (
+        {},
+        b"",
+        {"name": "instance_1", "appId": APP_ID, "appZones": [{"EdgeCloudZone": ZONE} for _ in range(10)]},
+    ),
+    "edge_cloud_controller.get_edge_cloud_zones": ({}, b"region=Region1&status=active", None),
+}
+
+
+async def next_app(scope, receive, send):
+    pass
+
+
+async def per_request_us(operation, path_params, query_string, body, requests):
+    payload = json.dumps(body).encode() if body is not None else b""
+    headers = [
+        (b"content-type", b"application/json"),
+        (b"content-length", str(len(payload)).encode()),
+        (b"x-correlator", b"b4333c46-49c0-4f62-80d7-f0ef930f1c46"),
+    ]
+
+    async def receive():
+        return {"type": "http.request", "body": payload, "more_body": False}
+
+    start = time.perf_counter()
+    for _ in range(requests):
+        scope = {"type": "http", "method": "POST", "path": "/", "headers": headers, "query_string": query_string, "path_params": path_params}
+        await operation(scope, receive, None)
+    return (time.perf_counter() - start) / requests * 1e6
+
+
+def operations(validator_map) -> dict:
+    api = RequestValidationAPI(Specification.from_dict(load_specification()), next_app=next_app, strict_validation=True, validator_map=validator_map)
+    return {operation_id.removeprefix(OPERATIONS): operation for operation_id, operation in api.operations.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+
+    per_request = operations(CONNEXION_VALIDATOR_MAP)
+    compiled = operations(VALIDATOR_MAP)
+    print(f"{'operation':<44} {'per request':>12} {'compiled':>10}")
+    for name, (path_params, query_string, body) in CASES.items():
+        before = asyncio.run(per_request_us(per_request[name], path_params, query_string, body, args.requests))
+        after = asyncio.run(per_request_us(compiled[name], path_params, query_string, body, args.requests))
+        print(f"{name:<44} {before:9.1f} us {after:7.1f} us  x{before / after:.1f}")
+
+    start = time.perf_counter()
+    for _ in range(args.requests):
+        EdgeCloudQueryParams(x_correlator=None, region="Region1", status="active")
+    pydantic_us = (time.perf_counter() - start) / args.requests * 1e6
+    print(f"{'pydantic EdgeCloudQueryParams (skipped)':<44} {pydantic_us:9.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Compare filtering edge cloud zones by validating and scanning the whole list on every request
+against answering from the indexed ZoneStore.
+
+Usage:
+    python -m benchmarks.zone_store_benchmark [--zones 10000] [--queries 200]
+"""
+
+import argparse
+import statistics
+import time
+from benchmarks.stub_srm import make_nodes
+from edge_cloud_management_api.controllers.edge_cloud_controller import EdgeCloudZone, validate_zone
+from edge_cloud_management_api.services.zone_store import zone_store_for
+
+QUERIES = [(None, None), ("region-3", None), (None, "active"), ("region-7", "inactive")]
+
+
+def scan(zones, region, status):
+    validated = [EdgeCloudZone(**zone).model_dump() for zone in zones]
+    return [
+        zone
+        for zone in validated
+        if (region is None or zone["edgeCloudRegion"] == region) and (status is None or zone["edgeCloudZoneStatus"] == status)
+    ]
+
+
+def run(label, query, count):
+    latencies = []
+    for i in range(count):
+        region, status = QUERIES[i % len(QUERIES)]
+        start = time.perf_counter()
+        query(region, status)
+        latencies.append(time.perf_counter() - start)
+    latencies.sort()
+    print(
+        f"{label:<28} mean={statistics.mean(latencies) * 1e6:10.1f}us "
+        f"p50={latencies[len(latencies) // 2] * 1e6:10.1f}us "
+        f"p99={latencies[int(len(latencies) * 0.99)] * 1e6:10.1f}us"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--zones", type=int, default=10000)
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    zones = make_nodes(args.zones)
+
+    start = time.perf_counter()
+    zone_store_for(zones, validate=validate_zone)
+    print(f"{'build ZoneStore (per refresh)':<28} {(time.perf_counter() - start) * 1e3:.1f}ms for {args.zones} zones")
+
+    run("validate + scan", lambda region, status: scan(zones, region, status), max(1, args.queries // 10))
+    run("indexed ZoneStore", lambda region, status: zone_store_for(zones, validate=validate_zone).query(region, status), args.queries)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,7 @@
+def main():
+    """
+    Console script entry point (see server.main), imported lazily so that importing a submodule does not load uvicorn.
+    """
+    from edge_cloud_management_api.server import main as serve
+
+    serve()
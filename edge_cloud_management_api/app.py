@@ -1,17 +1,87 @@
 from pathlib import Path
-from connexion import FlaskApp
+from connexion import AsyncApp, FlaskApp
+from connexion.middleware import MiddlewarePosition
 from connexion.options import SwaggerUIOptions
+from connexion.resolver import Resolver
+from connexion.utils import get_function_from_name
+from edge_cloud_management_api.configs.env_config import config
+from edge_cloud_management_api.managers.json_provider import JSONProvider, Jsonifier
+from edge_cloud_management_api.managers.metrics_manager import MetricsMiddleware
+from edge_cloud_management_api.managers.request_validation import VALIDATOR_MAP
+from edge_cloud_management_api.managers.spec_cache import validated_specification
+from edge_cloud_management_api.managers.trace_manager import TracingMiddleware
 
+CONTROLLERS_PACKAGE = "edge_cloud_management_api.controllers"
 
-def get_app_instance() -> FlaskApp:
+
+def get_app_instance(lifespan=None) -> FlaskApp:
+    file_path = Path(__file__).resolve().parent
+    swagger_options = SwaggerUIOptions(swagger_ui_path="/docs")
+    app = FlaskApp(__name__, lifespan=lifespan, specification_dir=file_path / "specification")
+    app.app.json = JSONProvider(app.app)
+    add_openapi(
+        app,
+        swagger_ui_options=swagger_options,
+        strict_validation=True,
+        validator_map=VALIDATOR_MAP,
+        jsonifier=Jsonifier(),
+        # operations whose controller is not implemented yet (e.g. federation) answer 501 instead of failing startup
+        resolver_error=501,
+    )
+    add_observability(app)
+    return app
+
+
+def add_openapi(app, **options):
+    """
+    Register specification/openapi.yaml, loaded from the spec cache when SPEC_CACHE_ENABLED.
+    """
+    if not config.SPEC_CACHE_ENABLED:
+        app.add_api("openapi.yaml", **options)
+        return
+    with validated_specification() as specification:
+        app.add_api(specification, **options)
+
+
+def add_observability(app):
+    """
+    Trace every request by its x-correlator; measure it per operationId and serve the metrics on METRICS_PATH,
+    when METRICS_ENABLED.
+    """
+    app.add_middleware(TracingMiddleware, position=MiddlewarePosition.BEFORE_EXCEPTION)
+    if config.METRICS_ENABLED:
+        app.add_middleware(MetricsMiddleware, position=MiddlewarePosition.BEFORE_EXCEPTION, path=config.METRICS_PATH)
+
+
+def resolve_async_handler(operation_id: str):
+    """
+    Resolve an operationId of the spec to its asyncio twin, e.g.
+    controllers.app_controllers.get_apps -> controllers.async_app_controllers.get_apps
+    """
+    module_name, function_name = operation_id.rsplit(".", 1)
+    package_name, controller_name = module_name.rsplit(".", 1)
+    if package_name == CONTROLLERS_PACKAGE:
+        operation_id = f"{package_name}.async_{controller_name}.{function_name}"
+    return get_function_from_name(operation_id)
+
+
+def get_async_app_instance(lifespan=None) -> AsyncApp:
+    """
+    Same API as get_app_instance, served by the native ASGI AsyncApp with the async controllers.
+    """
     file_path = Path(__file__).resolve().parent
     swagger_options = SwaggerUIOptions(swagger_ui_path="/docs")
-    app = FlaskApp(__name__, specification_dir=file_path / "specification")
-    app.add_api(
-        "openapi.yaml",
+    app = AsyncApp(__name__, lifespan=lifespan, specification_dir=file_path / "specification")
+    add_openapi(
+        app,
         swagger_ui_options=swagger_options,
         strict_validation=True,
+        validator_map=VALIDATOR_MAP,
+        jsonifier=Jsonifier(),
+        resolver=Resolver(function_resolver=resolve_async_handler),
+        resolver_error=501,
     )
+    add_observability(app)
     return app
 
 
@@ -6,11 +6,127 @@ load_dotenv()
 
 
 class Configuration(BaseSettings):
+    """
+    Settings without an os.getenv default are read by BaseSettings from the environment variable of the same name.
+    """
+
     MONGO_URI: str = os.getenv("MONGO_URI")
     SRM_HOST: str = os.getenv("SRM_HOST")
     PI_EDGE_USERNAME: str = os.getenv("PI_EDGE_USERNAME")
     PI_EDGE_PASSWORD: str = os.getenv("PI_EDGE_PASSWORD")
+    MONGO_MAX_POOL_SIZE: int = 50
+    MONGO_MIN_POOL_SIZE: int = 0
+    MONGO_WAIT_QUEUE_TIMEOUT_MS: int = 10000
+    MONGO_BULK_CHUNK_SIZE: int = 1000
+    MONGO_INDEX_BOOTSTRAP: bool = True
+    MONGO_INDEX_BOOTSTRAP_TIMEOUT_MS: int = 5000
+    PAGE_SIZE_DEFAULT: int = 100
+    # Encode app instance and zone listings incrementally instead of building the whole JSON document
+    STREAMING_RESPONSES: bool = False
+    STREAM_CHUNK_SIZE: int = 65536
+    READ_MODEL_ENABLED: bool = False
+    READ_MODEL_SYNC_INTERVAL: float = 30
     HTTP_PROXY: str = os.getenv("HTTP_PROXY")
+    ASYNC_HANDLERS: bool = False
+
+    # SRM HTTP transport (connection pool shared by every PiEdgeAPIClient)
+    SRM_POOL_CONNECTIONS: int = 10
+    SRM_POOL_MAXSIZE: int = 50
+    SRM_POOL_BLOCK: bool = False
+    SRM_TCP_KEEPALIVE: bool = True
+    SRM_CONNECT_TIMEOUT: float = 3.05
+    SRM_READ_TIMEOUT: float = 30
+    SRM_ASYNC_MAX_CONNECTIONS: int = 200
+    SRM_KEEPALIVE_EXPIRY: float = 30
+
+    # Circuit breaker per SRM endpoint: opens after N consecutive failures, probes again after the reset timeout
+    SRM_BREAKER_ENABLED: bool = True
+    SRM_BREAKER_FAILURE_THRESHOLD: int = 5
+    SRM_BREAKER_RESET_TIMEOUT: float = 30
+    # Read timeout per SRM endpoint: factor x p99 of the last calls, between the minimum and SRM_READ_TIMEOUT
+    SRM_ADAPTIVE_TIMEOUT: bool = True
+    SRM_ADAPTIVE_TIMEOUT_MIN: float = 1
+    SRM_ADAPTIVE_TIMEOUT_FACTOR: float = 3
+    SRM_ADAPTIVE_TIMEOUT_WINDOW: int = 100
+    # Retries of idempotent SRM calls (GET, DELETE) with full-jitter exponential backoff; the budget caps retries at
+    # SRM_RETRY_BUDGET_RATIO of the calls of the last SRM_RETRY_BUDGET_WINDOW seconds, plus a minimum rate
+    SRM_RETRY_MAX_ATTEMPTS: int = 3
+    SRM_RETRY_BASE_DELAY: float = 0.1
+    SRM_RETRY_MAX_DELAY: float = 2
+    SRM_RETRY_BUDGET_RATIO: float = 0.1
+    SRM_RETRY_BUDGET_MIN_PER_SECOND: float = 1
+    SRM_RETRY_BUDGET_WINDOW: float = 10
+
+    # SRM authentication
+    SRM_AUTH_ENABLED: bool = False
+    SRM_TOKEN_TTL: int = 3600
+    SRM_TOKEN_REFRESH_MARGIN: int = 60
+
+    # SRM read cache ("memory", "redis" or "none"); a TTL of 0 disables caching for that endpoint
+    SRM_CACHE_BACKEND: str = os.getenv("SRM_CACHE_BACKEND", "memory")
+    SRM_CACHE_REDIS_URL: str = os.getenv("SRM_CACHE_REDIS_URL", "redis://localhost:6379/0")
+    SRM_CACHE_MAXSIZE: int = 256
+    SRM_CACHE_TTL_SERVICE_FUNCTION: float = 10
+    SRM_CACHE_TTL_NODE: float = 30
+    SRM_CACHE_TTL_DEPLOYED_SERVICE_FUNCTION: float = 5
+
+    # Concurrent identical SRM GETs (same URL and user) share one upstream call
+    SRM_SINGLE_FLIGHT: bool = True
+
+    # Seconds between background refreshes of the edge cloud zone snapshot; 0 fetches the zones on every request
+    ZONE_REFRESH_INTERVAL: float = 15
+
+    # Zone discovery fan-out to the local SRM and the federation partners (JSON list of {"name", "url", "deadline"})
+    FEDERATION_PARTNERS: str = os.getenv("FEDERATION_PARTNERS", "")
+    FEDERATION_PARTNER_DEADLINE: float = 2
+    ZONE_LOCAL_DEADLINE: float = 5
+    # threads of each fan-out pool: zone discovery, batch deployments and SRM lookups by id have one each
+    FAN_OUT_MAX_WORKERS: int = 16
+    # SRM lookups by id in flight per GET /appinstances?appInstanceId=... request
+    SRM_LOOKUP_MAX_CONCURRENCY: int = 8
+
+    # Deployment job queue behind POST /appinstances ("mongo", or "memory": jobs are lost on restart)
+    JOB_QUEUE_BACKEND: str = os.getenv("JOB_QUEUE_BACKEND", "mongo")
+    JOB_QUEUE_WORKERS: int = 4
+    JOB_MAX_ATTEMPTS: int = 5
+    JOB_RETRY_BACKOFF: float = 2
+    JOB_RETRY_BACKOFF_MAX: float = 60
+    JOB_LEASE_SECONDS: float = 120
+    JOB_POLL_INTERVAL: float = 1
+
+    # POST /appinstances/batch: zone deployments in flight per request, and zones accepted per request
+    BATCH_DEPLOY_MAX_CONCURRENCY: int = 8
+    BATCH_DEPLOY_MAX_ZONES: int = 100
+
+    # Prometheus metrics, served outside of the OpenAPI spec
+    METRICS_ENABLED: bool = True
+    METRICS_PATH: str = os.getenv("METRICS_PATH", "/metrics")
+
+    # Tracing keyed by x-correlator: exporter "none", "file" (OTLP/JSON lines in TRACE_FILE) or "otlp" (OTLP/HTTP JSON)
+    TRACE_EXPORTER: str = os.getenv("TRACE_EXPORTER", "none")
+    TRACE_FILE: str = os.getenv("TRACE_FILE", "traces.jsonl")
+    TRACE_OTLP_ENDPOINT: str = os.getenv("TRACE_OTLP_ENDPOINT", "http://localhost:4318/v1/traces")
+    TRACE_SERVICE_NAME: str = os.getenv("TRACE_SERVICE_NAME", "open-exposure-gateway")
+    TRACE_EXPORT_INTERVAL: float = 5
+    TRACE_EXPORT_BATCH_SIZE: int = 512
+    TRACE_QUEUE_SIZE: int = 2048
+
+    # uvicorn server started by main(): worker processes, keep-alive and listen backlog, worker recycling
+    # (0 = never) and the seconds given to in-flight requests after SIGTERM
+    SERVER_HOST: str = os.getenv("SERVER_HOST", "0.0.0.0")
+    SERVER_PORT: int = 8080
+    SERVER_WORKERS: int = 1
+    SERVER_KEEP_ALIVE: int = 5
+    SERVER_BACKLOG: int = 2048
+    SERVER_MAX_REQUESTS: int = 0
+    SERVER_GRACEFUL_TIMEOUT: float = 20
+
+    # Parsed OpenAPI spec cached by content hash (SPEC_CACHE_DIR defaults to specification/.cache in the package)
+    SPEC_CACHE_ENABLED: bool = True
+    SPEC_CACHE_DIR: str = os.getenv("SPEC_CACHE_DIR", "")
+
+    # JSON encoding of responses and SRM payloads: "auto" (orjson when installed), "orjson" or "stdlib"
+    JSON_BACKEND: str = os.getenv("JSON_BACKEND", "auto")
 
 
 config = Configuration()
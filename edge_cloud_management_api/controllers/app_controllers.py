@@ -1,29 +1,114 @@
 import uuid
-from flask import jsonify, request
+from flask import Response, jsonify, request
 from pydantic import ValidationError
+from edge_cloud_management_api.configs.env_config import config
 from edge_cloud_management_api.managers.db_manager import MongoManager
+from edge_cloud_management_api.managers.json_provider import response_json
 from edge_cloud_management_api.managers.log_manager import logger
 from edge_cloud_management_api.models.application_models import AppManifest, AppZones, AppInstance
+from edge_cloud_management_api.services.app_instance_index import app_instance_index_for, instance_matches
+from edge_cloud_management_api.services.batch_deployment import InvalidBatch, batch_summary, deploy_zones, with_zone_idempotency_keys, zone_deployments
+from edge_cloud_management_api.services.deployment_jobs import IDEMPOTENCY_KEY_HEADER, deployment_queue, job_location
+from edge_cloud_management_api.services.job_queue import IdempotencyConflict, job_view
 from edge_cloud_management_api.services.pi_edge_services import PiEdgeAPIClientFactory
 from edge_cloud_management_api.services.pi_edge_services import PiEdgeAPIClient
+from edge_cloud_management_api.services.json_stream import peek, stream_json_array
+from edge_cloud_management_api.services.pagination import NEXT_PAGE_TOKEN_HEADER, InvalidPageToken, paginate
+from edge_cloud_management_api.services.read_model import (
+    APP_INSTANCES_COLLECTION,
+    APPS_COLLECTION,
+    app_instance_query,
+    read_listing,
+    read_model_sync,
+    read_one,
+)
 
 
 class NotFound404Exception(Exception):
     pass
 
 
+def paginated_response(items: list[dict], key: str, limit=None, page_token=None, envelope=None):
+    """
+    Respond with one page of items (keyset pagination on key) and the x-next-page-token header.
+
+    :param envelope: name of the object property wrapping the page, e.g. "appInstanceInfo"
+    """
+    page, next_token = paginate(items, key, limit or config.PAGE_SIZE_DEFAULT, page_token)
+    return listing_response(page, next_token, envelope)
+
+
+def listing_response(items: list[dict], next_token=None, envelope=None):
+    response = jsonify({envelope: items} if envelope else items)
+    if next_token:
+        response.headers[NEXT_PAGE_TOKEN_HEADER] = next_token
+    return response, 200
+
+
+def invalid_page_token_response(error: InvalidPageToken):
+    return jsonify({"status": 400, "code": "INVALID_ARGUMENT", "message": str(error)}), 400
+
+
+# SRM client errors passed on to the caller; any other SRM failure is answered with 503
+SRM_CLIENT_ERROR_CODES = {400: "INVALID_ARGUMENT", 404: "NOT_FOUND", 409: "CONFLICT"}
+
+
+def is_srm_error(result) -> bool:
+    return isinstance(result, dict) and "error" in result
+
+
+def srm_error(result: dict) -> tuple[dict, int]:
+    """
+    Error body and status for an SRM client error dictionary, instead of passing it on with a 200.
+    """
+    status = result.get("status_code")
+    if status not in SRM_CLIENT_ERROR_CODES:
+        return {"status": 503, "code": "UNAVAILABLE", "message": result["error"]}, 503
+    return {"status": status, "code": SRM_CLIENT_ERROR_CODES[status], "message": result["error"]}, status
+
+
+def srm_error_response(result: dict):
+    body, status = srm_error(result)
+    return jsonify(body), status
+
+
+def as_id_list(ids) -> list[str] | None:
+    """
+    The appInstanceId query parameter as a list: connexion passes ?appInstanceId=a,b as ["a", "b"].
+    """
+    if ids is None or isinstance(ids, list):
+        return ids or None
+    return [ids]
+
+
+def found_app_instances(results: list) -> list[dict]:
+    """
+    The instances among per-id SRM lookups; unknown ids are skipped, any other SRM error is raised.
+    """
+    instances = []
+    for result in results:
+        if isinstance(result, dict) and "error" in result:
+            if result.get("status_code") == 404:
+                continue
+            raise RuntimeError(f"SRM error: {result['error']}")
+        instances.append(result)
+    return instances
+
+
 def submit_app(body: dict):
     """
     Controller for submitting application metadata.
     """
     try:
-        # Validate the input data using Pydantic
+        # connexion validated the body against the AppManifest schema of the spec, which AppManifest mirrors
         # validated_data = AppManifest(**body)
         # validated_data_dict = validated_data.model_dump(mode="json")
         # validated_data_dict["_id"] = str(uuid.uuid4())
         pi_edge_factory = PiEdgeAPIClientFactory()
         api_client = pi_edge_factory.create_pi_edge_api_client()
         response = api_client.submit_app(body)
+        if config.READ_MODEL_ENABLED:
+            read_model_sync.trigger()
         # Insert into MongoDB
         # with MongoManager() as db:
         #     document_id = db.insert_document("apps", validated_data_dict)
@@ -43,13 +128,19 @@ def submit_app(body: dict):
         )
 
 
-def get_apps(x_correlator=None):  # noqa: E501
-    """Retrieve metadata information of all applications"""
+def get_apps(x_correlator=None, limit=None, pageToken=None):  # noqa: E501
+    """Retrieve metadata information of all applications, one page at a time when limit or pageToken is given"""
     try:
+        if config.READ_MODEL_ENABLED and read_model_sync.ready():
+            return listing_response(*read_listing(APPS_COLLECTION, "appId", limit=limit, page_token=pageToken))
         pi_edge_factory = PiEdgeAPIClientFactory()
         api_client = pi_edge_factory.create_pi_edge_api_client()
         registered_apps = api_client.get_service_functions_catalogue()
-        return registered_apps
+        if is_srm_error(registered_apps):
+            return srm_error_response(registered_apps)
+        if (limit is None and pageToken is None) or not isinstance(registered_apps, list):
+            return registered_apps
+        return paginated_response(registered_apps, "appId", limit, pageToken)
         # with MongoManager() as db:
         #     documents_cursor = db.find_documents("apps", {})
         #     response_apps = list()
@@ -59,6 +150,8 @@ def get_apps(x_correlator=None):  # noqa: E501
         #         response_apps.append(document)
 
         #     return (jsonify(response_apps), 200)
+    except InvalidPageToken as e:
+        return invalid_page_token_response(e)
     except Exception as e:
         return (
             jsonify({"error": "An unexpected error occurred", "details": str(e)}),
@@ -69,9 +162,16 @@ def get_apps(x_correlator=None):  # noqa: E501
 def get_app(appId, x_correlator=None):  # noqa: E501
     """Retrieve the information of an Application"""
     try:
+        if config.READ_MODEL_ENABLED and read_model_sync.ready():
+            app = read_one(APPS_COLLECTION, {"appId": appId})
+            if app is None:
+                raise NotFound404Exception()
+            return jsonify(app), 200
         pi_edge_factory = PiEdgeAPIClientFactory()
         api_client = pi_edge_factory.create_pi_edge_api_client()
         response = api_client.get_app(appId)
+        if is_srm_error(response):
+            return srm_error_response(response)
         return response
         # with MongoManager() as db:
         #     document = db.find_document("apps", {"_id": appId})
@@ -101,7 +201,11 @@ def delete_app(appId, x_correlator=None):  # noqa: E501
         pi_edge_factory = PiEdgeAPIClientFactory()
         api_client = pi_edge_factory.create_pi_edge_api_client()
         response = api_client.delete_app(appId=appId)
-        return response.json()
+        if is_srm_error(response):
+            return srm_error_response(response)
+        if config.READ_MODEL_ENABLED:
+            read_model_sync.trigger()
+        return response_json(response)
         # with MongoManager() as db:
         #     number_of_deleted_documents = db.delete_document("apps", {"_id": appId})
         #     if number_of_deleted_documents == 0:
@@ -124,81 +228,114 @@ def delete_app(appId, x_correlator=None):  # noqa: E501
         )
 
 
-def create_app_instance():
+def create_app_instance(body: dict, x_correlator=None):
+    """
+    Accept an app instance deployment: the request is stored as a job and submitted to the SRM by the deployment workers.
+    Responds 202 with the job and its status resource in the Location header.
+    """
     logger.info("Received request to create app instance")
-    
-    try: 
-        
-       body = request.get_json()
-       logger.debug(f"Request body: {body}")
-       
-       app_id = body.get("appId")
-       edge_zone_id = body.get("edgeCloudZoneId")
-       k8s_ref = body.get("kubernetesClusterRef")
-       
-       if not app_id or not edge_zone_id or not k8s_ref:
-           return jsonify({"error": "Missing required fields: appId, edgeCloudZoneId, or kubernetesCLusterRef"}), 400
-       
-       logger.info(f"Preparing to send deployment request to SRM for appId={app_id}")
-       
-       pi_edge_client_factory = PiEdgeAPICLientFactory()
-       pi_edge_client = pi_edge_client_factory.create_pi_edge_api_client()
-       
-       print("\n === Preparing Deployment Request ===")
-       print(f" Endpoint: {pi_edge_client.base_url}/deployedServiceFunction")
-       print(f" Headers: {pi_edge_client._get_headers()}")
-       print(f"Payload: {body}")
-       print("=== End of Deployment Request ===\n")
-       
-       try:
-          response = pi_edge_client_deploy_service_function(data=body)
-          
-          if isinstance(response, dict) and "error" in response:
-              logger.warning(f"Failed to deploy service function: {response}")
-              return jsonify({
-                  "warning": "Deployment not completed (SRM service unreachable)",
-                  "details": response
-                  
-              }), 202
-              
-          logger.info(f"Deployment response from SRM: {response}")
-       except Exception as inner_error:
-           logger.error(f"Exception while trying to deploy to SRM: {inner_error}")
-           return jsonify({
-               "warning": "SRM backend unavailable. Deployment request was built correctly.",
-               "details": str(inner_error)
-           }),202
-           
-       return jsonify({"message": f"Application {app_id} instantiation accepted"}), 202
-    except ValidationError as e:
-        logger.error(f"Validation error: {str(e)}")
-        return jsonify({"error": "Validation error", "details": str(e)}), 400
+
+    try:
+        app_id = body.get("appId")
+        edge_zone_id = body.get("edgeCloudZoneId")
+        k8s_ref = body.get("kubernetesClusterRef")
+
+        if not app_id or not edge_zone_id or not k8s_ref:
+            return jsonify({"error": "Missing required fields: appId, edgeCloudZoneId, or kubernetesCLusterRef"}), 400
+
+        job, created = deployment_queue.submit(body, idempotency_key=request.headers.get(IDEMPOTENCY_KEY_HEADER))
+        logger.info(f"Deployment job {job['_id']} for appId={app_id} {'queued' if created else 'already exists'}")
+        response = jsonify(job_view(job))
+        response.headers["Location"] = job_location(job)
+        return response, 202
+    except IdempotencyConflict as e:
+        return jsonify({"status": 409, "code": "CONFLICT", "message": str(e)}), 409
     except Exception as e:
         logger.error(f"Unexpected error in create_app_instance:{str(e)}")
-        return jsonify({"error": "An unexpected error occurred", "details": str(e)}), 500   
+        return jsonify({"error": "An unexpected error occurred", "details": str(e)}), 500
+
 
-def get_app_instance(app_id=None, x_correlator=None, app_instance_id=None, region=None):
+def create_app_instances_batch(body: dict, x_correlator=None):
     """
-    Retrieve application instances from the database.
-    Supports filtering by app_id, app_instance_id, and region.
+    Deploy an application to several Edge Cloud Zones in one request. The zone deployments are sent to the SRM
+    concurrently (at most BATCH_DEPLOY_MAX_CONCURRENCY at a time) and the response reports the outcome of each zone:
+    200 when every zone succeeded, 207 otherwise. Each zone is sent with an idempotency key derived from the
+    request's Idempotency-Key header, so that a repeated batch does not deploy its zones twice.
     """
+    logger.info("Received request to create app instances in several zones")
+
     try:
-        # query = {}
-        # if app_id:
-        #     query["appId"] = app_id
-        # if app_instance_id:
-        #     query["appInstanceId"] = app_instance_id
-        # if region:
-        #     query["edgeCloudZone.edgeCloudRegion"] = region
+        payloads = zone_deployments(body)
+        api_client = PiEdgeAPIClientFactory().create_pi_edge_api_client()
+        deploy = with_zone_idempotency_keys(api_client.deploy_service_function, request.headers.get(IDEMPOTENCY_KEY_HEADER))
+        summary = batch_summary(deploy_zones(deploy, payloads))
+        logger.info(f"Batch deployment of appId={body['appId']}: {summary['succeeded']} succeeded, {summary['failed']} failed")
+        if config.READ_MODEL_ENABLED and summary["succeeded"]:
+            read_model_sync.trigger()
+        return jsonify(summary), 200 if not summary["failed"] else 207
+    except InvalidBatch as e:
+        return jsonify({"status": 400, "code": "INVALID_ARGUMENT", "message": str(e)}), 400
+    except Exception as e:
+        logger.error(f"Unexpected error in create_app_instances_batch:{str(e)}")
+        return jsonify({"error": "An unexpected error occurred", "details": str(e)}), 500
+
+
+def get_deployment_job(jobId: str, x_correlator=None):
+    """
+    Status of an app instance deployment job.
+    """
+    try:
+        deployment_queue.start()
+        job = deployment_queue.get(jobId)
+        if job is None:
+            return jsonify({"status": 404, "code": "NOT_FOUND", "message": "Deployment job does not exist"}), 404
+        return jsonify(job_view(job)), 200
+    except Exception as e:
+        return jsonify({"status": 500, "code": "INTERNAL", "message": f"Internal server error: {str(e)}"}), 500
+
+
+def get_app_instance(x_correlator=None, appId=None, appInstanceId=None, region=None, limit=None, pageToken=None):
+    """
+    Retrieve application instances from the database (READ_MODEL_ENABLED) or the SRM.
+    Supports filtering by appId, appInstanceId (one or more ids) and region, and keyset pagination with limit and pageToken.
+    """
+    try:
+        app_instance_ids = as_id_list(appInstanceId)
+        if config.READ_MODEL_ENABLED and read_model_sync.ready():
+            query = app_instance_query(appId, app_instance_ids, region)
+            instances, next_token = read_listing(APP_INSTANCES_COLLECTION, "appInstanceId", query, limit, pageToken)
+            if not instances and pageToken is None:
+                return jsonify({
+                    "status": 404,
+                    "code": "NOT_FOUND",
+                    "message": "No application instances found for the given parameters."
+                }), 404
+            return listing_response(instances, next_token, envelope="appInstanceInfo")
 
-        # with MongoManager() as db:
-        #     instances = list(db.find_documents("appinstances", query))
-        instances = None
         pi_edge_client_factory = PiEdgeAPIClientFactory()
         pi_edge_client = pi_edge_client_factory.create_pi_edge_api_client()
 
-        if app_id is None and app_instance_id is None:
+        filtered = appId is not None or app_instance_ids is not None or region is not None
+        if config.STREAMING_RESPONSES and not filtered and limit is None and pageToken is None:
+            empty, instances = peek(pi_edge_client.iter_app_instances())
+            if empty:
+                return jsonify({
+                    "status": 404,
+                    "code": "NOT_FOUND",
+                    "message": "No application instances found for the given parameters."
+                }), 404
+            return Response(stream_json_array(instances, envelope="appInstanceInfo"), mimetype="application/json"), 200
+
+        if app_instance_ids is not None:
+            # direct lookups: polling one instance costs one SRM call instead of the whole listing
+            results = pi_edge_client.get_app_instances_by_id(app_instance_ids)
+            instances = [instance for instance in found_app_instances(results) if instance_matches(instance, appId, region)]
+        else:
             instances = pi_edge_client.get_app_instances()
+            if is_srm_error(instances):
+                return srm_error_response(instances)
+            if filtered and isinstance(instances, list):
+                instances = app_instance_index_for(instances).query(app_id=appId, region=region)
 
         if not instances:
             return jsonify({
@@ -207,8 +344,14 @@ def get_app_instance(app_id=None, x_correlator=None, app_instance_id=None, regio
                 "message": "No application instances found for the given parameters."
             }), 404
 
+        if (limit is not None or pageToken is not None) and isinstance(instances, list):
+            return paginated_response(instances, "appInstanceId", limit, pageToken, envelope="appInstanceInfo")
+
         return jsonify({"appInstanceInfo": instances}), 200
 
+    except InvalidPageToken as e:
+        return invalid_page_token_response(e)
+
     except Exception as e:
         logger.exception("Failed to retrieve app instances")
         return jsonify({
@@ -224,6 +367,10 @@ def delete_app_instance(appInstanceId: str, x_correlator=None):
         pi_edge_client_factory = PiEdgeAPIClientFactory()
         pi_edge_client = pi_edge_client_factory.create_pi_edge_api_client()
         response = pi_edge_client.delete_app_instance(appInstanceId)
+        if is_srm_error(response):
+            return srm_error_response(response)
+        if config.READ_MODEL_ENABLED:
+            read_model_sync.trigger()
         return jsonify({'result': response.text, 'status': response.status_code})
         # with MongoManager() as db:
         #     query = {
@@ -0,0 +1,232 @@
+"""
+asyncio versions of the handlers in app_controllers, served by the connexion AsyncApp.
+SRM calls are awaited, so an in-flight request does not hold a worker thread.
+"""
+
+import asyncio
+from connexion import request
+from pydantic import ValidationError
+from starlette.responses import StreamingResponse
+from edge_cloud_management_api.configs.env_config import config
+from edge_cloud_management_api.controllers.app_controllers import as_id_list, found_app_instances, is_srm_error, srm_error
+from edge_cloud_management_api.managers.json_provider import response_json
+from edge_cloud_management_api.managers.log_manager import logger
+from edge_cloud_management_api.services.app_instance_index import app_instance_index_for, instance_matches
+from edge_cloud_management_api.services.batch_deployment import InvalidBatch, async_deploy_zones, batch_summary, with_zone_idempotency_keys, zone_deployments
+from edge_cloud_management_api.services.deployment_jobs import IDEMPOTENCY_KEY_HEADER, deployment_queue, job_location
+from edge_cloud_management_api.services.job_queue import IdempotencyConflict, job_view
+from edge_cloud_management_api.services.json_stream import apeek, astream_json_array
+from edge_cloud_management_api.services.pagination import NEXT_PAGE_TOKEN_HEADER, InvalidPageToken, paginate
+from edge_cloud_management_api.services.pi_edge_async_services import AsyncPiEdgeAPIClientFactory
+from edge_cloud_management_api.services.read_model import (
+    APP_INSTANCES_COLLECTION,
+    APPS_COLLECTION,
+    app_instance_query,
+    read_listing,
+    read_model_sync,
+    read_one,
+)
+
+
+def paginated_response(items: list[dict], key: str, limit=None, page_token=None, envelope=None):
+    """
+    One page of items (keyset pagination on key) with the x-next-page-token header.
+    """
+    page, next_token = paginate(items, key, limit or config.PAGE_SIZE_DEFAULT, page_token)
+    return listing_response(page, next_token, envelope)
+
+
+def listing_response(items: list[dict], next_token=None, envelope=None):
+    headers = {NEXT_PAGE_TOKEN_HEADER: next_token} if next_token else {}
+    return ({envelope: items} if envelope else items), 200, headers
+
+
+async def read_model_ready() -> bool:
+    """
+    read_model_sync.ready() without blocking the event loop.
+    """
+    return await asyncio.to_thread(read_model_sync.ready)
+
+
+async def submit_app(body: dict, x_correlator=None):
+    """
+    Controller for submitting application metadata.
+    """
+    try:
+        api_client = AsyncPiEdgeAPIClientFactory().create_pi_edge_api_client()
+        response = await api_client.submit_app(body)
+        if config.READ_MODEL_ENABLED:
+            read_model_sync.trigger()
+        return response
+
+    except ValidationError as e:
+        return {"error": "Invalid input", "details": e.errors()}, 400
+
+    except Exception as e:
+        return {"error": "An unexpected error occurred", "details": str(e)}, 500
+
+
+async def get_apps(x_correlator=None, limit=None, pageToken=None):  # noqa: E501
+    """Retrieve metadata information of all applications, one page at a time when limit or pageToken is given"""
+    try:
+        if config.READ_MODEL_ENABLED and await read_model_ready():
+            return listing_response(*await asyncio.to_thread(read_listing, APPS_COLLECTION, "appId", limit=limit, page_token=pageToken))
+        api_client = AsyncPiEdgeAPIClientFactory().create_pi_edge_api_client()
+        registered_apps = await api_client.get_service_functions_catalogue()
+        if is_srm_error(registered_apps):
+            return srm_error(registered_apps)
+        if (limit is None and pageToken is None) or not isinstance(registered_apps, list):
+            return registered_apps
+        return paginated_response(registered_apps, "appId", limit, pageToken)
+    except InvalidPageToken as e:
+        return {"status": 400, "code": "INVALID_ARGUMENT", "message": str(e)}, 400
+    except Exception as e:
+        return {"error": "An unexpected error occurred", "details": str(e)}, 500
+
+
+async def get_app(appId, x_correlator=None):  # noqa: E501
+    """Retrieve the information of an Application"""
+    try:
+        if config.READ_MODEL_ENABLED and await read_model_ready():
+            app = await asyncio.to_thread(read_one, APPS_COLLECTION, {"appId": appId})
+            if app is None:
+                return {"status": 404, "code": "NOT_FOUND", "message": "Resource does not exist"}, 404
+            return app, 200
+        api_client = AsyncPiEdgeAPIClientFactory().create_pi_edge_api_client()
+        app = await api_client.get_app(appId)
+        return srm_error(app) if is_srm_error(app) else app
+    except Exception as e:
+        return {"error": "An unexpected error occurred", "details": str(e)}, 500
+
+
+async def delete_app(appId, x_correlator=None):  # noqa: E501
+    """Delete Application metadata from an Edge Cloud Provider"""
+    try:
+        api_client = AsyncPiEdgeAPIClientFactory().create_pi_edge_api_client()
+        response = await api_client.delete_app(appId=appId)
+        if is_srm_error(response):
+            return srm_error(response)
+        if config.READ_MODEL_ENABLED:
+            read_model_sync.trigger()
+        return response_json(response)
+    except Exception as e:
+        return {"status": 500, "code": "INTERNAL", "message": f"Internal server error: {str(e)}"}, 500
+
+
+async def create_app_instance(body: dict, x_correlator=None):
+    logger.info("Received request to create app instance")
+
+    try:
+        app_id = body.get("appId")
+        edge_zone_id = body.get("edgeCloudZoneId")
+        k8s_ref = body.get("kubernetesClusterRef")
+
+        if not app_id or not edge_zone_id or not k8s_ref:
+            return {"error": "Missing required fields: appId, edgeCloudZoneId, or kubernetesCLusterRef"}, 400
+
+        # storing the job is a blocking Mongo write
+        job, created = await asyncio.to_thread(deployment_queue.submit, body, request.headers.get(IDEMPOTENCY_KEY_HEADER))
+        logger.info(f"Deployment job {job['_id']} for appId={app_id} {'queued' if created else 'already exists'}")
+        return job_view(job), 202, {"Location": job_location(job)}
+    except IdempotencyConflict as e:
+        return {"status": 409, "code": "CONFLICT", "message": str(e)}, 409
+    except Exception as e:
+        logger.error(f"Unexpected error in create_app_instance:{str(e)}")
+        return {"error": "An unexpected error occurred", "details": str(e)}, 500
+
+
+async def create_app_instances_batch(body: dict, x_correlator=None):
+    """
+    Deploy an application to several Edge Cloud Zones in one request; 200 when every zone succeeded, 207 otherwise.
+    """
+    logger.info("Received request to create app instances in several zones")
+
+    try:
+        payloads = zone_deployments(body)
+        api_client = AsyncPiEdgeAPIClientFactory().create_pi_edge_api_client()
+        deploy = with_zone_idempotency_keys(api_client.deploy_service_function, request.headers.get(IDEMPOTENCY_KEY_HEADER))
+        summary = batch_summary(await async_deploy_zones(deploy, payloads))
+        logger.info(f"Batch deployment of appId={body['appId']}: {summary['succeeded']} succeeded, {summary['failed']} failed")
+        if config.READ_MODEL_ENABLED and summary["succeeded"]:
+            read_model_sync.trigger()
+        return summary, 200 if not summary["failed"] else 207
+    except InvalidBatch as e:
+        return {"status": 400, "code": "INVALID_ARGUMENT", "message": str(e)}, 400
+    except Exception as e:
+        logger.error(f"Unexpected error in create_app_instances_batch:{str(e)}")
+        return {"error": "An unexpected error occurred", "details": str(e)}, 500
+
+
+async def get_deployment_job(jobId: str, x_correlator=None):
+    """
+    Status of an app instance deployment job.
+    """
+    try:
+        deployment_queue.start()
+        job = await asyncio.to_thread(deployment_queue.get, jobId)
+        if job is None:
+            return {"status": 404, "code": "NOT_FOUND", "message": "Deployment job does not exist"}, 404
+        return job_view(job), 200
+    except Exception as e:
+        return {"status": 500, "code": "INTERNAL", "message": f"Internal server error: {str(e)}"}, 500
+
+
+async def get_app_instance(x_correlator=None, appId=None, appInstanceId=None, region=None, limit=None, pageToken=None):
+    """
+    Retrieve application instances from the database (READ_MODEL_ENABLED) or the SRM.
+    """
+    try:
+        app_instance_ids = as_id_list(appInstanceId)
+        if config.READ_MODEL_ENABLED and await read_model_ready():
+            query = app_instance_query(appId, app_instance_ids, region)
+            instances, next_token = await asyncio.to_thread(read_listing, APP_INSTANCES_COLLECTION, "appInstanceId", query, limit, pageToken)
+            if not instances and pageToken is None:
+                return {"status": 404, "code": "NOT_FOUND", "message": "No application instances found for the given parameters."}, 404
+            return listing_response(instances, next_token, envelope="appInstanceInfo")
+
+        pi_edge_client = AsyncPiEdgeAPIClientFactory().create_pi_edge_api_client()
+
+        filtered = appId is not None or app_instance_ids is not None or region is not None
+        if config.STREAMING_RESPONSES and not filtered and limit is None and pageToken is None:
+            empty, instances = await apeek(pi_edge_client.iter_app_instances())
+            if empty:
+                return {"status": 404, "code": "NOT_FOUND", "message": "No application instances found for the given parameters."}, 404
+            return StreamingResponse(astream_json_array(instances, envelope="appInstanceInfo"), media_type="application/json")
+
+        if app_instance_ids is not None:
+            results = await pi_edge_client.get_app_instances_by_id(app_instance_ids)
+            instances = [instance for instance in found_app_instances(results) if instance_matches(instance, appId, region)]
+        else:
+            instances = await pi_edge_client.get_app_instances()
+            if is_srm_error(instances):
+                return srm_error(instances)
+            if filtered and isinstance(instances, list):
+                instances = app_instance_index_for(instances).query(app_id=appId, region=region)
+
+        if not instances:
+            return {"status": 404, "code": "NOT_FOUND", "message": "No application instances found for the given parameters."}, 404
+
+        if (limit is not None or pageToken is not None) and isinstance(instances, list):
+            return paginated_response(instances, "appInstanceId", limit, pageToken, envelope="appInstanceInfo")
+
+        return {"appInstanceInfo": instances}, 200
+
+    except InvalidPageToken as e:
+        return {"status": 400, "code": "INVALID_ARGUMENT", "message": str(e)}, 400
+
+    except Exception as e:
+        logger.exception("Failed to retrieve app instances")
+        return {"status": 500, "code": "INTERNAL", "message": f"Internal server error: {str(e)}"}, 500
+
+
+async def delete_app_instance(appInstanceId: str, x_correlator=None):
+    try:
+        pi_edge_client = AsyncPiEdgeAPIClientFactory().create_pi_edge_api_client()
+        response = await pi_edge_client.delete_app_instance(appInstanceId)
+        if is_srm_error(response):
+            return srm_error(response)
+        if config.READ_MODEL_ENABLED:
+            read_model_sync.trigger()
+        return {"result": response.text, "status": response.status_code}
+    except Exception as e:
+        return {"status": 500, "code": "INTERNAL", "message": f"Internal server error: {str(e)}"}, 500
@@ -0,0 +1,111 @@
+"""
+asyncio versions of the handlers in edge_cloud_controller, served by the connexion AsyncApp.
+"""
+
+import asyncio
+from functools import partial
+from typing import Awaitable, Callable, List
+from pydantic import ValidationError
+from starlette.responses import StreamingResponse
+from edge_cloud_management_api.configs.env_config import config
+from edge_cloud_management_api.controllers.edge_cloud_controller import (
+    LOCAL_ZONE_SOURCE,
+    EdgeCloudQueryParams,
+    EdgeCloudZone,
+    get_zone_store,
+    partner_deadlines,
+    zone_refresher,
+    zone_response_headers,
+)
+from edge_cloud_management_api.managers.log_manager import logger
+from edge_cloud_management_api.managers.request_validation import validated_by_spec
+from edge_cloud_management_api.services.fan_out import PartialResult, async_fan_out
+from edge_cloud_management_api.services.federation_services import async_fetch_partner_zones, load_federation_partners
+from edge_cloud_management_api.services.json_stream import stream_json_array
+from edge_cloud_management_api.services.pi_edge_async_services import AsyncPiEdgeAPIClientFactory
+from edge_cloud_management_api.services.zone_snapshot import ZonesUnavailable
+
+
+async def fetch_local_zones() -> list[dict]:
+    """
+    Fetch local Operator Platform available zones from PiEdge Service Resource Manager.
+    Raises when the SRM cannot be reached or answers with an error.
+    """
+    api_client = AsyncPiEdgeAPIClientFactory().create_pi_edge_api_client()
+    result = await api_client.edge_cloud_zones()
+
+    if isinstance(result, dict) and "error" in result:
+        raise RuntimeError(f"SRM error: {result['error']}")
+
+    return result
+
+
+async def get_local_zones() -> list[dict]:
+    """
+    Get local Operator Platform available zones from PiEdge Service Resource Manager.
+    """
+    try:
+        return await fetch_local_zones()
+    except Exception:
+        logger.exception("Unexpected error while retrieving local zones from SRM")
+        return []
+
+
+async def get_federated_zones() -> List[EdgeCloudZone]:
+    """get partner/federated Operator Platform available zones from Federation Manager"""
+    partners = load_federation_partners()
+    sources = {partner.name: partial(async_fetch_partner_zones, partner) for partner in partners}
+    return await async_fan_out(sources, partner_deadlines(partners))
+
+
+async def discover_zones() -> PartialResult:
+    """
+    Query the local SRM and every federation partner concurrently, each within its own deadline.
+    """
+    partners = load_federation_partners()
+    sources: dict[str, Callable[[], Awaitable[list]]] = {LOCAL_ZONE_SOURCE: fetch_local_zones}
+    sources.update({partner.name: partial(async_fetch_partner_zones, partner) for partner in partners})
+    deadlines = {LOCAL_ZONE_SOURCE: config.ZONE_LOCAL_DEADLINE, **partner_deadlines(partners)}
+    return await async_fan_out(sources, deadlines)
+
+
+async def get_all_cloud_zones() -> List[dict]:
+    """get all available zones from local and federated Operator Platforms"""
+    if zone_refresher.enabled:
+        if zone_refresher.current is None:
+            # only the first load blocks, keep it off the event loop
+            return (await asyncio.to_thread(zone_refresher.get)).zones
+        return zone_refresher.get().zones
+    return await discover_zones()
+
+
+async def get_edge_cloud_zones(x_correlator: str | None = None, region=None, status=None):  # noqa: E501
+    """Retrieve a list of the operators Edge Cloud Zones and their status
+
+    :param x_correlator: Correlation id for the different services
+    :type x_correlator: str
+    :param region: Human readable name of the geographical Edge Cloud Region of the Edge Cloud. Defined by the Edge Cloud Provider.
+    :type region: str
+    :param status: Human readable status of the Edge Cloud Zone
+    :type status: str
+
+    :rtype: list[EdgeCloudZone]
+    """
+    try:
+        if not validated_by_spec():
+            # connexion checked the parameters against the spec already
+            EdgeCloudQueryParams(x_correlator=x_correlator, region=region, status=status)
+        zones = await get_all_cloud_zones()
+        response = get_zone_store(zones).query(region=region, status=status)
+        if config.STREAMING_RESPONSES:
+            return StreamingResponse(stream_json_array(response), media_type="application/json", headers=zone_response_headers(zones))
+        return response, 200, zone_response_headers(zones)
+
+    except ValidationError as e:
+        return {"status": 400, "code": "VALIDATION_ERROR", "message": e.errors()}, 400
+
+    except ZonesUnavailable as e:
+        return {"status": 503, "code": "UNAVAILABLE", "message": str(e)}, 503
+
+    except Exception as e:
+        return {"status": 500, "code": "INTERNAL_ERROR", "message": f"An error occurred: {str(e)}"}, 500
@@ -1,8 +1,17 @@
-from flask import jsonify
+from functools import partial
+from flask import Response, jsonify
 from pydantic import BaseModel, Field, ValidationError
-from typing import List
+from typing import Callable, List
+from edge_cloud_management_api.configs.env_config import config
 from edge_cloud_management_api.managers.log_manager import logger
+from edge_cloud_management_api.managers.request_validation import validated_by_spec
+from edge_cloud_management_api.services.fan_out import PartialResult, fan_out
+from edge_cloud_management_api.services.federation_services import fetch_partner_zones, load_federation_partners
+from edge_cloud_management_api.services.json_stream import stream_json_array
 from edge_cloud_management_api.services.pi_edge_services import PiEdgeAPIClientFactory
+from edge_cloud_management_api.services.srm_cache import get_srm_cache
+from edge_cloud_management_api.services.zone_snapshot import ZoneRefresher, ZonesUnavailable
+from edge_cloud_management_api.services.zone_store import ZoneStore, zone_store_for
 
 
 
@@ -28,48 +37,126 @@ class EdgeCloudQueryParams(BaseModel):
     )
 
 
+def fetch_local_zones(fresh: bool = False) -> list[dict]:
+    """
+    Fetch local Operator Platform available zones from PiEdge Service Resource Manager.
+    Raises when the SRM cannot be reached or answers with an error.
+
+    :param fresh: bypass the SRM read cache
+    """
+    pi_edge_factory = PiEdgeAPIClientFactory()
+    api_client = pi_edge_factory.create_pi_edge_api_client()
+    if fresh:
+        get_srm_cache().invalidate(api_client.cache_scope, "/node")
+    result = api_client.edge_cloud_zones()
+
+    if isinstance(result, dict) and "error" in result:
+        raise RuntimeError(f"SRM error: {result['error']}")
+
+    # zones = []
+    # for node in result:
+    #     try:
+    #         zone = EdgeCloudZone(
+    #             edgeCloudZoneId=node["id"],
+    #             edgeCloudZoneName=node.get("name", "unknown"),
+    #             edgeCloudZoneStatus=node.get("status", "unknown"),
+    #             edgeCloudProvider=node.get("provider", "local-provider"),
+    #             edgeCloudRegion=node.get("region", "default-region")
+    #         )
+    #         zones.append(zone.model_dump())
+    #     except Exception as e:
+    #         logger.warning(f"Failed to parse node into EdgeCloudZone: {e}")
+
+    return result
+
+
 def get_local_zones() -> list[dict]:
     """
     Get local Operator Platform available zones from PiEdge Service Resource Manager.
     """
     try:
-        pi_edge_factory = PiEdgeAPIClientFactory()
-        api_client = pi_edge_factory.create_pi_edge_api_client()
-        result = api_client.edge_cloud_zones()
-
-        if isinstance(result, dict) and "error" in result:
-            logger.error(f"SRM error: {result['error']}")
-            return []
-
-        # zones = []
-        # for node in result:
-        #     try:
-        #         zone = EdgeCloudZone(
-        #             edgeCloudZoneId=node["id"],
-        #             edgeCloudZoneName=node.get("name", "unknown"),
-        #             edgeCloudZoneStatus=node.get("status", "unknown"),
-        #             edgeCloudProvider=node.get("provider", "local-provider"),
-        #             edgeCloudRegion=node.get("region", "default-region")
-        #         )
-        #         zones.append(zone.model_dump())
-        #     except Exception as e:
-        #         logger.warning(f"Failed to parse node into EdgeCloudZone: {e}")
-
-        return result
-
-    except Exception as e:
+        return fetch_local_zones()
+    except Exception:
         logger.exception("Unexpected error while retrieving local zones from SRM")
         return []
 
 
+LOCAL_ZONE_SOURCE = "local-srm"
+
+
+def partner_deadlines(partners) -> dict[str, float]:
+    return {partner.name: partner.deadline or config.FEDERATION_PARTNER_DEADLINE for partner in partners}
+
+
 def get_federated_zones() -> List[EdgeCloudZone]:
     """get partner/federated Operator Platform available zones from Federation Manager"""
-    return []
+    partners = load_federation_partners()
+    sources = {partner.name: partial(fetch_partner_zones, partner) for partner in partners}
+    return fan_out(sources, partner_deadlines(partners), pool="zones")
+
 
+def discover_zones(fresh: bool = False) -> PartialResult:
+    """
+    Query the local SRM and every federation partner in parallel, each within its own deadline.
+    Sources that fail or time out are left out and listed in the result's `missing`.
+
+    :param fresh: bypass the SRM read cache for the local zones
+    """
+    partners = load_federation_partners()
+    sources: dict[str, Callable[[], list]] = {LOCAL_ZONE_SOURCE: lambda: fetch_local_zones(fresh=fresh)}
+    sources.update({partner.name: partial(fetch_partner_zones, partner) for partner in partners})
+    deadlines = {LOCAL_ZONE_SOURCE: config.ZONE_LOCAL_DEADLINE, **partner_deadlines(partners)}
+    return fan_out(sources, deadlines, pool="zones")
+
+
+def refresh_zones() -> PartialResult:
+    """
+    Loader of the zone refresher. Raises when the local SRM is missing, so the last good snapshot is kept instead.
+    """
+    zones = discover_zones(fresh=True)
+    if LOCAL_ZONE_SOURCE in zones.missing:
+        raise RuntimeError(f"local SRM: {zones.missing[LOCAL_ZONE_SOURCE]}")
+    return zones
 
-def get_all_cloud_zones() -> List[EdgeCloudZone]:
+
+# background-refreshed snapshot of get_all_cloud_zones(), kept warm so that requests never wait on the SRM
+zone_refresher = ZoneRefresher(refresh_zones, interval=config.ZONE_REFRESH_INTERVAL)
+
+
+def get_all_cloud_zones() -> List[dict]:
     """get all available zones from local and federated Operator Platforms"""
-    return get_local_zones() + get_federated_zones()
+    if zone_refresher.enabled:
+        return zone_refresher.get().zones
+    return discover_zones()
+
+
+def validate_zone(zone: dict) -> dict:
+    return EdgeCloudZone(**zone).model_dump()
+
+
+def get_zone_store(zones: list[dict]) -> ZoneStore:
+    """
+    Validated and indexed view of the zones, built once per zone snapshot.
+    """
+    return zone_store_for(zones, validate=validate_zone)
+
+
+def zone_response_headers(zones: list) -> dict:
+    """
+    Response headers describing where the zones come from:
+    - X-Missing-Zone-Sources: the SRM/partners that failed or missed their deadline (partial result)
+    - Age: age of the background snapshot, and a stale Warning when its latest refresh failed
+    """
+    headers = {}
+    missing = getattr(zones, "missing", None)
+    if missing:
+        headers["X-Missing-Zone-Sources"] = ",".join(missing)
+    snapshot = zone_refresher.current
+    if snapshot is not None and snapshot.zones is zones:
+        headers["Age"] = str(int(snapshot.age))
+        if snapshot.stale:
+            headers["Warning"] = '110 - "Response is Stale"'
+    return headers
 
 
 def get_edge_cloud_zones(x_correlator: str | None = None, region=None, status=None):  # noqa: E501
@@ -87,24 +174,18 @@ def get_edge_cloud_zones(x_correlator: str | None = None, region=None, status=No
     :rtype: list[EdgeCloudZone]
     """
     try:
-        query_params = EdgeCloudQueryParams(
-            x_correlator=x_correlator,
-            region=region,
-            status=status,
-        )
-
-        def query_region_matches(zone: str) -> bool:
-            """If region is None, return True (don't apply region filtering), otherwise check if the zone region matches the query region"""
-            return query_params.region is None or zone["edgeCloudRegion"] == query_params.region
-
-        def query_status_matches(zone: str) -> bool:
-            """If status is None, return True (don't apply status filtering), otherwise check if the zone status matches the query status"""
-            return (query_params.status is None) or (zone["edgeCloudZoneStatus"] == query_params.status)
-
-        # filtered_zones = [zone for zone in get_all_cloud_zones() if (query_region_matches(zone) and query_status_matches(zone))]
-        
-        response = [EdgeCloudZone(**zone).model_dump() for zone in get_all_cloud_zones()]
-        return jsonify(response), 200
+        if not validated_by_spec():
+            # connexion checked the parameters against the spec already
+            EdgeCloudQueryParams(x_correlator=x_correlator, region=region, status=status)
+
+        zones = get_all_cloud_zones()
+        filtered_zones = get_zone_store(zones).query(region=region, status=status)
+        if config.STREAMING_RESPONSES:
+            response = Response(stream_json_array(filtered_zones), mimetype="application/json")
+        else:
+            response = jsonify(filtered_zones)
+        response.headers.update(zone_response_headers(zones))
+        return response, 200
 
     except ValidationError as e:
         return (
@@ -112,6 +193,9 @@ def get_edge_cloud_zones(x_correlator: str | None = None, region=None, status=No
             400,
         )
 
+    except ZonesUnavailable as e:
+        return jsonify({"status": 503, "code": "UNAVAILABLE", "message": str(e)}), 503
+
     except Exception as e:
         error_info = {
             "status": 500,
@@ -1,19 +1,154 @@
-from pymongo import MongoClient
+import os
+import threading
+from itertools import islice
+from pymongo import MongoClient, ReplaceOne, ReturnDocument, monitoring
+from pymongo.errors import BulkWriteError
 from edge_cloud_management_api.configs.env_config import config
+from edge_cloud_management_api.managers.metrics_manager import MetricFamily, registry, timed_mongo_operation
+from edge_cloud_management_api.managers.trace_manager import traced_mongo_operation
+
+
+class MongoClientRegistry:
+    """
+    Process-lifetime registry that owns one pooled MongoClient per URI, shared by every MongoManager.
+
+    MongoClient is not fork-safe: a forked worker (pre-fork servers) discards the clients inherited from its parent
+    and builds its own on first use.
+    Pool size, minimum pool size (connections opened and kept warm in the background) and wait-queue timeout
+    come from the configuration.
+    """
+
+    _clients: dict[str, MongoClient] = {}
+    _pid: int | None = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def get_client(cls, mongo_uri: str) -> MongoClient:
+        if cls._pid == os.getpid():
+            client = cls._clients.get(mongo_uri)
+            if client is not None:
+                return client
+
+        with cls._lock:
+            if cls._pid != os.getpid():
+                # the parent's clients (and their monitor threads) are unusable after a fork, don't close them here
+                cls._clients = {}
+                cls._pid = os.getpid()
+            client = cls._clients.get(mongo_uri)
+            if client is None:
+                client = MongoClient(
+                    mongo_uri,
+                    maxPoolSize=config.MONGO_MAX_POOL_SIZE,
+                    minPoolSize=config.MONGO_MIN_POOL_SIZE,
+                    waitQueueTimeoutMS=config.MONGO_WAIT_QUEUE_TIMEOUT_MS,
+                )
+                cls._clients[mongo_uri] = client
+            return client
+
+    @classmethod
+    def close_all(cls):
+        """
+        Close every pooled client, e.g. on shutdown or between tests.
+        """
+        with cls._lock:
+            if cls._pid == os.getpid():
+                for client in cls._clients.values():
+                    client.close()
+            cls._clients = {}
+
+
+class MongoPoolMetrics(monitoring.ConnectionPoolListener):
+    """
+    Connections of every MongoClient pool per server: open, and checked out by an operation.
+    Registered globally with pymongo, so it sees the pools of clients created after import.
+    """
+
+    def __init__(self):
+        self._open: dict[str, int] = {}
+        self._checked_out: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def _add(self, counters, address, delta):
+        key = "{}:{}".format(*address)
+        with self._lock:
+            counters[key] = max(0, counters.get(key, 0) + delta)
+
+    def connection_created(self, event):
+        self._add(self._open, event.address, 1)
+
+    def connection_closed(self, event):
+        self._add(self._open, event.address, -1)
+
+    def connection_checked_out(self, event):
+        self._add(self._checked_out, event.address, 1)
+
+    def connection_checked_in(self, event):
+        self._add(self._checked_out, event.address, -1)
+
+    def pool_closed(self, event):
+        key = "{}:{}".format(*event.address)
+        with self._lock:
+            self._open.pop(key, None)
+            self._checked_out.pop(key, None)
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        pass
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_check_out_started(self, event):
+        pass
+
+    def connection_check_out_failed(self, event):
+        pass
+
+    def collect(self) -> list[MetricFamily]:
+        family = MetricFamily("oeg_mongo_pool_connections", "gauge", "MongoDB pool connections per server and state", ("address", "state"))
+        with self._lock:
+            for address in sorted(self._open.keys() | self._checked_out.keys()):
+                family.add(self._open.get(address, 0), address, "open").add(self._checked_out.get(address, 0), address, "checked_out")
+        return [family]
+
+
+mongo_pool_metrics = MongoPoolMetrics()
+monitoring.register(mongo_pool_metrics)
+registry.add_collector(mongo_pool_metrics.collect)
+
+
+def mongo_operation(method):
+    """
+    Instrument a MongoManager method: latency histogram, and a span of the current trace.
+    """
+    return timed_mongo_operation(traced_mongo_operation(method))
 
 
 class MongoManager:
     """
     A utility class for managing MongoDB operations.
-    The class implements the context manager protocol to ensure that the connection is closed after use.
+    The class implements the context manager protocol; the underlying pooled client is shared process-wide
+    (see MongoClientRegistry) and stays open after the block.
 
     Methods:
         insert_document: Inserts a document into a collection.
         find_document: Finds a single document in a collection.
         find_documents: Finds multiple documents in a collection.
+        find_page: Finds one page of documents with keyset pagination.
         update_document: Updates a single document in a collection.
+        find_one_and_update: Atomically updates a single document and returns it.
         delete_document: Deletes a single document in a collection.
-        close_connection: Closes the MongoDB connection.
+        bulk_write: Executes write operations in chunks, reporting per-chunk results.
+        bulk_upsert: Inserts or replaces many documents by key.
+        bulk_delete: Deletes many documents by key.
+        ensure_indexes: Creates indexes if they do not exist yet.
+        explain_find: Returns the query plan of a find.
+        close_connection: Releases the manager, the pooled connection stays open.
 
     Example:
         with MongoManager() as db:
@@ -21,14 +156,15 @@ class MongoManager:
 
     """
 
-    def __init__(self, mongo_uri=config.MONGO_URI):
+    def __init__(self, mongo_uri=None):
         """
         Initializes the MongoDB connection using the URI from Config.
         """
+        mongo_uri = mongo_uri or config.MONGO_URI
         if not mongo_uri:
             raise ValueError("MONGO_URI is not set in the environment configuration.")
 
-        self.client = MongoClient(mongo_uri, maxPoolSize=50)
+        self.client = MongoClientRegistry.get_client(mongo_uri)
         mongo_db_name: str = mongo_uri.split("/")[-1].split("?")[0]
         self.db = self.client[mongo_db_name]
 
@@ -38,6 +174,7 @@ class MongoManager:
     def __exit__(self, exc_type, exc_val, exc_tb):
         self.close_connection()
 
+    @mongo_operation
     def insert_document(self, collection_name, document):
         """
         Inserts a document into the specified collection.
@@ -46,20 +183,40 @@ class MongoManager:
         result = collection.insert_one(document)
         return result.inserted_id
 
-    def find_document(self, collection_name, query):
+    @mongo_operation
+    def find_document(self, collection_name, query, projection=None):
         """
         Finds a single document based on the query.
         """
         collection = self.db[collection_name]
-        return collection.find_one(query)
+        return collection.find_one(query, projection)
 
-    def find_documents(self, collection_name, query):
+    # not timed: the query runs while the caller iterates the returned cursor
+    def find_documents(self, collection_name, query, projection=None):
         """
         Finds multiple documents based on the query.
         """
         collection = self.db[collection_name]
-        return collection.find(query)
+        return collection.find(query, projection)
 
+    @mongo_operation
+    def find_page(self, collection_name, query, limit, after=None, sort_key="_id", projection=None):
+        """
+        Finds one page of documents ordered by sort_key, starting right after the key `after` (keyset pagination).
+        The query walks the sort_key index, so its cost depends on the page size, not on the page position.
+
+        Returns the documents of the page (at most limit) and the sort key to resume from, or None on the last page.
+        """
+        collection = self.db[collection_name]
+        if after is not None:
+            query = {"$and": [query, {sort_key: {"$gt": after}}]}
+        cursor = collection.find(query, projection).sort(sort_key, 1).limit(limit + 1)
+        documents = list(cursor)
+        if len(documents) <= limit:
+            return documents, None
+        return documents[:limit], documents[limit - 1][sort_key]
+
+    @mongo_operation
     def update_document(self, collection_name, query, update_data):
         """
         Updates a single document based on the query.
@@ -68,6 +225,19 @@ class MongoManager:
         result = collection.update_one(query, {"$set": update_data})
         return result.modified_count
 
+    @mongo_operation
+    def find_one_and_update(self, collection_name, query, update_data, sort=None, increment=None):
+        """
+        Atomically updates the first document matching the query (in sort order) and returns it as updated,
+        or None when no document matches. increment maps fields to the amount to add to them.
+        """
+        collection = self.db[collection_name]
+        update = {"$set": update_data}
+        if increment:
+            update["$inc"] = increment
+        return collection.find_one_and_update(query, update, sort=sort, return_document=ReturnDocument.AFTER)
+
+    @mongo_operation
     def delete_document(self, collection_name, query):
         """
         Deletes a single document based on the query.
@@ -76,8 +246,109 @@ class MongoManager:
         result = collection.delete_one(query)
         return result.deleted_count
 
+    @mongo_operation
+    def bulk_write(self, collection_name, operations, ordered=True, chunk_size=None):
+        """
+        Executes pymongo write operations (InsertOne, ReplaceOne, UpdateOne, DeleteOne, ...) taken from an iterable,
+        sending them in chunks of chunk_size (MONGO_BULK_CHUNK_SIZE by default), one round trip per chunk.
+
+        With ordered=True, execution stops at the first failing operation: later chunks are not sent.
+        With ordered=False, every chunk is sent and failures are only reported.
+
+        Returns a list with one result per executed chunk:
+            {"chunk": 0, "operations": 1000, "inserted": 0, "matched": 10, "modified": 8, "upserted": 990,
+             "deleted": 0, "errors": [{"index": 12, "code": 11000, "message": "..."}]}
+        where error indexes refer to the position of the operation in the whole iterable.
+        """
+        return self._bulk_write(collection_name, operations, ordered, chunk_size)
+
+    def _bulk_write(self, collection_name, operations, ordered, chunk_size):
+        """
+        bulk_write without instrumentation, for the bulk methods that are timed and traced themselves.
+        """
+        collection = self.db[collection_name]
+        chunk_size = chunk_size or config.MONGO_BULK_CHUNK_SIZE
+        operations = iter(operations)
+        results = []
+        offset = 0
+        while chunk := list(islice(operations, chunk_size)):
+            try:
+                details = collection.bulk_write(chunk, ordered=ordered).bulk_api_result
+            except BulkWriteError as err:
+                details = err.details
+            results.append(self._chunk_result(len(results), len(chunk), offset, details))
+            if ordered and results[-1]["errors"]:
+                break
+            offset += len(chunk)
+        return results
+
+    @mongo_operation
+    def bulk_upsert(self, collection_name, documents, key="_id", ordered=False, chunk_size=None):
+        """
+        Inserts or replaces each document, matched on its key field.
+        """
+        operations = (ReplaceOne({key: document[key]}, document, upsert=True) for document in documents)
+        return self._bulk_write(collection_name, operations, ordered, chunk_size)
+
+    @mongo_operation
+    def bulk_delete(self, collection_name, keys, key="_id", chunk_size=None):
+        """
+        Deletes the documents whose key field is in keys, with one $in delete per chunk of keys.
+        Returns the same per-chunk results as bulk_write.
+        """
+        collection = self.db[collection_name]
+        chunk_size = chunk_size or config.MONGO_BULK_CHUNK_SIZE
+        keys = iter(keys)
+        results = []
+        offset = 0
+        while chunk := list(islice(keys, chunk_size)):
+            deleted = collection.delete_many({key: {"$in": chunk}}).deleted_count
+            results.append(self._chunk_result(len(results), len(chunk), offset, {"nRemoved": deleted}))
+            offset += len(chunk)
+        return results
+
+    @mongo_operation
+    def ensure_indexes(self, collection_name, indexes):
+        """
+        Creates the given pymongo IndexModels; indexes that already exist with the same definition are left as they are.
+        Returns the index names.
+        """
+        collection = self.db[collection_name]
+        return collection.create_indexes(indexes)
+
+    @mongo_operation
+    def explain_find(self, collection_name, query, sort_key=None, limit=None):
+        """
+        Returns the explain() output of a find, optionally sorted on sort_key and limited, as issued by find_page.
+        """
+        collection = self.db[collection_name]
+        cursor = collection.find(query)
+        if sort_key:
+            cursor = cursor.sort(sort_key, 1)
+        if limit:
+            cursor = cursor.limit(limit)
+        return cursor.explain()
+
+    @staticmethod
+    def _chunk_result(chunk_index, size, offset, details):
+        return {
+            "chunk": chunk_index,
+            "operations": size,
+            "inserted": details.get("nInserted", 0),
+            "matched": details.get("nMatched", 0),
+            "modified": details.get("nModified", 0),
+            "upserted": details.get("nUpserted", 0),
+            "deleted": details.get("nRemoved", 0),
+            "errors": [
+                {"index": offset + error["index"], "code": error.get("code"), "message": error.get("errmsg")}
+                for error in details.get("writeErrors", [])
+            ],
+        }
+
     def close_connection(self):
         """
-        Closes the MongoDB connection.
+        Releases the manager. The pooled client is shared with other managers and is not closed;
+        use MongoClientRegistry.close_all() to close it.
         """
-        self.client.close()
+        self.client = None
+        self.db = None
@@ -0,0 +1,139 @@
+"""
+JSON encoding and decoding of the API responses and of the SRM payloads: with orjson when it is installed, else with
+the stdlib json module. JSON_BACKEND selects it: "auto" (default), "orjson" or "stdlib".
+
+- JSONProvider is the Flask app's app.json, used by jsonify and request.get_json;
+- Jsonifier serializes the dicts and lists that handlers return, on the Flask and the async app;
+- the SRM clients encode request bodies with dumps and decode responses with response_json.
+
+Both backends encode the same documents, compact and in UTF-8: dates and other types orjson does not know go through
+the same default function as with the stdlib encoder, non-string keys become strings, and integers orjson rejects
+(beyond 64 bits) are left to the stdlib encoder.
+"""
+
+import json
+import typing as t
+from connexion.jsonifier import JSONEncoder as ConnexionJSONEncoder, Jsonifier as ConnexionJsonifier
+from flask.json.provider import DefaultJSONProvider
+from edge_cloud_management_api.configs.env_config import config
+
+# connexion's encoding of datetimes (ISO 8601), dates, decimals and UUIDs, for the dicts handlers return
+connexion_default = ConnexionJSONEncoder().default
+
+
+class StdlibJSON:
+    name = "stdlib"
+
+    def dumps(self, value, default: t.Callable | None = None, sort_keys: bool = False) -> bytes:
+        return json.dumps(value, default=default, sort_keys=sort_keys, ensure_ascii=False, separators=(",", ":")).encode()
+
+    def loads(self, data: bytes | str):
+        return json.loads(data)
+
+
+class OrjsonJSON:
+    """
+    Requires the optional 'orjson' package.
+    """
+
+    name = "orjson"
+
+    def __init__(self):
+        import orjson
+
+        self._orjson = orjson
+        # datetimes are handed to default, as the stdlib encoder does
+        self._option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+    def dumps(self, value, default: t.Callable | None = None, sort_keys: bool = False) -> bytes:
+        option = self._option | self._orjson.OPT_SORT_KEYS if sort_keys else self._option
+        try:
+            return self._orjson.dumps(value, default=default, option=option)
+        except self._orjson.JSONEncodeError:
+            # an integer beyond 64 bits, or a value default cannot encode: the stdlib encoder encodes or raises
+            return STDLIB_JSON.dumps(value, default, sort_keys)
+
+    def loads(self, data: bytes | str):
+        return self._orjson.loads(data)
+
+
+STDLIB_JSON = StdlibJSON()
+
+
+def build_json_codec(backend: str = "auto"):
+    """
+    Build the JSON codec selected by JSON_BACKEND ("auto", "orjson" or "stdlib").
+    """
+    if backend in ("auto", "orjson"):
+        try:
+            return OrjsonJSON()
+        except ImportError as err:
+            if backend == "orjson":
+                raise RuntimeError("JSON_BACKEND=orjson requires the 'orjson' package to be installed") from err
+        return STDLIB_JSON
+    if backend == "stdlib":
+        return STDLIB_JSON
+    raise ValueError(f"Unknown JSON_BACKEND: {backend}")
+
+
+json_codec = build_json_codec(config.JSON_BACKEND)
+
+
+def dumps(value, default: t.Callable | None = None, sort_keys: bool = False) -> bytes:
+    return json_codec.dumps(value, default, sort_keys)
+
+
+def loads(data: bytes | str):
+    """
+    Decode a JSON document. Raises a ValueError (json.JSONDecodeError) when it is not one.
+    """
+    return json_codec.loads(data)
+
+
+def response_json(response):
+    """
+    The decoded JSON body of a requests or httpx response, in place of response.json().
+    """
+    return loads(response.content)
+
+
+class JSONProvider(DefaultJSONProvider):
+    """
+    Flask's default JSON provider on the JSON codec: sorted keys, dates as HTTP dates, indented in debug mode.
+    Calls with the stdlib encoder's options (indent, separators...) keep going through the json module.
+    """
+
+    def dumps(self, obj, **kwargs) -> str:
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        return dumps(obj, self.default, self.sort_keys).decode()
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return loads(s)
+
+    def response(self, *args, **kwargs):
+        if self.compact is False or (self.compact is None and self._app.debug):
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(dumps(obj, self.default, self.sort_keys) + b"\n", mimetype=self.mimetype)
+
+
+class Jsonifier(ConnexionJsonifier):
+    """
+    connexion's Jsonifier on the JSON codec, compact on both apps (the Flask app's default indents the responses).
+    """
+
+    def dumps(self, data, **kwargs):
+        if kwargs:
+            return super().dumps(data, **kwargs)
+        return dumps(data, connexion_default).decode() + "\n"
+
+    def loads(self, data):
+        if isinstance(data, bytes):
+            data = data.decode()
+        try:
+            return loads(data)
+        except ValueError:
+            return data
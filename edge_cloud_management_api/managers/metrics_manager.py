@@ -0,0 +1,316 @@
+"""
+In-process metrics, served on METRICS_PATH in the Prometheus text exposition format (version 0.0.4).
+
+Counters and histograms are updated on the request path: each is a dict of label values -> series behind one lock,
+so an update costs a dict lookup and a bisect. Values that already live elsewhere (SRM cache, circuits, pools) are
+read at scrape time by collectors that the owning modules register with `registry.add_collector`.
+
+Example:
+    srm_calls = registry.register(Histogram("srm_call_seconds", "SRM call latency", ("method", "endpoint", "status")))
+    srm_calls.observe(0.042, "GET", "/node", "200")
+"""
+
+import bisect
+import functools
+import math
+import threading
+import time
+from edge_cloud_management_api.managers.log_manager import logger
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def escape_label_value(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def format_labels(names, values) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{escape_label_value(value)}"' for name, value in zip(names, values)) + "}"
+
+
+def format_value(value) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+class MetricFamily:
+    """
+    Samples of one metric, as rendered in the exposition format. Collectors build them at scrape time.
+    """
+
+    def __init__(self, name: str, kind: str, documentation: str, labelnames=()):
+        self.name = name
+        self.kind = kind
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.samples: list[tuple[str, tuple, tuple, float]] = []
+
+    def add(self, value, *label_values, suffix: str = "", extra_labels: tuple = ()):
+        """
+        Add a sample; extra_labels are (name, value) pairs such as ("le", "0.5") for histogram buckets.
+        """
+        names = self.labelnames + tuple(name for name, _ in extra_labels)
+        values = tuple(label_values) + tuple(value for _, value in extra_labels)
+        self.samples.append((suffix, names, values, value))
+        return self
+
+    def render(self, constant_labels: tuple = ()) -> list[str]:
+        """
+        The exposition lines of the family; constant_labels are (name, value) pairs added to every sample.
+        """
+        constant_names = tuple(name for name, _ in constant_labels)
+        constant_values = tuple(value for _, value in constant_labels)
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(
+            f"{self.name}{suffix}{format_labels(names + constant_names, values + constant_values)} {format_value(value)}"
+            for suffix, names, values, value in self.samples
+        )
+        return lines
+
+
+class Counter:
+    """
+    Monotonic counter per label values.
+    """
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values, amount: float = 1.0):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0.0) + amount
+
+    def value(self, *label_values) -> float:
+        with self._lock:
+            return self._values.get(label_values, 0.0)
+
+    def collect(self) -> MetricFamily:
+        family = MetricFamily(self.name, self.kind, self.documentation, self.labelnames)
+        with self._lock:
+            values = sorted(self._values.items())
+        for label_values, value in values:
+            family.add(value, *label_values, suffix="_total" if not self.name.endswith("_total") else "")
+        return family
+
+    def reset(self):
+        with self._lock:
+            self._values.clear()
+
+
+class Histogram:
+    """
+    Latency histogram per label values, with cumulative buckets, _sum and _count as Prometheus expects.
+    """
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [count per bucket (the last one is +Inf, not cumulative), sum]
+        self._series: dict[tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *label_values):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def time(self, *label_values):
+        """
+        Context manager observing the duration of its block.
+        """
+        return _Timer(self, label_values)
+
+    def count(self, *label_values) -> int:
+        with self._lock:
+            series = self._series.get(label_values)
+            return sum(series[0]) if series else 0
+
+    def collect(self) -> MetricFamily:
+        family = MetricFamily(self.name, self.kind, self.documentation, self.labelnames)
+        with self._lock:
+            series = sorted((label_values, (list(counts), total)) for label_values, (counts, total) in self._series.items())
+        for label_values, (counts, total) in series:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (math.inf,), counts):
+                cumulative += bucket_count
+                family.add(cumulative, *label_values, suffix="_bucket", extra_labels=(("le", format_value(float(bound))),))
+            family.add(total, *label_values, suffix="_sum")
+            family.add(cumulative, *label_values, suffix="_count")
+        return family
+
+    def reset(self):
+        with self._lock:
+            self._series.clear()
+
+
+class _Timer:
+    def __init__(self, histogram, label_values):
+        self.histogram = histogram
+        self.label_values = label_values
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.histogram.observe(time.perf_counter() - self.started, *self.label_values)
+
+
+class Registry:
+    """
+    The metrics of the process, and the collectors called on every scrape.
+    """
+
+    def __init__(self):
+        self._metrics: dict[str, Counter | Histogram] = {}
+        self._collectors: list = []
+        self._constant_labels: tuple = ()
+        self._lock = threading.Lock()
+
+    def set_constant_labels(self, **labels):
+        """
+        Labels added to every sample, e.g. worker="<pid>" in each process of a multi-worker server.
+        """
+        self._constant_labels = tuple((name, str(value)) for name, value in labels.items())
+
+    def register(self, metric):
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} is already registered")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def add_collector(self, collector):
+        """
+        Register a function returning MetricFamily objects, called on every scrape. A failing collector is skipped.
+        """
+        with self._lock:
+            self._collectors.append(collector)
+        return collector
+
+    def collect(self) -> list[MetricFamily]:
+        with self._lock:
+            metrics, collectors = list(self._metrics.values()), list(self._collectors)
+        families = [metric.collect() for metric in metrics]
+        for collector in collectors:
+            try:
+                families.extend(collector())
+            except Exception as err:
+                logger.warning(f"Metrics collector {getattr(collector, '__name__', collector)} failed: {err}")
+        return families
+
+    def render(self) -> str:
+        lines = []
+        for family in self.collect():
+            lines.extend(family.render(self._constant_labels))
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        """
+        Clear the values of every metric (tests).
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+        for metric in metrics:
+            metric.reset()
+
+
+registry = Registry()
+
+http_requests = registry.register(Counter("oeg_http_requests_total", "API requests per connexion operation, method and status", ("operation", "method", "status")))
+http_request_duration = registry.register(
+    Histogram("oeg_http_request_duration_seconds", "API request latency per connexion operation", ("operation", "method"))
+)
+srm_request_duration = registry.register(
+    Histogram("oeg_srm_request_duration_seconds", "SRM call latency per endpoint and status (HTTP status, or the error class)", ("method", "endpoint", "status"))
+)
+mongo_operation_duration = registry.register(
+    Histogram("oeg_mongo_operation_duration_seconds", "MongoManager operation latency per method and collection", ("operation", "collection"))
+)
+
+
+def timed_mongo_operation(method):
+    """
+    Decorator for MongoManager methods taking the collection name first: observe their duration in mongo_operation_duration.
+    """
+    operation = method.__name__
+
+    @functools.wraps(method)
+    def wrapper(self, collection_name, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return method(self, collection_name, *args, **kwargs)
+        finally:
+            mongo_operation_duration.observe(time.perf_counter() - started, operation, collection_name)
+
+    return wrapper
+
+
+def operation_label(operation_id: str | None) -> str:
+    """
+    Short operation label: the controller module and function of an operationId, e.g. "app_controllers.get_apps".
+    """
+    if not operation_id:
+        return "unmatched"
+    return ".".join(operation_id.rsplit(".", 2)[-2:])
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware counting and timing every API request per connexion operationId, and serving the metrics on path.
+    Added before connexion's exception middleware, so requests rejected by validation or failing are measured too;
+    the operationId is read from the routing information connexion leaves in the scope.
+    """
+
+    def __init__(self, app, path: str = "/metrics"):
+        self.app = app
+        self.path = path
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        if scope["path"] == self.path:
+            await self.serve_metrics(send)
+            return
+
+        started = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            operation = operation_label(scope.get("extensions", {}).get("connexion_routing", {}).get("operation_id"))
+            http_request_duration.observe(time.perf_counter() - started, operation, scope["method"])
+            http_requests.inc(operation, scope["method"], str(status))
+
+    async def serve_metrics(self, send):
+        body = registry.render().encode()
+        await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", CONTENT_TYPE.encode()), (b"content-length", str(len(body)).encode())]})
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,123 @@
+"""
+Declarative registry of the MongoDB indexes the API relies on, and of the query shapes they must serve.
+
+Indexes are applied idempotently once, before the API's workers start (server.main, or
+`python -m edge_cloud_management_api.managers.mongo_indexes` as a deploy step); create_indexes is a no-op for an index
+that already exists with the same definition. QUERY_SHAPES lists the queries issued by the controllers, so that collection_scans() can check with
+explain() that none of them falls back to a full collection scan.
+"""
+
+import sys
+import threading
+from pymongo import ASCENDING, IndexModel, MongoClient
+from edge_cloud_management_api.configs.env_config import config
+from edge_cloud_management_api.managers.db_manager import MongoManager
+from edge_cloud_management_api.managers.log_manager import logger
+
+MONGO_INDEXES: dict[str, list[IndexModel]] = {
+    "apps": [
+        IndexModel([("appId", ASCENDING)], name="appId"),
+    ],
+    "appinstances": [
+        IndexModel([("appInstanceId", ASCENDING)], name="appInstanceId"),
+        # listings are sorted on appInstanceId (keyset pagination), so the filtered ones need it as a suffix
+        IndexModel([("appId", ASCENDING), ("appInstanceId", ASCENDING)], name="appId_appInstanceId"),
+        IndexModel([("edgeCloudZone.edgeCloudRegion", ASCENDING), ("appInstanceId", ASCENDING)], name="edgeCloudRegion_appInstanceId"),
+    ],
+    "deployment_jobs": [
+        # sparse: jobs submitted without a key do not store the field
+        IndexModel([("idempotencyKey", ASCENDING)], name="idempotencyKey", unique=True, sparse=True),
+        # job claims: due pending jobs, and running jobs whose lease expired
+        IndexModel([("status", ASCENDING), ("runAt", ASCENDING)], name="status_runAt"),
+        IndexModel([("status", ASCENDING), ("leaseUntil", ASCENDING)], name="status_leaseUntil"),
+    ],
+}
+
+QUERY_SHAPES: list[dict] = [
+    {"name": "list apps", "collection": "apps", "query": {}, "sort": "appId"},
+    {"name": "get app", "collection": "apps", "query": {"appId": "shape"}},
+    {"name": "list app instances", "collection": "appinstances", "query": {}, "sort": "appInstanceId"},
+    {"name": "get app instance", "collection": "appinstances", "query": {"appInstanceId": "shape"}, "sort": "appInstanceId"},
+    {"name": "app instances by app", "collection": "appinstances", "query": {"appId": "shape"}, "sort": "appInstanceId"},
+    {"name": "app instances by region", "collection": "appinstances", "query": {"edgeCloudZone.edgeCloudRegion": "shape"}, "sort": "appInstanceId"},
+    {
+        "name": "app instances by app and region",
+        "collection": "appinstances",
+        "query": {"appId": "shape", "edgeCloudZone.edgeCloudRegion": "shape"},
+        "sort": "appInstanceId",
+    },
+    {"name": "get deployment job", "collection": "deployment_jobs", "query": {"_id": "shape"}},
+    {"name": "deployment job by idempotency key", "collection": "deployment_jobs", "query": {"idempotencyKey": "shape"}},
+    {
+        "name": "claim deployment job",
+        "collection": "deployment_jobs",
+        "query": {"$or": [{"status": "pending", "runAt": {"$lte": 0}}, {"status": "running", "leaseUntil": {"$lte": 0}}]},
+        "sort": "runAt",
+    },
+]
+
+# MONGO_URI -> None once the indexes were applied, else the error of the attempt
+_bootstrapped: dict[str, str | None] = {}
+_bootstrap_lock = threading.Lock()
+
+
+def apply_indexes(db: MongoManager, indexes: dict[str, list[IndexModel]] = MONGO_INDEXES) -> dict[str, list[str]]:
+    """
+    Create the registered indexes; returns the index names per collection.
+    """
+    return {collection_name: db.ensure_indexes(collection_name, models) for collection_name, models in indexes.items()}
+
+
+def bootstrap_indexes(mongo_uri=None) -> bool:
+    """
+    Apply the registered indexes once per process, with a client of its own that gives up after
+    MONGO_INDEX_BOOTSTRAP_TIMEOUT_MS when MongoDB is unreachable. The outcome is recorded: a failure is logged and not
+    retried, the API still starts. Returns whether the indexes are in place.
+    """
+    mongo_uri = mongo_uri or config.MONGO_URI
+    if not mongo_uri or not config.MONGO_INDEX_BOOTSTRAP:
+        return False
+    with _bootstrap_lock:
+        if mongo_uri not in _bootstrapped:
+            timeout_ms = int(config.MONGO_INDEX_BOOTSTRAP_TIMEOUT_MS)
+            client: MongoClient = MongoClient(mongo_uri, serverSelectionTimeoutMS=timeout_ms, connectTimeoutMS=timeout_ms)
+            try:
+                db = client[mongo_uri.split("/")[-1].split("?")[0]]
+                names = {collection_name: db[collection_name].create_indexes(models) for collection_name, models in MONGO_INDEXES.items()}
+                logger.info(f"MongoDB indexes in place: {names}")
+                _bootstrapped[mongo_uri] = None
+            except Exception as err:
+                logger.error(f"Failed to create MongoDB indexes: {err}")
+                _bootstrapped[mongo_uri] = str(err)
+            finally:
+                client.close()
+        return _bootstrapped[mongo_uri] is None
+
+
+def plan_stages(plan: dict):
+    """
+    Yield the stage names of an explain() plan tree, e.g. "LIMIT", "FETCH", "IXSCAN".
+    """
+    if "stage" in plan:
+        yield plan["stage"]
+    for value in plan.values():
+        children = value if isinstance(value, list) else [value]
+        for child in children:
+            if isinstance(child, dict):
+                yield from plan_stages(child)
+
+
+def collection_scans(db: MongoManager, shapes: list[dict] = QUERY_SHAPES) -> list[str]:
+    """
+    Explain every query shape and return the names of those whose winning plan scans the whole collection.
+    """
+    offenders = []
+    for shape in shapes:
+        explanation = db.explain_find(shape["collection"], shape["query"], sort_key=shape.get("sort"), limit=config.PAGE_SIZE_DEFAULT + 1)
+        if "COLLSCAN" in plan_stages(explanation["queryPlanner"]["winningPlan"]):
+            offenders.append(shape["name"])
+    return offenders
+
+
+if __name__ == "__main__":
+    sys.exit(0 if bootstrap_indexes() else 1)
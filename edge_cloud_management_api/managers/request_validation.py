@@ -0,0 +1,297 @@
+"""
+Request validators compiled once per operation schema.
+
+Connexion builds a new jsonschema validator for the body and for every parameter of each request, and jsonschema
+interprets the schema keyword by keyword on every call. Here each schema of the spec is compiled, the first time an
+operation uses it, into a tree of plain Python checks (compile_check) for the Draft 4 keywords the spec uses.
+A valid request only runs those checks; an invalid one, or a schema with a keyword the compiler does not know, goes
+through connexion's jsonschema validator, which is also compiled once, so the 400 answers are unchanged.
+
+The schemas are the dicts of the loaded spec and live as long as the app; validators are cached by their identity.
+They are passed to add_api with VALIDATOR_MAP.
+
+Controllers reached through connexion get parameters and bodies that already passed the spec's validation, and use
+validated_by_spec() to skip checking them again with their pydantic models.
+"""
+
+import re
+import threading
+from typing import Callable
+from connexion.context import _operation
+from connexion.datastructures import MediaTypeDict
+from connexion.json_schema import Draft4RequestValidator
+from connexion.utils import is_null, is_nullable
+from connexion.validators import VALIDATOR_MAP as CONNEXION_VALIDATOR_MAP, JSONRequestBodyValidator, ParameterValidator
+from jsonschema import Draft4Validator, ValidationError
+
+FORMAT_CHECKER = Draft4Validator.FORMAT_CHECKER
+# more schemas than any spec of ours holds: a cache this large means schemas are built per request, so start over
+MAX_COMPILED_VALIDATORS = 1024
+
+# keywords with no effect on validation
+ANNOTATIONS = frozenset(
+    {"title", "description", "example", "examples", "default", "discriminator", "readOnly", "writeOnly", "deprecated", "externalDocs", "xml"}
+)
+# Draft 4 types, as jsonschema checks them: booleans are not numbers, and 1.0 is not an integer
+TYPES: dict[str, Callable[[object], bool]] = {
+    "string": lambda instance: isinstance(instance, str),
+    "integer": lambda instance: isinstance(instance, int) and not isinstance(instance, bool),
+    "number": lambda instance: isinstance(instance, (int, float)) and not isinstance(instance, bool),
+    "boolean": lambda instance: isinstance(instance, bool),
+    "array": lambda instance: isinstance(instance, list),
+    "object": lambda instance: isinstance(instance, dict),
+    "null": lambda instance: instance is None,
+}
+
+_compiled: dict[tuple, tuple[dict, object]] = {}
+_compiled_lock = threading.Lock()
+
+
+class Unsupported(Exception):
+    """
+    The schema uses a keyword, or a form of one, that compile_check does not handle.
+    """
+
+
+def _is_number(instance) -> bool:
+    return isinstance(instance, (int, float)) and not isinstance(instance, bool)
+
+
+def _reject(instance) -> bool:
+    return False
+
+
+def _any_type(type_checks: list) -> Callable[[object], bool]:
+    return lambda instance: any(check(instance) for check in type_checks)
+
+
+def _keyword_checks(schema: dict, nullable: bool) -> list:
+    """
+    One check per validation keyword of schema, each answering True for an instance the keyword accepts.
+    """
+    checks = []
+    # connexion's request validator lets null through the type and enum of a nullable schema
+    allows_null = nullable and (schema.get("nullable") or schema.get("x-nullable") is True)
+    for keyword, value in schema.items():
+        if keyword in ANNOTATIONS or keyword.startswith("x-") or keyword in ("nullable", "components", "additionalProperties"):
+            continue
+        if keyword == "type":
+            names = value if isinstance(value, list) else [value]
+            if not all(name in TYPES for name in names):
+                raise Unsupported(f"type {value}")
+            if len(names) == 1:
+                type_check = TYPES[names[0]]
+            else:
+                type_check = _any_type([TYPES[name] for name in names])
+            checks.append(lambda instance, type_check=type_check: type_check(instance) or (allows_null and instance is None))
+        elif keyword == "enum":
+            if not all(isinstance(choice, str) for choice in value):
+                raise Unsupported("enum of non-strings")
+            choices = frozenset(value)
+            checks.append(lambda instance, choices=choices: (isinstance(instance, str) and instance in choices) or (allows_null and instance is None))
+        elif keyword == "format":
+            if value in FORMAT_CHECKER.checkers:
+                checks.append(lambda instance, value=value: FORMAT_CHECKER.conforms(instance, value))
+        elif keyword == "pattern":
+            search = re.compile(value).search
+            checks.append(lambda instance, search=search: not isinstance(instance, str) or search(instance) is not None)
+        elif keyword == "minLength":
+            checks.append(lambda instance, value=value: not isinstance(instance, str) or len(instance) >= value)
+        elif keyword == "maxLength":
+            checks.append(lambda instance, value=value: not isinstance(instance, str) or len(instance) <= value)
+        elif keyword == "minimum":
+            if schema.get("exclusiveMinimum"):
+                checks.append(lambda instance, value=value: not _is_number(instance) or instance > value)
+            else:
+                checks.append(lambda instance, value=value: not _is_number(instance) or instance >= value)
+        elif keyword == "maximum":
+            if schema.get("exclusiveMaximum"):
+                checks.append(lambda instance, value=value: not _is_number(instance) or instance < value)
+            else:
+                checks.append(lambda instance, value=value: not _is_number(instance) or instance <= value)
+        elif keyword in ("exclusiveMinimum", "exclusiveMaximum"):
+            # Draft 4 booleans, applied with minimum and maximum
+            if not isinstance(value, bool):
+                raise Unsupported(keyword)
+        elif keyword == "minItems":
+            checks.append(lambda instance, value=value: not isinstance(instance, list) or len(instance) >= value)
+        elif keyword == "maxItems":
+            checks.append(lambda instance, value=value: not isinstance(instance, list) or len(instance) <= value)
+        elif keyword == "items":
+            if not isinstance(value, dict):
+                raise Unsupported("items as a list")
+            item_check = compile_check(value, nullable)
+            checks.append(lambda instance, item_check=item_check: not isinstance(instance, list) or all(item_check(item) for item in instance))
+        elif keyword == "required":
+            if not isinstance(value, list):
+                # the required flag of a parameter, not the keyword
+                raise Unsupported("required")
+            required = tuple(value)
+            checks.append(lambda instance, required=required: not isinstance(instance, dict) or all(name in instance for name in required))
+        elif keyword == "properties":
+            checks.append(_properties_check(value, schema.get("additionalProperties", True), nullable))
+        elif keyword in ("allOf", "anyOf", "oneOf"):
+            branches = [compile_check(branch, nullable) for branch in value]
+            if keyword == "allOf":
+                checks.append(lambda instance, branches=branches: all(branch(instance) for branch in branches))
+            elif keyword == "anyOf":
+                checks.append(lambda instance, branches=branches: any(branch(instance) for branch in branches))
+            else:
+                checks.append(lambda instance, branches=branches: sum(1 for branch in branches if branch(instance)) == 1)
+        else:
+            raise Unsupported(keyword)
+    if "additionalProperties" in schema and "properties" not in schema:
+        checks.append(_properties_check({}, schema["additionalProperties"], nullable))
+    return checks
+
+
+def _properties_check(properties: dict, additional, nullable: bool):
+    property_checks = {name: compile_check(subschema, nullable) for name, subschema in properties.items()}
+    additional_check: Callable | None
+    if additional is True or additional == {}:
+        additional_check = None
+    elif additional is False:
+        additional_check = _reject
+    elif isinstance(additional, dict):
+        additional_check = compile_check(additional, nullable)
+    else:
+        raise Unsupported("additionalProperties")
+
+    def check(instance) -> bool:
+        if not isinstance(instance, dict):
+            return True
+        for name, value in instance.items():
+            property_check = property_checks.get(name)
+            if property_check is not None:
+                if not property_check(value):
+                    return False
+            elif additional_check is not None and not additional_check(value):
+                return False
+        return True
+
+    return check
+
+
+def compile_check(schema: dict, nullable: bool = True):
+    """
+    Compile a Draft 4 schema into a function telling whether an instance is valid against it, with the semantics
+    of connexion's request validator (nullable) or of plain Draft 4 (nullable=False). Raises Unsupported for a
+    schema the compiler does not handle.
+    """
+    if not isinstance(schema, dict) or "$ref" in schema:
+        raise Unsupported("$ref")
+    checks = _keyword_checks(schema, nullable)
+    if not checks:
+        return lambda instance: True
+    if len(checks) == 1:
+        return checks[0]
+
+    def check(instance) -> bool:
+        for keyword_check in checks:
+            if not keyword_check(instance):
+                return False
+        return True
+
+    return check
+
+
+def _cached(schema: dict, kind, build):
+    """
+    What build(schema) returns, built on first use. Entries are keyed by the identity of the schema dict and keep a
+    reference to it, so the key cannot be reused by another dict.
+    """
+    key = (kind, id(schema))
+    entry = _compiled.get(key)
+    if entry is not None and entry[0] is schema:
+        return entry[1]
+    compiled = build(schema)
+    with _compiled_lock:
+        if len(_compiled) >= MAX_COMPILED_VALIDATORS:
+            _compiled.clear()
+        _compiled[key] = (schema, compiled)
+    return compiled
+
+
+def compiled_validator(schema: dict, validator_cls: type = Draft4RequestValidator) -> Draft4Validator:
+    """
+    The jsonschema validator of schema, built on first use.
+    """
+    return _cached(schema, validator_cls, lambda schema: validator_cls(schema, format_checker=FORMAT_CHECKER))
+
+
+def compiled_check(schema: dict, validator_cls: type = Draft4RequestValidator):
+    """
+    compile_check(schema) with the semantics of validator_cls, built on first use; the validator's is_valid when the
+    schema cannot be compiled.
+    """
+
+    def build(schema):
+        try:
+            return compile_check(schema, nullable=validator_cls is Draft4RequestValidator)
+        except Unsupported:
+            return compiled_validator(schema, validator_cls).is_valid
+
+    return _cached(schema, ("check", validator_cls), build)
+
+
+def compiled_count() -> int:
+    return len(_compiled)
+
+
+def clear_compiled():
+    with _compiled_lock:
+        _compiled.clear()
+
+
+class CompiledJSONRequestBodyValidator(JSONRequestBodyValidator):
+    """
+    JSONRequestBodyValidator checking bodies with the compiled schema, and reporting the errors of an invalid one
+    with connexion's validator.
+    """
+
+    @property
+    def _validator(self):
+        return compiled_validator(self._schema)
+
+    def _validate(self, body):
+        if body is not None and compiled_check(self._schema)(body):
+            return None
+        return super()._validate(body)
+
+
+class CompiledParameterValidator(ParameterValidator):
+    """
+    ParameterValidator with compiled parameter schemas, instead of a deep copy of the parameter and a new validator
+    for every value.
+    """
+
+    @staticmethod
+    def validate_parameter(parameter_type, value, param, param_name=None):
+        if is_nullable(param) and is_null(value):
+            return
+
+        elif value is not None:
+            schema = param.get("schema", param)
+            if compiled_check(schema, Draft4Validator)(value):
+                return
+            try:
+                compiled_validator(schema, Draft4Validator).validate(value)
+            except ValidationError as exception:
+                return str(exception)
+
+        elif param.get("required"):
+            return f"Missing {parameter_type} parameter '{param['name']}'"
+
+
+VALIDATOR_MAP = {
+    "parameter": CompiledParameterValidator,
+    "body": MediaTypeDict({**CONNEXION_VALIDATOR_MAP["body"], "*/*json": CompiledJSONRequestBodyValidator}),
+}
+
+
+def validated_by_spec() -> bool:
+    """
+    Whether the current call is a request routed by connexion, whose parameters and body passed the spec's
+    validation. False for a controller called directly, e.g. from a test or a script.
+    """
+    return _operation.get(None) is not None
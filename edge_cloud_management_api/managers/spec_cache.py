@@ -0,0 +1,109 @@
+"""
+Cache of the parsed and validated OpenAPI specification, so that a starting worker skips the YAML parsing and the
+OpenAPI schema validation connexion would otherwise run on the 2.6k-line spec.
+
+The cache is a JSON file named after the SHA-256 of the spec file and of the connexion version, so an edited spec or an
+upgraded connexion never loads a stale entry. It is written on first boot, or at build time with:
+
+    python -m edge_cloud_management_api.managers.spec_cache
+
+Connexion builds its request validators from the spec when the app starts; jsonschema validators hold compiled
+closures and references and cannot be serialized, so those are still built per process.
+"""
+
+import contextlib
+import hashlib
+import json
+import os
+import tempfile
+from importlib.metadata import version
+from pathlib import Path
+import yaml
+from connexion.spec import OpenAPISpecification, Specification
+from edge_cloud_management_api.configs.env_config import config
+from edge_cloud_management_api.managers.log_manager import logger
+
+SPEC_FILE = Path(__file__).resolve().parent.parent / "specification" / "openapi.yaml"
+DEFAULT_CACHE_DIR = SPEC_FILE.parent / ".cache"
+# libyaml's loader when PyYAML was built with it, about ten times faster than the pure Python one
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+def spec_digest(spec_file: Path = SPEC_FILE) -> str:
+    digest = hashlib.sha256(spec_file.read_bytes())
+    digest.update(f"connexion={version('connexion')}".encode())
+    return digest.hexdigest()
+
+
+def cache_file(spec_file: Path = SPEC_FILE, cache_dir: str | Path | None = None) -> Path:
+    cache_dir = Path(cache_dir or config.SPEC_CACHE_DIR or DEFAULT_CACHE_DIR)
+    return cache_dir / f"{spec_file.stem}-{spec_digest(spec_file)[:16]}.json"
+
+
+def parse_specification(spec_file: Path = SPEC_FILE) -> dict:
+    """
+    Parse and validate the spec file. Raises connexion's InvalidSpecification when it does not follow the OpenAPI schema.
+    """
+    with spec_file.open("rb") as file:
+        specification = yaml.load(file, Loader=YAML_LOADER)
+    Specification.from_dict(specification)
+    return specification
+
+
+def write_cache(specification: dict, target: Path):
+    """
+    Write the cache file atomically, so that workers booting together never read a partial file.
+    """
+    target.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=target.parent, prefix=f".{target.name}.")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as file:
+            json.dump(specification, file, separators=(",", ":"))
+        os.replace(tmp_name, target)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(tmp_name)
+        raise
+
+
+def load_specification(spec_file: Path = SPEC_FILE, cache_dir: str | Path | None = None) -> dict:
+    """
+    Return the validated spec, from the cache when it holds the current spec, else parsed and written to the cache.
+    A cache that cannot be read or written is logged and bypassed.
+    """
+    target = cache_file(spec_file, cache_dir)
+    try:
+        with target.open(encoding="utf-8") as file:
+            return json.load(file)
+    except FileNotFoundError:
+        pass
+    except (OSError, ValueError) as err:
+        logger.warning(f"Ignoring the OpenAPI spec cache {target}: {err}")
+
+    specification = parse_specification(spec_file)
+    try:
+        write_cache(specification, target)
+    except OSError as err:
+        logger.warning(f"Could not write the OpenAPI spec cache {target}: {err}")
+    return specification
+
+
+@contextlib.contextmanager
+def validated_specification(spec_file: Path = SPEC_FILE, cache_dir: str | Path | None = None):
+    """
+    Yield the spec for add_api, and skip connexion's schema validation of it within the block: load_specification
+    only returns specs that passed it.
+    """
+    specification = load_specification(spec_file, cache_dir)
+    OpenAPISpecification._validate_spec = classmethod(lambda cls, spec: None)
+    try:
+        yield specification
+    finally:
+        # back to Specification._validate_spec
+        del OpenAPISpecification._validate_spec
+
+
+if __name__ == "__main__":
+    path = cache_file()
+    write_cache(parse_specification(), path)
+    print(f"Wrote {path}")
@@ -0,0 +1,435 @@
+"""
+Request-scoped tracing keyed by the x-correlator header.
+
+Every API request is a trace whose id is derived from its x-correlator (one is generated when the client sent none).
+SRM calls and MongoManager operations made while serving it are recorded as child spans; the correlator is echoed on
+the response and forwarded to the SRM, together with a W3C traceparent header.
+
+Finished spans are exported in batches by a background thread as OTLP/JSON, selected by TRACE_EXPORTER:
+"otlp" POSTs them to an OTLP/HTTP endpoint (e.g. an OpenTelemetry collector on :4318/v1/traces), "file" appends one
+export request per line to TRACE_FILE, "none" (the default) records no spans but still propagates the correlator.
+
+Example:
+    with start_span("zone_store.query", attributes={"zones": len(zones)}):
+        ...
+"""
+
+import contextlib
+import contextvars
+import functools
+import hashlib
+import json
+import os
+import queue
+import re
+import secrets
+import threading
+import time
+import uuid
+import requests
+from edge_cloud_management_api.configs.env_config import config
+from edge_cloud_management_api.managers.log_manager import logger
+from edge_cloud_management_api.managers.metrics_manager import Counter, operation_label, registry
+
+# OTLP SpanKind and StatusCode values
+INTERNAL = 1
+SERVER = 2
+CLIENT = 3
+STATUS_OK = 1
+STATUS_ERROR = 2
+
+CORRELATOR_HEADER = "x-correlator"
+# forwarded upstream and echoed as is, so anything that could break a header line is replaced by a generated id
+_VALID_CORRELATOR = re.compile(r"^[A-Za-z0-9._:\-]{1,128}$")
+
+spans_dropped = registry.register(Counter("oeg_trace_spans_dropped_total", "Finished spans dropped because the export queue was full"))
+
+
+class Span:
+    """
+    One timed operation of a trace. Times are Unix epoch nanoseconds, ids lowercase hex as in OTLP/JSON.
+    """
+
+    __slots__ = ("trace_id", "span_id", "parent_id", "correlator", "name", "kind", "attributes", "start_ns", "end_ns", "status", "status_message")
+
+    def __init__(self, trace_id: str, correlator: str, name: str, kind: int = INTERNAL, parent_id: str | None = None, attributes: dict | None = None):
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.correlator = correlator
+        self.name = name
+        self.kind = kind
+        self.attributes = dict(attributes or {})
+        self.start_ns = time.time_ns()
+        self.end_ns: int | None = None
+        self.status: int | None = None
+        self.status_message: str | None = None
+
+    def set_attribute(self, key: str, value):
+        self.attributes[key] = value
+
+    def set_error(self, err: BaseException):
+        self.status = STATUS_ERROR
+        self.status_message = f"{type(err).__name__}: {err}"
+
+    def end(self):
+        self.end_ns = time.time_ns()
+
+    @property
+    def duration_ms(self) -> float | None:
+        return None if self.end_ns is None else (self.end_ns - self.start_ns) / 1e6
+
+    def to_otlp(self) -> dict:
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns or self.start_ns),
+            "attributes": otlp_attributes({"x_correlator": self.correlator, **self.attributes}),
+        }
+        if self.parent_id:
+            span["parentSpanId"] = self.parent_id
+        if self.status is not None:
+            span["status"] = {"code": self.status, **({"message": self.status_message} if self.status_message else {})}
+        return span
+
+
+class _NoopSpan:
+    """
+    Returned by start_span when nothing is recorded, so callers never test for None.
+    """
+
+    def set_attribute(self, key, value):
+        pass
+
+    def set_error(self, err):
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+_current_span: contextvars.ContextVar[Span | None] = contextvars.ContextVar("current_span", default=None)
+
+
+def otlp_attributes(attributes: dict) -> list[dict]:
+    converted = []
+    for key, value in attributes.items():
+        if isinstance(value, bool):
+            converted.append({"key": key, "value": {"boolValue": value}})
+        elif isinstance(value, int):
+            converted.append({"key": key, "value": {"intValue": str(value)}})
+        elif isinstance(value, float):
+            converted.append({"key": key, "value": {"doubleValue": value}})
+        elif value is not None:
+            converted.append({"key": key, "value": {"stringValue": str(value)}})
+    return converted
+
+
+def correlator_or_new(value: str | None) -> str:
+    """
+    The client's x-correlator when it is a usable header value, else a new UUID.
+    """
+    if value and _VALID_CORRELATOR.match(value):
+        return value
+    return str(uuid.uuid4())
+
+
+def trace_id_for(correlator: str) -> str:
+    """
+    32-hex-digit trace id of a correlator: the UUID itself when it is one, else a hash of it.
+    """
+    try:
+        return uuid.UUID(correlator).hex
+    except ValueError:
+        return hashlib.blake2b(correlator.encode(), digest_size=16).hexdigest()
+
+
+def current_span() -> Span | None:
+    return _current_span.get()
+
+
+def current_correlator() -> str | None:
+    span = _current_span.get()
+    return span.correlator if span is not None else None
+
+
+def propagation_headers() -> dict[str, str]:
+    """
+    Headers forwarding the current trace upstream: x-correlator and a W3C traceparent, or none outside a request.
+    """
+    span = _current_span.get()
+    if span is None:
+        return {}
+    return {CORRELATOR_HEADER: span.correlator, "traceparent": f"00-{span.trace_id}-{span.span_id}-01"}
+
+
+@contextlib.contextmanager
+def request_trace(correlator: str, name: str, attributes: dict | None = None):
+    """
+    Run the block as the root (server) span of the trace of correlator.
+    """
+    span = Span(trace_id_for(correlator), correlator, name, kind=SERVER, attributes=attributes)
+    token = _current_span.set(span)
+    try:
+        yield span
+    except BaseException as err:
+        span.set_error(err)
+        raise
+    finally:
+        _current_span.reset(token)
+        span.end()
+        _export(span)
+
+
+@contextlib.contextmanager
+def start_span(name: str, kind: int = INTERNAL, attributes: dict | None = None):
+    """
+    Run the block as a child span of the current one. Outside a request, or with TRACE_EXPORTER=none, nothing is
+    recorded and a no-op span is yielded.
+    """
+    parent = _current_span.get()
+    if parent is None or get_span_processor() is None:
+        yield NOOP_SPAN
+        return
+    span = Span(parent.trace_id, parent.correlator, name, kind=kind, parent_id=parent.span_id, attributes=attributes)
+    token = _current_span.set(span)
+    try:
+        yield span
+    except BaseException as err:
+        span.set_error(err)
+        raise
+    finally:
+        _current_span.reset(token)
+        span.end()
+        _export(span)
+
+
+def traced_mongo_operation(method):
+    """
+    Decorator for MongoManager methods taking the collection name first: record them as client spans.
+    """
+    name = f"mongo.{method.__name__}"
+
+    @functools.wraps(method)
+    def wrapper(self, collection_name, *args, **kwargs):
+        with start_span(name, kind=CLIENT, attributes={"db.system": "mongodb", "db.collection.name": collection_name}):
+            return method(self, collection_name, *args, **kwargs)
+
+    return wrapper
+
+
+class SpanExporter:
+    """
+    Interface of the trace sinks: export a batch of finished spans.
+    """
+
+    def export(self, spans: list[Span]):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+def otlp_request(spans: list[Span], service_name: str) -> dict:
+    """
+    OTLP/JSON ExportTraceServiceRequest of a batch of spans.
+    """
+    return {
+        "resourceSpans": [
+            {
+                "resource": {"attributes": otlp_attributes({"service.name": service_name})},
+                "scopeSpans": [{"scope": {"name": "edge_cloud_management_api"}, "spans": [span.to_otlp() for span in spans]}],
+            }
+        ]
+    }
+
+
+class FileSpanExporter(SpanExporter):
+    """
+    Appends one OTLP/JSON export request per batch and line, the format the collector's otlpjsonfile receiver reads.
+    """
+
+    def __init__(self, path: str, service_name: str):
+        self.path = path
+        self.service_name = service_name
+
+    def export(self, spans):
+        with open(self.path, "a", encoding="utf-8") as file:
+            file.write(json.dumps(otlp_request(spans, self.service_name), separators=(",", ":")) + "\n")
+
+
+class OtlpHttpSpanExporter(SpanExporter):
+    """
+    POSTs the batches to an OTLP/HTTP traces endpoint with JSON encoding.
+    """
+
+    def __init__(self, endpoint: str, service_name: str, timeout: float = 10.0):
+        self.endpoint = endpoint
+        self.service_name = service_name
+        self.timeout = timeout
+        self.session = requests.Session()
+
+    def export(self, spans):
+        response = self.session.post(self.endpoint, json=otlp_request(spans, self.service_name), timeout=self.timeout)
+        response.raise_for_status()
+
+    def close(self):
+        self.session.close()
+
+
+class BatchSpanProcessor:
+    """
+    Queues finished spans and exports them from a background thread, every `interval` seconds or by batch_size.
+    When the queue is full, spans are dropped (and counted) rather than slowing requests down.
+    """
+
+    def __init__(self, exporter: SpanExporter, max_queue_size: int = 2048, batch_size: int = 512, interval: float = 5.0, start: bool = True):
+        self.exporter = exporter
+        self.batch_size = batch_size
+        self.interval = interval
+        self._queue: queue.Queue[Span] = queue.Queue(maxsize=max_queue_size)
+        self._stopped = threading.Event()
+        self._export_lock = threading.Lock()
+        self._thread = None
+        if start:
+            self._thread = threading.Thread(target=self._run, name="span-export", daemon=True)
+            self._thread.start()
+
+    def on_end(self, span: Span):
+        try:
+            self._queue.put_nowait(span)
+        except queue.Full:
+            spans_dropped.inc()
+
+    def _drain(self) -> list[Span]:
+        batch: list[Span] = []
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def flush(self):
+        """
+        Export everything queued so far, in the calling thread.
+        """
+        with self._export_lock:
+            while batch := self._drain():
+                try:
+                    self.exporter.export(batch)
+                except Exception as err:
+                    logger.warning(f"Exporting {len(batch)} spans failed: {err}")
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            self.flush()
+
+    def shutdown(self):
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval)
+        self.flush()
+        self.exporter.close()
+
+
+def build_span_processor() -> BatchSpanProcessor | None:
+    """
+    Build the span processor selected by TRACE_EXPORTER ("otlp", "file" or "none").
+    """
+    exporter_name = str(config.TRACE_EXPORTER).lower()
+    exporter: SpanExporter
+    if exporter_name == "otlp":
+        exporter = OtlpHttpSpanExporter(config.TRACE_OTLP_ENDPOINT, config.TRACE_SERVICE_NAME)
+    elif exporter_name == "file":
+        exporter = FileSpanExporter(config.TRACE_FILE, config.TRACE_SERVICE_NAME)
+    else:
+        return None
+    return BatchSpanProcessor(
+        exporter,
+        max_queue_size=int(config.TRACE_QUEUE_SIZE),
+        batch_size=int(config.TRACE_EXPORT_BATCH_SIZE),
+        interval=float(config.TRACE_EXPORT_INTERVAL),
+    )
+
+
+_processor = None
+_processor_pid = None
+_processor_built = False
+_processor_lock = threading.Lock()
+
+
+def get_span_processor() -> BatchSpanProcessor | None:
+    """
+    Return the process-wide span processor, built on first use (and again in a forked child, whose parent's export
+    thread does not exist). None when no exporter is configured.
+    """
+    global _processor, _processor_pid, _processor_built
+    if not _processor_built or _processor_pid != os.getpid():
+        with _processor_lock:
+            if not _processor_built or _processor_pid != os.getpid():
+                _processor = build_span_processor()
+                _processor_pid = os.getpid()
+                _processor_built = True
+    return _processor
+
+
+def set_span_processor(processor: BatchSpanProcessor | None):
+    """
+    Replace the process-wide span processor (tests, or an application embedding its own exporter).
+    """
+    global _processor, _processor_pid, _processor_built
+    with _processor_lock:
+        _processor = processor
+        _processor_pid = os.getpid()
+        _processor_built = True
+
+
+def _export(span: Span):
+    processor = get_span_processor()
+    if processor is not None:
+        processor.on_end(span)
+
+
+class TracingMiddleware:
+    """
+    ASGI middleware running every API request as a trace of its x-correlator, and echoing the correlator on the response.
+    The root span is named after the connexion operationId once the request has been routed.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        sent_correlator = None
+        for name, value in scope["headers"]:
+            if name == CORRELATOR_HEADER.encode():
+                sent_correlator = value.decode("latin-1")
+        correlator = correlator_or_new(sent_correlator)
+        attributes = {"http.request.method": scope["method"], "url.path": scope["path"]}
+
+        with request_trace(correlator, f"{scope['method']} {scope['path']}", attributes) as span:
+
+            async def send_with_correlator(message):
+                if message["type"] == "http.response.start":
+                    span.set_attribute("http.response.status_code", message["status"])
+                    if message["status"] >= 500:
+                        span.status = STATUS_ERROR
+                    headers = list(message.get("headers", []))
+                    if not any(name.lower() == CORRELATOR_HEADER.encode() for name, _ in headers):
+                        headers.append((CORRELATOR_HEADER.encode(), correlator.encode()))
+                    message = {**message, "headers": headers}
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_correlator)
+            finally:
+                operation_id = scope.get("extensions", {}).get("connexion_routing", {}).get("operation_id")
+                if operation_id:
+                    span.name = operation_label(operation_id)
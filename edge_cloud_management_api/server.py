@@ -0,0 +1,142 @@
+"""
+Production entry point: serves the API with uvicorn, in SERVER_WORKERS worker processes.
+
+uvicorn starts its workers as fresh (spawned) processes that build the app with create_app. Each worker opens its
+own SRM session, Mongo client and background threads in the app's lifespan startup, and releases them in the
+lifespan shutdown. Each worker also keeps its own metrics, labelled with worker="<pid>". On SIGTERM the workers stop accepting connections, give in-flight requests up to
+SERVER_GRACEFUL_TIMEOUT seconds to finish, then run the shutdown.
+
+Example:
+    SERVER_WORKERS=4 python -m edge_cloud_management_api
+    edge-cloud-management-api --workers 4 --max-requests 10000
+"""
+
+import argparse
+import contextlib
+import os
+import uvicorn
+from edge_cloud_management_api.configs.env_config import config
+from edge_cloud_management_api.managers.log_manager import logger
+
+APP_FACTORY = "edge_cloud_management_api.server:create_app"
+
+
+def start_worker():
+    """
+    Open the per-process resources up front, so the first requests of a worker do not pay for them.
+    """
+    from edge_cloud_management_api.controllers.edge_cloud_controller import zone_refresher
+    from edge_cloud_management_api.managers.db_manager import MongoClientRegistry
+    from edge_cloud_management_api.managers.metrics_manager import registry
+    from edge_cloud_management_api.managers.trace_manager import get_span_processor
+    from edge_cloud_management_api.services.deployment_jobs import deployment_queue
+    from edge_cloud_management_api.services.read_model import read_model_sync
+    from edge_cloud_management_api.services.srm_cache import get_srm_cache
+    from edge_cloud_management_api.services.srm_transport import get_srm_session
+
+    # a scrape reaches one worker: the label keeps the series of different workers apart
+    registry.set_constant_labels(worker=os.getpid())
+    get_srm_session()
+    get_srm_cache()
+    if config.MONGO_URI:
+        MongoClientRegistry.get_client(config.MONGO_URI)
+    get_span_processor()
+    # raises for a job store the workers cannot share, which fails the worker's startup
+    deployment_queue.store
+    deployment_queue.start()
+    zone_refresher.start()
+    if config.READ_MODEL_ENABLED:
+        read_model_sync.start()
+    logger.info(f"Worker {os.getpid()} started")
+
+
+async def stop_worker():
+    """
+    Stop the background threads, flush the pending spans and close the pooled connections of the worker.
+    """
+    from edge_cloud_management_api.controllers.edge_cloud_controller import zone_refresher
+    from edge_cloud_management_api.managers.db_manager import MongoClientRegistry
+    from edge_cloud_management_api.managers.trace_manager import get_span_processor
+    from edge_cloud_management_api.services.deployment_jobs import deployment_queue
+    from edge_cloud_management_api.services.read_model import read_model_sync
+    from edge_cloud_management_api.services.srm_transport import aclose_async_srm_client, close_srm_session
+
+    # a job interrupted here keeps its lease and is claimed again by another worker once the lease expires
+    deployment_queue.stop()
+    zone_refresher.stop()
+    read_model_sync.stop()
+    processor = get_span_processor()
+    if processor is not None:
+        processor.shutdown()
+    await aclose_async_srm_client()
+    close_srm_session()
+    MongoClientRegistry.close_all()
+    logger.info(f"Worker {os.getpid()} stopped")
+
+
+@contextlib.asynccontextmanager
+async def worker_lifespan(app):
+    start_worker()
+    try:
+        yield
+    finally:
+        await stop_worker()
+
+
+def create_app():
+    """
+    App factory run by uvicorn in every worker: the async or Flask app (ASYNC_HANDLERS), with the worker lifespan.
+    """
+    from edge_cloud_management_api.app import get_app_instance, get_async_app_instance
+
+    factory = get_async_app_instance if config.ASYNC_HANDLERS else get_app_instance
+    return factory(lifespan=worker_lifespan)
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="edge-cloud-management-api", description="Serve the Edge Cloud Management API.")
+    parser.add_argument("--host", default=config.SERVER_HOST)
+    parser.add_argument("--port", type=int, default=int(config.SERVER_PORT))
+    parser.add_argument("--workers", type=int, default=int(config.SERVER_WORKERS), help="worker processes")
+    parser.add_argument("--keep-alive", type=int, default=int(config.SERVER_KEEP_ALIVE), help="seconds an idle keep-alive connection is kept open")
+    parser.add_argument("--backlog", type=int, default=int(config.SERVER_BACKLOG), help="pending connections queued by the listening socket")
+    parser.add_argument(
+        "--max-requests", type=int, default=int(config.SERVER_MAX_REQUESTS), help="requests after which a worker is replaced by a new one (0 = never)"
+    )
+    parser.add_argument(
+        "--graceful-timeout", type=float, default=float(config.SERVER_GRACEFUL_TIMEOUT), help="seconds in-flight requests get to finish on SIGTERM"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """
+    Run the API under uvicorn until SIGTERM or SIGINT.
+    """
+    from edge_cloud_management_api.managers.mongo_indexes import bootstrap_indexes
+    from edge_cloud_management_api.services.deployment_jobs import check_job_store
+
+    args = parse_args(argv)
+    workers = max(1, args.workers)
+    check_job_store(workers)
+    # once for all the workers, before they start
+    bootstrap_indexes()
+    # the spawned workers read the configuration again: give them the worker count actually started
+    os.environ["SERVER_WORKERS"] = str(workers)
+    max_requests = args.max_requests or None
+    if max_requests and workers == 1:
+        # a single process is not supervised: the server would exit instead of being replaced
+        logger.warning("--max-requests needs more than one worker, ignoring it")
+        max_requests = None
+    uvicorn.run(
+        APP_FACTORY,
+        factory=True,
+        host=args.host,
+        port=args.port,
+        workers=workers,
+        timeout_keep_alive=args.keep_alive,
+        backlog=args.backlog,
+        limit_max_requests=max_requests,
+        timeout_graceful_shutdown=args.graceful_timeout,
+        lifespan="on",
+    )
@@ -0,0 +1,77 @@
+import threading
+
+
+def instance_region(instance: dict):
+    zone = instance.get("edgeCloudZone")
+    return zone.get("edgeCloudRegion") if isinstance(zone, dict) else None
+
+
+def instance_matches(instance: dict, app_id: str | None = None, region: str | None = None) -> bool:
+    return (app_id is None or instance.get("appId") == app_id) and (region is None or instance_region(instance) == region)
+
+
+class AppInstanceIndex:
+    """
+    App instances of an SRM listing indexed by appInstanceId, appId and region (edgeCloudZone.edgeCloudRegion).
+    Queries are dictionary lookups and return shared lists, which callers must not modify.
+
+    Example:
+        index = AppInstanceIndex(instances)
+        index.query(app_id="0f1e...", region="Region1")
+    """
+
+    def __init__(self, instances: list[dict]):
+        self.instances = instances
+        self._by_id: dict[str, dict] = {}
+        self._by_app: dict[str | None, list[dict]] = {}
+        self._by_region: dict[str, list[dict]] = {}
+
+        for instance in instances:
+            if instance.get("appInstanceId") is not None:
+                self._by_id[instance["appInstanceId"]] = instance
+            self._by_app.setdefault(instance.get("appId"), []).append(instance)
+            self._by_region.setdefault(instance_region(instance), []).append(instance)
+
+    def __len__(self):
+        return len(self.instances)
+
+    def get(self, app_instance_id: str) -> dict | None:
+        return self._by_id.get(app_instance_id)
+
+    def query(self, app_id: str | None = None, app_instance_ids: list[str] | None = None, region: str | None = None) -> list[dict]:
+        """
+        Instances matching every given criterion; a None criterion matches every instance.
+        """
+        if app_instance_ids is not None:
+            candidates = [instance for instance in map(self._by_id.get, dict.fromkeys(app_instance_ids)) if instance is not None]
+        elif app_id is not None:
+            candidates, app_id = self._by_app.get(app_id, []), None
+        elif region is not None:
+            candidates, region = self._by_region.get(region, []), None
+        else:
+            return self.instances
+        if app_id is None and region is None:
+            return candidates
+        return [instance for instance in candidates if instance_matches(instance, app_id, region)]
+
+
+_last_index: tuple[list, AppInstanceIndex] | None = None
+_last_index_lock = threading.Lock()
+
+
+def app_instance_index_for(instances: list[dict]) -> AppInstanceIndex:
+    """
+    Return the AppInstanceIndex of an instance listing, reusing the previous one while the same list (e.g. the cached
+    SRM listing) is passed in.
+    """
+    global _last_index
+    last = _last_index
+    if last is not None and last[0] is instances:
+        return last[1]
+    with _last_index_lock:
+        last = _last_index
+        if last is not None and last[0] is instances:
+            return last[1]
+        index = AppInstanceIndex(instances)
+        _last_index = (instances, index)
+        return index
@@ -0,0 +1,121 @@
+import asyncio
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from edge_cloud_management_api.configs.env_config import config
+from edge_cloud_management_api.services.fan_out import bounded_map
+
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+
+class InvalidBatch(Exception):
+    """
+    The batch request cannot be split into zone deployments.
+    """
+
+
+def zone_deployments(body: dict, max_zones: int | None = None) -> list[dict]:
+    """
+    Split a batch request ({name, appId, appZones: [{EdgeCloudZone, kubernetesClusterRef}]}) into one
+    POST /deployedServiceFunction payload per zone, in the shape create_app_instance accepts, with the same
+    required fields.
+    """
+    max_zones = max_zones or config.BATCH_DEPLOY_MAX_ZONES
+    app_zones = body.get("appZones") or []
+    if not body.get("appId") or not app_zones:
+        raise InvalidBatch("Missing required fields: appId or appZones")
+    if len(app_zones) > max_zones:
+        raise InvalidBatch(f"At most {max_zones} appZones can be deployed in one request")
+
+    payloads, seen = [], set()
+    for app_zone in app_zones:
+        zone_id = (app_zone.get("EdgeCloudZone") or {}).get("edgeCloudZoneId")
+        if not zone_id:
+            raise InvalidBatch("Every appZones item needs EdgeCloudZone.edgeCloudZoneId")
+        k8s_ref = app_zone.get("kubernetesClusterRef")
+        if not k8s_ref:
+            raise InvalidBatch(f"Missing required field kubernetesClusterRef for edge cloud zone {zone_id}")
+        if (zone_id, k8s_ref) in seen:
+            raise InvalidBatch(f"Edge cloud zone {zone_id} is listed twice")
+        seen.add((zone_id, k8s_ref))
+        payloads.append({"name": body.get("name"), "appId": body["appId"], "edgeCloudZoneId": zone_id, "kubernetesClusterRef": k8s_ref})
+    return payloads
+
+
+def zone_idempotency_key(batch_key: str, payload: dict) -> str:
+    """
+    Idempotency key of one zone deployment of a batch: the same batch key and zone always give the same key.
+    """
+    return str(uuid.uuid5(uuid.NAMESPACE_URL, f"{batch_key}/{payload['edgeCloudZoneId']}/{payload['kubernetesClusterRef']}"))
+
+
+def with_zone_idempotency_keys(deploy, batch_key: str | None = None):
+    """
+    Wrap deploy(payload, idempotency_key=...) (sync or async) into the deploy(payload) that deploy_zones and
+    async_deploy_zones call, sending every zone with its zone_idempotency_key. A batch repeated with the same
+    Idempotency-Key is then recognized by the SRM zone by zone instead of being deployed twice. Without a batch key,
+    the keys are derived from a random one.
+    """
+    batch_key = batch_key or str(uuid.uuid4())
+    return lambda payload: deploy(payload, idempotency_key=zone_idempotency_key(batch_key, payload))
+
+
+def zone_result(payload: dict, response, elapsed: float) -> dict:
+    """
+    Per-zone outcome of a deployment; response is the SRM response or deploy_service_function's error dictionary.
+    """
+    result = {"edgeCloudZoneId": payload["edgeCloudZoneId"], "kubernetesClusterRef": payload["kubernetesClusterRef"], "elapsedMs": round(elapsed * 1000, 1)}
+    if isinstance(response, dict) and "error" in response:
+        result.update(status=FAILED, error=response["error"])
+        if response.get("status_code") is not None:
+            result["statusCode"] = response["status_code"]
+    else:
+        result.update(status=SUCCEEDED, result=response)
+    return result
+
+
+def batch_summary(results: list[dict]) -> dict:
+    succeeded = sum(result["status"] == SUCCEEDED for result in results)
+    return {"succeeded": succeeded, "failed": len(results) - succeeded, "results": results}
+
+
+def _timed_deploy(deploy, payload):
+    started = time.monotonic()
+    try:
+        response = deploy(payload)
+    except Exception as err:
+        response = {"error": f"An unexpected error occurred: {err}"}
+    return zone_result(payload, response, time.monotonic() - started)
+
+
+def deploy_zones(deploy, payloads: list[dict], max_concurrency: int | None = None, executor: ThreadPoolExecutor | None = None) -> list[dict]:
+    """
+    Call deploy(payload) for every zone on the batch-deploy pool (bounded_map), with at most max_concurrency calls in
+    flight. Returns one result per payload, in order; a failing zone does not stop the others.
+    Each call runs in a copy of the caller's context, so the SRM calls carry the request's x-correlator and trace.
+
+    Example:
+        api_client = PiEdgeAPIClientFactory().create_pi_edge_api_client()
+        results = deploy_zones(with_zone_idempotency_keys(api_client.deploy_service_function, batch_key), zone_deployments(body))
+    """
+    max_concurrency = max_concurrency or config.BATCH_DEPLOY_MAX_CONCURRENCY
+    return bounded_map(lambda payload: _timed_deploy(deploy, payload), payloads, max_concurrency, executor, pool="batch-deploy")
+
+
+async def async_deploy_zones(deploy, payloads: list[dict], max_concurrency: int | None = None) -> list[dict]:
+    """
+    asyncio counterpart of deploy_zones: deploy is a coroutine function, capped by a semaphore.
+    """
+    semaphore = asyncio.Semaphore(max(1, max_concurrency or config.BATCH_DEPLOY_MAX_CONCURRENCY))
+
+    async def deploy_zone(payload):
+        async with semaphore:
+            started = time.monotonic()
+            try:
+                response = await deploy(payload)
+            except Exception as err:
+                response = {"error": f"An unexpected error occurred: {err}"}
+            return zone_result(payload, response, time.monotonic() - started)
+
+    return list(await asyncio.gather(*(deploy_zone(payload) for payload in payloads)))
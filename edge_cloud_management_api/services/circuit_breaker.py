@@ -0,0 +1,251 @@
+import threading
+import time
+from collections import deque
+from edge_cloud_management_api.configs.env_config import config
+from edge_cloud_management_api.managers.log_manager import logger
+from edge_cloud_management_api.managers.metrics_manager import MetricFamily, registry
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """
+    Raised instead of calling an endpoint whose circuit is open.
+    """
+
+
+class CircuitBreaker:
+    """
+    Closed/open/half-open circuit breaker of one SRM endpoint.
+
+    The circuit opens after failure_threshold consecutive failures (timeouts, connection errors, 5xx answers) and then
+    rejects calls for reset_timeout seconds. The first call after that is let through as a probe (half-open): its
+    success closes the circuit, its failure opens it again. Other calls are rejected while the probe is in flight.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0, enabled: bool = True, clock=time.monotonic):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.enabled = enabled
+        self._clock = clock
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._consecutive_failures = 0
+        self._counters = {"successes": 0, "failures": 0, "rejected": 0, "opened": 0, "fallbacks": 0}
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == OPEN and self._clock() - self._opened_at >= self.reset_timeout:
+                return HALF_OPEN
+            return self._state
+
+    def rejecting(self) -> bool:
+        """
+        Whether a call made now would be rejected, without taking the half-open probe.
+        """
+        with self._lock:
+            if self._state == OPEN:
+                return self._clock() - self._opened_at < self.reset_timeout
+            return self._state == HALF_OPEN and self._probe_in_flight
+
+    def allow(self) -> bool:
+        """
+        Whether a call may go through now; the caller must then report its outcome with record_success/record_failure.
+        """
+        if not self.enabled:
+            return True
+        with self._lock:
+            if self._state == OPEN and self._clock() - self._opened_at >= self.reset_timeout:
+                self._state = HALF_OPEN
+                self._probe_in_flight = False
+            if self._state == CLOSED:
+                return True
+            if self._state == HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            self._counters["rejected"] += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self._counters["successes"] += 1
+            self._consecutive_failures = 0
+            if self._state != CLOSED:
+                logger.info(f"Circuit {self.name} closed")
+                self._state = CLOSED
+                self._probe_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._counters["failures"] += 1
+            self._consecutive_failures += 1
+            if not self.enabled:
+                return
+            if self._state == HALF_OPEN or (self._state == CLOSED and self._consecutive_failures >= self.failure_threshold):
+                logger.warning(f"Circuit {self.name} opened after {self._consecutive_failures} consecutive failures")
+                self._state = OPEN
+                self._opened_at = self._clock()
+                self._probe_in_flight = False
+                self._counters["opened"] += 1
+
+    def record_fallback(self):
+        """
+        Count a call answered from the last cached value because the circuit was open.
+        """
+        with self._lock:
+            self._counters["fallbacks"] += 1
+
+    def snapshot(self) -> dict:
+        state = self.state
+        with self._lock:
+            return {"state": state, "consecutiveFailures": self._consecutive_failures, **self._counters}
+
+
+class AdaptiveTimeout:
+    """
+    Read timeout that follows the recent latencies of an endpoint: factor x p99 of the last `window` successful calls,
+    clamped to [minimum, maximum]. Until min_samples calls were observed, the timeout is `maximum`.
+
+    A healthy endpoint answering in 50ms thus gets a timeout of a few hundred milliseconds instead of SRM_READ_TIMEOUT,
+    so a hung SRM releases the worker quickly; an endpoint that is slow but steady keeps a timeout above its latency.
+    """
+
+    def __init__(self, maximum: float, minimum: float = 1.0, factor: float = 3.0, window: int = 100, min_samples: int = 20, enabled: bool = True):
+        self.maximum = maximum
+        self.minimum = min(minimum, maximum)
+        self.factor = factor
+        self.min_samples = min_samples
+        self.enabled = enabled
+        self._latencies: deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, elapsed: float):
+        with self._lock:
+            self._latencies.append(elapsed)
+
+    def percentile(self, quantile: float) -> float | None:
+        with self._lock:
+            if not self._latencies:
+                return None
+            ordered = sorted(self._latencies)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * quantile))]
+
+    def current(self) -> float:
+        with self._lock:
+            samples = len(self._latencies)
+        p99 = self.percentile(0.99) if self.enabled and samples >= self.min_samples else None
+        if p99 is None:
+            return self.maximum
+        return max(self.minimum, min(self.maximum, p99 * self.factor))
+
+
+class EndpointGuard:
+    """
+    Circuit breaker and adaptive read timeout of one SRM endpoint.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.breaker = CircuitBreaker(
+            name,
+            failure_threshold=int(config.SRM_BREAKER_FAILURE_THRESHOLD),
+            reset_timeout=float(config.SRM_BREAKER_RESET_TIMEOUT),
+            enabled=bool(config.SRM_BREAKER_ENABLED),
+        )
+        self.read_timeout = AdaptiveTimeout(
+            maximum=float(config.SRM_READ_TIMEOUT),
+            minimum=float(config.SRM_ADAPTIVE_TIMEOUT_MIN),
+            factor=float(config.SRM_ADAPTIVE_TIMEOUT_FACTOR),
+            window=int(config.SRM_ADAPTIVE_TIMEOUT_WINDOW),
+            enabled=bool(config.SRM_ADAPTIVE_TIMEOUT),
+        )
+
+    def timeout(self, default: tuple[float, float] | None = None) -> tuple[float, float]:
+        """
+        (connect, read) timeout for the next call: the default (SRM_CONNECT_TIMEOUT, SRM_READ_TIMEOUT), with the read
+        timeout lowered to the adaptive one.
+        """
+        connect, read = default or (config.SRM_CONNECT_TIMEOUT, config.SRM_READ_TIMEOUT)
+        return (connect, min(read, self.read_timeout.current()))
+
+    def record(self, elapsed: float, failed: bool):
+        if failed:
+            self.breaker.record_failure()
+        else:
+            self.read_timeout.record(elapsed)
+            self.breaker.record_success()
+
+    def snapshot(self) -> dict:
+        return {**self.breaker.snapshot(), "timeoutSeconds": round(self.read_timeout.current(), 3), "p99Seconds": self.read_timeout.percentile(0.99)}
+
+
+class SrmCircuits:
+    """
+    EndpointGuard per SRM, HTTP method and endpoint (e.g. "GET http://srm/node"), created on first use.
+    """
+
+    def __init__(self):
+        self._guards: dict[tuple, EndpointGuard] = {}
+        self._lock = threading.Lock()
+
+    def guard(self, base_url: str, method: str, endpoint: str) -> EndpointGuard:
+        key = (base_url, method, endpoint)
+        guard = self._guards.get(key)
+        if guard is None:
+            with self._lock:
+                guard = self._guards.get(key)
+                if guard is None:
+                    guard = self._guards[key] = EndpointGuard(f"{method} {base_url}{endpoint}")
+        return guard
+
+    def rejecting(self, base_url: str, method: str, endpoint: str) -> bool:
+        guard = self._guards.get((base_url, method, endpoint))
+        return guard is not None and guard.breaker.rejecting()
+
+    def snapshot(self) -> list[dict]:
+        """
+        State, counters and current read timeout of every endpoint called so far.
+        """
+        with self._lock:
+            guards = list(self._guards.items())
+        return [{"srm": base_url, "method": method, "endpoint": endpoint, **guard.snapshot()} for (base_url, method, endpoint), guard in guards]
+
+    def reset(self):
+        with self._lock:
+            self._guards.clear()
+
+
+srm_circuits = SrmCircuits()
+
+STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+@registry.add_collector
+def srm_circuit_metrics() -> list[MetricFamily]:
+    """
+    Circuit state, counters and adaptive read timeout of every SRM endpoint, read on each scrape.
+    """
+    labels = ("srm", "method", "endpoint")
+    state = MetricFamily("oeg_srm_circuit_state", "gauge", "Circuit state per SRM endpoint (0 closed, 1 half-open, 2 open)", labels)
+    timeout = MetricFamily("oeg_srm_read_timeout_seconds", "gauge", "Current adaptive read timeout per SRM endpoint", labels)
+    counters = {
+        name: MetricFamily(f"oeg_srm_circuit_{name}_total", "counter", documentation, labels)
+        for name, documentation in (
+            ("rejected", "Calls rejected by an open circuit"),
+            ("opened", "Times the circuit opened"),
+            ("fallbacks", "Calls answered from the last cached value while the circuit was open"),
+        )
+    }
+    for endpoint in srm_circuits.snapshot():
+        label_values = (endpoint["srm"], endpoint["method"], endpoint["endpoint"])
+        state.add(STATE_VALUES[endpoint["state"]], *label_values)
+        timeout.add(endpoint["timeoutSeconds"], *label_values)
+        for name, family in counters.items():
+            family.add(endpoint[name], *label_values)
+    return [state, timeout, *counters.values()]
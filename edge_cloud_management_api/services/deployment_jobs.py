@@ -0,0 +1,74 @@
+from edge_cloud_management_api.configs.env_config import config
+from edge_cloud_management_api.managers.log_manager import logger
+from edge_cloud_management_api.services.job_queue import InMemoryJobStore, JobQueue, MongoJobStore, PermanentJobError, current_job_id
+from edge_cloud_management_api.services.pi_edge_services import PiEdgeAPIClientFactory
+from edge_cloud_management_api.services.read_model import read_model_sync
+
+DEPLOYMENT_JOBS_COLLECTION = "deployment_jobs"
+DEPLOYMENT_JOBS_PATH = "/deployment-jobs"
+IDEMPOTENCY_KEY_HEADER = "Idempotency-Key"
+# client errors the SRM may stop returning on a later attempt
+RETRYABLE_CLIENT_ERRORS = {408, 409, 425, 429}
+
+
+def deploy_app_instance(payload: dict):
+    """
+    Job handler: submit one app instance deployment to the SRM. Returns the SRM response.
+    The job id is sent as the idempotency key, so that a retry after a timed out POST, whose deployment may have
+    been created, is recognized by the SRM as the same deployment.
+    """
+    api_client = PiEdgeAPIClientFactory().create_pi_edge_api_client()
+    response = api_client.deploy_service_function(data=payload, idempotency_key=current_job_id())
+    if isinstance(response, dict) and "error" in response:
+        status_code = response.get("status_code")
+        if status_code is not None and 400 <= status_code < 500 and status_code not in RETRYABLE_CLIENT_ERRORS:
+            raise PermanentJobError(response["error"])
+        raise RuntimeError(response["error"])
+    logger.info(f"Deployment of appId={payload.get('appId')} accepted by the SRM: {response}")
+    if config.READ_MODEL_ENABLED:
+        read_model_sync.trigger()
+    return response
+
+
+def check_job_store(workers: int):
+    """
+    Raise a RuntimeError when the JOB_QUEUE_BACKEND store cannot be shared by the API's worker processes: mongo
+    without MONGO_URI, or memory with more than one worker, where a job queued by one worker is unknown to the others
+    and lost with it.
+    """
+    backend = (config.JOB_QUEUE_BACKEND or "mongo").lower()
+    if backend == "mongo":
+        if not config.MONGO_URI:
+            raise RuntimeError("JOB_QUEUE_BACKEND=mongo requires MONGO_URI to be set")
+    elif backend == "memory":
+        if workers > 1:
+            raise RuntimeError(f"JOB_QUEUE_BACKEND=memory keeps jobs in one process and cannot serve {workers} workers, use mongo")
+    else:
+        raise ValueError(f"Unknown JOB_QUEUE_BACKEND: {backend}")
+
+
+def build_job_store():
+    """
+    Build the job store selected by JOB_QUEUE_BACKEND ("mongo" or "memory"), checked with check_job_store.
+    """
+    check_job_store(int(config.SERVER_WORKERS))
+    if (config.JOB_QUEUE_BACKEND or "mongo").lower() == "mongo":
+        return MongoJobStore(DEPLOYMENT_JOBS_COLLECTION)
+    return InMemoryJobStore()
+
+
+def job_location(job: dict) -> str:
+    return f"{DEPLOYMENT_JOBS_PATH}/{job['_id']}"
+
+
+deployment_queue = JobQueue(
+    "deployment",
+    build_job_store,
+    handler=deploy_app_instance,
+    workers=config.JOB_QUEUE_WORKERS,
+    max_attempts=config.JOB_MAX_ATTEMPTS,
+    retry_backoff=config.JOB_RETRY_BACKOFF,
+    retry_backoff_max=config.JOB_RETRY_BACKOFF_MAX,
+    lease=config.JOB_LEASE_SECONDS,
+    poll_interval=config.JOB_POLL_INTERVAL,
+)
@@ -0,0 +1,243 @@
+import asyncio
+import contextvars
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, TimeoutError as FutureTimeoutError, wait
+from edge_cloud_management_api.configs.env_config import config
+from edge_cloud_management_api.managers.log_manager import logger
+from edge_cloud_management_api.managers.metrics_manager import MetricFamily, registry
+from edge_cloud_management_api.services.retry_policy import deadline_scope
+
+
+class PartialResult(list):
+    """
+    Items gathered from several sources, concatenated in source order.
+    `missing` maps every source that failed or missed its deadline to the reason.
+    """
+
+    def __init__(self, items=(), missing: dict[str, str] | None = None):
+        super().__init__(items)
+        self.missing = missing or {}
+
+    @property
+    def complete(self) -> bool:
+        return not self.missing
+
+
+class FanOutStats:
+    """
+    Latency and outcome counters per source. Latencies are measured on completion, even when the caller
+    already gave up on the source.
+    """
+
+    def __init__(self):
+        self._sources: dict[str, dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def _source(self, source):
+        return self._sources.setdefault(
+            source, {"calls": 0, "errors": 0, "timeouts": 0, "last_ms": 0.0, "max_ms": 0.0, "total_ms": 0.0}
+        )
+
+    def record(self, source: str, elapsed: float, failed: bool = False):
+        elapsed_ms = elapsed * 1000
+        with self._lock:
+            counters = self._source(source)
+            counters["calls"] += 1
+            counters["errors"] += int(failed)
+            counters["last_ms"] = elapsed_ms
+            counters["max_ms"] = max(counters["max_ms"], elapsed_ms)
+            counters["total_ms"] += elapsed_ms
+
+    def record_timeout(self, source: str):
+        with self._lock:
+            self._source(source)["timeouts"] += 1
+
+    def snapshot(self) -> dict[str, dict[str, float]]:
+        with self._lock:
+            return {source: dict(counters) for source, counters in self._sources.items()}
+
+    def reset(self):
+        with self._lock:
+            self._sources.clear()
+
+
+fan_out_stats = FanOutStats()
+
+
+@registry.add_collector
+def fan_out_metrics() -> list[MetricFamily]:
+    families = {
+        name: MetricFamily(f"oeg_fan_out_{name}_total", "counter", documentation, ("source",))
+        for name, documentation in (
+            ("calls", "Fan-out calls per source"),
+            ("errors", "Fan-out calls that raised, per source"),
+            ("timeouts", "Fan-out sources given up on at their deadline"),
+        )
+    }
+    for source, counters in sorted(fan_out_stats.snapshot().items()):
+        for name, family in families.items():
+            family.add(counters[name], source)
+    return list(families.values())
+
+# fan-out pools of this process by name, so that a caller whose calls hang only exhausts its own pool
+_executors: dict[str, ThreadPoolExecutor] = {}
+_executors_pid = None
+_executors_lock = threading.Lock()
+
+
+def get_fan_out_executor(pool: str = "fan-out") -> ThreadPoolExecutor:
+    """
+    Return the worker pool named pool, of FAN_OUT_MAX_WORKERS threads (the pools are rebuilt in a forked child).
+    Each caller uses its own pool: zone discovery ("zones"), batch deployments ("batch-deploy") and SRM lookups
+    by id ("srm-lookups"), so that sources still running after their deadline cannot starve the other callers.
+    """
+    global _executors_pid
+    with _executors_lock:
+        if _executors_pid != os.getpid():
+            _executors.clear()
+            _executors_pid = os.getpid()
+        if pool not in _executors:
+            _executors[pool] = ThreadPoolExecutor(max_workers=config.FAN_OUT_MAX_WORKERS, thread_name_prefix=pool)
+        return _executors[pool]
+
+
+def bounded_map(fn, items, max_concurrency: int, executor: ThreadPoolExecutor | None = None, pool: str = "fan-out") -> list:
+    """
+    Call fn(item) for every item on the fan-out pool named pool, with at most max_concurrency calls in flight, each in
+    a copy of the caller's context. Returns the results in order; an exception raised by fn is raised here.
+
+    The cap is enforced by submitting a new call only when one completes, so no pool thread waits on a lock.
+
+    Example:
+        instances = bounded_map(api_client.get_app_instance, app_instance_ids, max_concurrency=8, pool="srm-lookups")
+    """
+    executor = executor or get_fan_out_executor(pool)
+    items = list(items)
+    results: list = [None] * len(items)
+    pending = iter(enumerate(items))
+    in_flight = {}
+
+    def submit_next():
+        for position, item in pending:
+            in_flight[executor.submit(contextvars.copy_context().run, fn, item)] = position
+            return
+
+    for _ in range(max(1, max_concurrency)):
+        submit_next()
+    while in_flight:
+        done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+        for future in done:
+            results[in_flight.pop(future)] = future.result()
+            submit_next()
+    return results
+
+
+def _timed(source, fn, stats, deadline):
+    started = time.monotonic()
+    try:
+        with deadline_scope(deadline):
+            result = fn()
+    except Exception:
+        stats.record(source, time.monotonic() - started, failed=True)
+        raise
+    stats.record(source, time.monotonic() - started)
+    return result
+
+
+def _deadline_for(source, deadlines, default):
+    if isinstance(deadlines, dict):
+        return deadlines.get(source, default)
+    return deadlines
+
+
+def fan_out(
+    sources: dict,
+    deadlines: dict[str, float] | float,
+    default_deadline: float = 5.0,
+    executor: ThreadPoolExecutor | None = None,
+    stats: FanOutStats = fan_out_stats,
+    pool: str = "fan-out",
+) -> PartialResult:
+    """
+    Call every source in parallel, on the fan-out pool named pool, and merge the lists they return.
+
+    Each source gets its own deadline, counted from the start of the fan-out. Sources that raise or miss their
+    deadline are left out and reported in `missing`; a late source keeps running in the background and its latency
+    is still recorded. The deadline is propagated to the SRM calls of the source (retry_policy.deadline_scope), so a
+    late source stops retrying once nobody waits for it.
+
+    Args:
+        sources (dict): source name -> callable returning a list.
+        deadlines (dict | float): deadline in seconds per source name, or one deadline for all.
+        default_deadline (float): deadline of sources absent from the deadlines dict.
+        pool (str): name of the fan-out pool, see get_fan_out_executor.
+
+    Example:
+        zones = fan_out({"local": fetch_local_zones, "op-b": fetch_op_b_zones}, {"op-b": 1.5}, pool="zones")
+    """
+    executor = executor or get_fan_out_executor(pool)
+    started = time.monotonic()
+    futures = {
+        # each source runs in a copy of the caller's context, so enclosing deadlines apply too
+        source: executor.submit(contextvars.copy_context().run, _timed, source, fn, stats, _deadline_for(source, deadlines, default_deadline))
+        for source, fn in sources.items()
+    }
+
+    results, missing = {}, {}
+    for source, future in sorted(futures.items(), key=lambda item: _deadline_for(item[0], deadlines, default_deadline)):
+        remaining = started + _deadline_for(source, deadlines, default_deadline) - time.monotonic()
+        try:
+            results[source] = future.result(timeout=max(0.0, remaining))
+        except FutureTimeoutError:
+            future.cancel()
+            stats.record_timeout(source)
+            missing[source] = "deadline exceeded"
+        except Exception as err:
+            missing[source] = str(err) or type(err).__name__
+
+    if missing:
+        logger.warning(f"Fan-out returned a partial result, missing: {missing}")
+    return PartialResult((item for source in sources if source in results for item in results[source]), missing)
+
+
+async def async_fan_out(
+    sources: dict,
+    deadlines: dict[str, float] | float,
+    default_deadline: float = 5.0,
+    stats: FanOutStats = fan_out_stats,
+) -> PartialResult:
+    """
+    asyncio counterpart of fan_out: sources are coroutine functions, cancelled when they miss their deadline.
+    """
+
+    async def call(source, coro_fn):
+        started = time.monotonic()
+        deadline = _deadline_for(source, deadlines, default_deadline)
+        try:
+            with deadline_scope(deadline):
+                result = await asyncio.wait_for(coro_fn(), deadline)
+        except asyncio.TimeoutError:
+            stats.record_timeout(source)
+            raise
+        except Exception:
+            stats.record(source, time.monotonic() - started, failed=True)
+            raise
+        stats.record(source, time.monotonic() - started)
+        return result
+
+    outcomes = await asyncio.gather(*(call(source, coro_fn) for source, coro_fn in sources.items()), return_exceptions=True)
+
+    items, missing = [], {}
+    for source, outcome in zip(sources, outcomes):
+        if isinstance(outcome, asyncio.TimeoutError):
+            missing[source] = "deadline exceeded"
+        elif isinstance(outcome, BaseException):
+            missing[source] = str(outcome) or type(outcome).__name__
+        else:
+            items.extend(outcome)
+
+    if missing:
+        logger.warning(f"Fan-out returned a partial result, missing: {missing}")
+    return PartialResult(items, missing)
@@ -0,0 +1,67 @@
+import json
+from pydantic import BaseModel, Field
+from edge_cloud_management_api.configs.env_config import config
+from edge_cloud_management_api.managers.json_provider import response_json
+from edge_cloud_management_api.managers.log_manager import logger
+from edge_cloud_management_api.managers.trace_manager import CLIENT, propagation_headers, start_span
+from edge_cloud_management_api.services.srm_transport import get_async_srm_client, get_srm_session
+
+
+class FederationPartner(BaseModel):
+    name: str = Field(..., description="Name of the partner Operator Platform, used as the edgeCloudProvider of its zones")
+    url: str = Field(..., description="Federation context resource of the partner: GET returns its offeredAvailabilityZones")
+    deadline: float | None = Field(default=None, description="Seconds to wait for the partner during zone discovery")
+
+
+def load_federation_partners(raw: str | None = None) -> list[FederationPartner]:
+    """
+    Parse FEDERATION_PARTNERS, a JSON list such as
+    [{"name": "op-b", "url": "https://op-b/operatorplatform/federation/v1/ctx-1/partner", "deadline": 1.5}].
+    """
+    raw = config.FEDERATION_PARTNERS if raw is None else raw
+    if not raw:
+        return []
+    try:
+        return [FederationPartner(**partner) for partner in json.loads(raw)]
+    except Exception as err:
+        logger.error(f"Ignoring invalid FEDERATION_PARTNERS: {err}")
+        return []
+
+
+def partner_zones(partner: FederationPartner, federation_context: dict) -> list[dict]:
+    """
+    Convert the offeredAvailabilityZones (ZoneDetails) of a partner federation context into EdgeCloudZone dicts.
+    """
+    return [
+        {
+            "edgeCloudZoneId": zone["zoneId"],
+            "edgeCloudZoneName": zone["zoneId"],
+            "edgeCloudZoneStatus": zone.get("status", "unknown"),
+            "edgeCloudProvider": partner.name,
+            "edgeCloudRegion": zone.get("geographyDetails"),
+        }
+        for zone in federation_context.get("offeredAvailabilityZones") or []
+    ]
+
+
+def fetch_partner_zones(partner: FederationPartner) -> list[dict]:
+    """
+    Fetch the zones offered by a federation partner. Raises on connection or HTTP errors.
+    """
+    timeout = partner.deadline or config.FEDERATION_PARTNER_DEADLINE
+    with start_span(f"federation {partner.name}", kind=CLIENT, attributes={"url.full": partner.url}) as span:
+        response = get_srm_session().get(partner.url, headers=propagation_headers(), timeout=(config.SRM_CONNECT_TIMEOUT, timeout))
+        span.set_attribute("http.response.status_code", response.status_code)
+        response.raise_for_status()
+    return partner_zones(partner, response_json(response))
+
+
+async def async_fetch_partner_zones(partner: FederationPartner) -> list[dict]:
+    """
+    asyncio counterpart of fetch_partner_zones.
+    """
+    with start_span(f"federation {partner.name}", kind=CLIENT, attributes={"url.full": partner.url}) as span:
+        response = await get_async_srm_client().get(partner.url, headers=propagation_headers())
+        span.set_attribute("http.response.status_code", response.status_code)
+        response.raise_for_status()
+    return partner_zones(partner, response_json(response))
@@ -0,0 +1,315 @@
+import contextvars
+import copy
+import os
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from pymongo.errors import DuplicateKeyError
+from edge_cloud_management_api.managers.db_manager import MongoManager
+from edge_cloud_management_api.managers.log_manager import logger
+from edge_cloud_management_api.managers.mongo_indexes import MONGO_INDEXES, apply_indexes
+from edge_cloud_management_api.services.read_model import content_hash
+
+PENDING = "pending"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+_current_job_id: contextvars.ContextVar[str | None] = contextvars.ContextVar("current_job_id", default=None)
+
+
+def current_job_id() -> str | None:
+    """
+    Id of the job the calling handler runs, e.g. to send it as an idempotency key; None outside a job.
+    """
+    return _current_job_id.get()
+
+
+class PermanentJobError(Exception):
+    """
+    Raised by a job handler for a failure that retrying cannot fix, e.g. the SRM rejected the request.
+    """
+
+
+class IdempotencyConflict(Exception):
+    """
+    The idempotency key was already used for a different payload.
+    """
+
+
+def new_job(kind: str, payload: dict, idempotency_key: str | None, max_attempts: int) -> dict:
+    now = time.time()
+    job = {
+        "_id": str(uuid.uuid4()),
+        "kind": kind,
+        "status": PENDING,
+        "payload": payload,
+        "payloadHash": content_hash(payload),
+        "attempts": 0,
+        "maxAttempts": max_attempts,
+        "result": None,
+        "error": None,
+        "createdAt": now,
+        "updatedAt": now,
+        "runAt": now,
+        "leaseUntil": None,
+    }
+    if idempotency_key is not None:
+        job["idempotencyKey"] = idempotency_key
+    return job
+
+
+def job_view(job: dict) -> dict:
+    """
+    Public representation of a job, as returned by the job status resource.
+    """
+
+    def timestamp(value):
+        return datetime.fromtimestamp(value, tz=timezone.utc).isoformat() if value is not None else None
+
+    return {
+        "jobId": job["_id"],
+        "status": job["status"],
+        "attempts": job["attempts"],
+        "createdAt": timestamp(job["createdAt"]),
+        "updatedAt": timestamp(job["updatedAt"]),
+        "result": job.get("result"),
+        "error": job.get("error"),
+    }
+
+
+class InMemoryJobStore:
+    """
+    Job store of a single process; jobs are lost on restart. Meant for tests and single-process development setups.
+    """
+
+    def __init__(self):
+        self._jobs: dict[str, dict] = {}
+        self._keys: dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def insert(self, job: dict) -> dict:
+        """
+        Store the job, or return the job already stored under its idempotency key.
+        """
+        with self._lock:
+            key = job.get("idempotencyKey")
+            if key is not None and key in self._keys:
+                return copy.deepcopy(self._jobs[self._keys[key]])
+            self._jobs[job["_id"]] = copy.deepcopy(job)
+            if key is not None:
+                self._keys[key] = job["_id"]
+            return copy.deepcopy(job)
+
+    def get(self, job_id: str) -> dict | None:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return copy.deepcopy(job) if job is not None else None
+
+    def claim(self, now: float, lease: float) -> dict | None:
+        """
+        Mark the next due job (pending, or running with an expired lease) as running and return it.
+        """
+        with self._lock:
+            due = [
+                job
+                for job in self._jobs.values()
+                if (job["status"] == PENDING and job["runAt"] <= now) or (job["status"] == RUNNING and job["leaseUntil"] <= now)
+            ]
+            if not due:
+                return None
+            job = min(due, key=lambda job: job["runAt"])
+            job.update(status=RUNNING, leaseUntil=now + lease, updatedAt=now, attempts=job["attempts"] + 1)
+            return copy.deepcopy(job)
+
+    def update(self, job_id: str, fields: dict):
+        with self._lock:
+            self._jobs[job_id].update(copy.deepcopy(fields))
+
+
+class MongoJobStore:
+    """
+    Durable job store in a Mongo collection, shared by every worker process.
+    Claims are atomic (find_one_and_update), and a job whose worker died is claimed again once its lease expires.
+    """
+
+    def __init__(self, collection_name: str, mongo_uri=None):
+        self.collection_name = collection_name
+        self.mongo_uri = mongo_uri
+        with MongoManager(mongo_uri) as db:
+            # the unique idempotency key index must exist before the first insert
+            apply_indexes(db, {collection_name: MONGO_INDEXES[collection_name]})
+
+    def insert(self, job: dict) -> dict:
+        with MongoManager(self.mongo_uri) as db:
+            try:
+                db.insert_document(self.collection_name, dict(job))
+                return job
+            except DuplicateKeyError:
+                return db.find_document(self.collection_name, {"idempotencyKey": job["idempotencyKey"]})
+
+    def get(self, job_id: str) -> dict | None:
+        with MongoManager(self.mongo_uri) as db:
+            return db.find_document(self.collection_name, {"_id": job_id})
+
+    def claim(self, now: float, lease: float) -> dict | None:
+        with MongoManager(self.mongo_uri) as db:
+            return db.find_one_and_update(
+                self.collection_name,
+                {"$or": [{"status": PENDING, "runAt": {"$lte": now}}, {"status": RUNNING, "leaseUntil": {"$lte": now}}]},
+                {"status": RUNNING, "leaseUntil": now + lease, "updatedAt": now},
+                sort=[("runAt", 1)],
+                increment={"attempts": 1},
+            )
+
+    def update(self, job_id: str, fields: dict):
+        with MongoManager(self.mongo_uri) as db:
+            db.update_document(self.collection_name, {"_id": job_id}, fields)
+
+
+class JobQueue:
+    """
+    Run jobs from a job store on a bounded pool of worker threads, with retries and idempotency keys.
+
+    submit() only stores the job and returns; a worker claims it and calls handler(payload). A PermanentJobError fails
+    the job at once; any other exception is retried with exponential backoff until max_attempts.
+    While the handler runs, its lease is renewed every third of the lease, so a slow handler is not claimed again by
+    another worker; the handler can read the job id with current_job_id().
+    Submitting again with the same idempotency key returns the existing job instead of creating a second one.
+
+    Example:
+        queue = JobQueue("deployment", InMemoryJobStore, handler=deploy, workers=4)
+        job, created = queue.submit({"appId": "..."}, idempotency_key="client-key-1")
+        queue.get(job["_id"])["status"]
+    """
+
+    def __init__(
+        self,
+        kind: str,
+        store_factory,
+        handler,
+        workers: int = 4,
+        max_attempts: int = 5,
+        retry_backoff: float = 2.0,
+        retry_backoff_max: float = 60.0,
+        lease: float = 120.0,
+        poll_interval: float = 1.0,
+    ):
+        self.kind = kind
+        self.store_factory = store_factory
+        self.handler = handler
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.retry_backoff = retry_backoff
+        self.retry_backoff_max = retry_backoff_max
+        self.lease = lease
+        self.poll_interval = poll_interval
+        self._store = None
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._threads: list[threading.Thread] = []
+        self._pid: int | None = None
+
+    @property
+    def store(self):
+        if self._store is None:
+            with self._lock:
+                if self._store is None:
+                    self._store = self.store_factory()
+        return self._store
+
+    def submit(self, payload: dict, idempotency_key: str | None = None) -> tuple[dict, bool]:
+        """
+        Store a job for the payload; returns the job and whether it was created (False for a repeated idempotency key).
+        Raises IdempotencyConflict when the key was used for a different payload.
+        """
+        job = new_job(self.kind, payload, idempotency_key, self.max_attempts)
+        stored = self.store.insert(job)
+        if stored["_id"] != job["_id"]:
+            if stored["payloadHash"] != job["payloadHash"]:
+                raise IdempotencyConflict(f"Idempotency key {idempotency_key} was already used for a different request")
+            return stored, False
+        self.start()
+        self._wake.set()
+        return stored, True
+
+    def get(self, job_id: str) -> dict | None:
+        return self.store.get(job_id)
+
+    def backoff(self, attempts: int) -> float:
+        return min(self.retry_backoff_max, self.retry_backoff * 2 ** (attempts - 1))
+
+    def run_once(self) -> bool:
+        """
+        Claim and run one due job; returns False when none is due.
+        """
+        job = self.store.claim(time.time(), self.lease)
+        if job is None:
+            return False
+        handler_done = threading.Event()
+        renewer = threading.Thread(target=self._renew_lease, args=(job["_id"], handler_done), name=f"{self.kind}-lease", daemon=True)
+        renewer.start()
+        token = _current_job_id.set(job["_id"])
+        try:
+            result = self.handler(job["payload"])
+        except PermanentJobError as err:
+            logger.warning(f"{self.kind} job {job['_id']} failed: {err}")
+            self.store.update(job["_id"], {"status": FAILED, "error": str(err), "updatedAt": time.time()})
+        except Exception as err:
+            now = time.time()
+            if job["attempts"] >= job["maxAttempts"]:
+                logger.warning(f"{self.kind} job {job['_id']} failed after {job['attempts']} attempts: {err}")
+                self.store.update(job["_id"], {"status": FAILED, "error": str(err), "updatedAt": now})
+            else:
+                delay = self.backoff(job["attempts"])
+                logger.info(f"{self.kind} job {job['_id']} attempt {job['attempts']} failed, retrying in {delay:.1f}s: {err}")
+                self.store.update(job["_id"], {"status": PENDING, "error": str(err), "runAt": now + delay, "updatedAt": now})
+        else:
+            self.store.update(job["_id"], {"status": SUCCEEDED, "result": result, "error": None, "updatedAt": time.time()})
+        finally:
+            _current_job_id.reset(token)
+            handler_done.set()
+            renewer.join()
+        return True
+
+    def _renew_lease(self, job_id: str, handler_done: threading.Event):
+        while not handler_done.wait(self.lease / 3):
+            try:
+                self.store.update(job_id, {"leaseUntil": time.time() + self.lease})
+            except Exception:
+                logger.exception(f"{self.kind} job {job_id}: failed to renew the lease")
+
+    def start(self):
+        """
+        Start the worker threads, once per process (a forked worker starts its own).
+        """
+        if self._pid == os.getpid() and any(thread.is_alive() for thread in self._threads):
+            return
+        with self._lock:
+            if self._pid == os.getpid() and any(thread.is_alive() for thread in self._threads):
+                return
+            self._stop.clear()
+            self._pid = os.getpid()
+            self._threads = [threading.Thread(target=self._work, name=f"{self.kind}-worker-{i}", daemon=True) for i in range(self.workers)]
+            for thread in self._threads:
+                thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+        for thread in self._threads:
+            if thread is not threading.current_thread():
+                thread.join(timeout=self.poll_interval + 1)
+        self._threads = []
+
+    def _work(self):
+        while not self._stop.is_set():
+            try:
+                if self.run_once():
+                    continue
+            except Exception:
+                logger.exception(f"{self.kind} worker failed to claim or record a job")
+            self._wake.wait(self.poll_interval)
+            self._wake.clear()
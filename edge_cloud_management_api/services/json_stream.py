@@ -0,0 +1,139 @@
+import codecs
+import itertools
+import json
+import re
+from edge_cloud_management_api.managers import json_provider
+
+_WHITESPACE = re.compile(r"\s*")
+_DELIMITERS = frozenset(" \t\r\n,]")
+
+
+def _skip_whitespace(buffer: str, position: int) -> int:
+    match = _WHITESPACE.match(buffer, position)
+    return match.end() if match else position
+
+
+def dumps(value) -> str:
+    return json_provider.dumps(value).decode()
+
+
+class JsonArrayParser:
+    """
+    Incremental parser for a top-level JSON array: feed it the bytes of a response as they arrive and it returns the
+    elements completed so far, so that a large SRM listing never has to be held in memory as a whole.
+
+    Example:
+        parser = JsonArrayParser()
+        for chunk in response.iter_content(65536):
+            for item in parser.feed(chunk):
+                ...
+        parser.close()
+    """
+
+    def __init__(self):
+        self._decoder = json.JSONDecoder()
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._state = "start"  # start -> first -> items -> done
+
+    def feed(self, data: bytes) -> list:
+        buffer = self._buffer + self._utf8.decode(data)
+        items = []
+        position = 0
+        while self._state != "done":
+            position = _skip_whitespace(buffer, position)
+            if position >= len(buffer):
+                break
+            if self._state == "start":
+                if buffer[position] != "[":
+                    raise ValueError("Expected a JSON array")
+                position += 1
+                self._state = "first"
+                continue
+            if buffer[position] == "]":
+                position += 1
+                self._state = "done"
+                break
+            start = position
+            if self._state == "items":
+                if buffer[position] != ",":
+                    raise ValueError(f"Expected ',' or ']' in JSON array, got {buffer[position]!r}")
+                start = _skip_whitespace(buffer, position + 1)
+            try:
+                item, end = self._decoder.raw_decode(buffer, start)
+            except json.JSONDecodeError:
+                break  # element not complete yet
+            if end >= len(buffer) or buffer[end] not in _DELIMITERS:
+                break  # a number cut inside the chunk ("12" of "12.5") would decode too early, wait for its delimiter
+            items.append(item)
+            position = end
+            self._state = "items"
+        self._buffer = buffer[position:]
+        return items
+
+    def close(self):
+        """
+        Check that the whole array was received.
+        """
+        if self._state != "done":
+            raise ValueError("Truncated JSON array")
+
+
+def stream_json_array(items, envelope: str | None = None, batch_size: int = 256):
+    """
+    Yield the JSON encoding of an iterable as an array, or as {envelope: [...]}, batch_size elements at a time,
+    instead of building the whole document in memory.
+    """
+    yield "{" + dumps(envelope) + ":[" if envelope else "["
+    separator = ""
+    for batch in itertools.batched(items, batch_size):
+        yield separator + ",".join(dumps(item) for item in batch)
+        separator = ","
+    yield "]}" if envelope else "]"
+
+
+async def astream_json_array(items, envelope: str | None = None, batch_size: int = 256):
+    """
+    stream_json_array for an async iterable.
+    """
+    yield "{" + dumps(envelope) + ":[" if envelope else "["
+    separator = ""
+    batch = []
+    async for item in items:
+        batch.append(dumps(item))
+        if len(batch) >= batch_size:
+            yield separator + ",".join(batch)
+            separator = ","
+            batch = []
+    if batch:
+        yield separator + ",".join(batch)
+    yield "]}" if envelope else "]"
+
+
+def peek(items):
+    """
+    Return (empty, iterator): whether the iterable has no element, and an iterator over all of its elements.
+    Errors raised while producing the first element surface here, before any response is sent.
+    """
+    iterator = iter(items)
+    for first in iterator:
+        return False, itertools.chain([first], iterator)
+    return True, iterator
+
+
+async def apeek(items):
+    """
+    peek for an async iterable.
+    """
+    iterator = aiter(items)
+    try:
+        first = await anext(iterator)
+    except StopAsyncIteration:
+        return True, iterator
+
+    async def chained():
+        yield first
+        async for item in iterator:
+            yield item
+
+    return False, chained()
@@ -0,0 +1,54 @@
+import base64
+import heapq
+import json
+
+NEXT_PAGE_TOKEN_HEADER = "x-next-page-token"
+
+
+class InvalidPageToken(ValueError):
+    pass
+
+
+def encode_page_token(last_key) -> str:
+    """
+    Opaque token pointing right after last_key, the sort key of the last item of a page.
+    """
+    return base64.urlsafe_b64encode(json.dumps({"after": last_key}).encode()).decode().rstrip("=")
+
+
+def decode_page_token(token: str | None):
+    """
+    Return the sort key a page token points after, or None for the first page.
+    Raises InvalidPageToken when the token does not decode, or its key is not a string like the keys it is built from.
+    """
+    if not token:
+        return None
+    try:
+        after = json.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))["after"]
+    except Exception as err:
+        raise InvalidPageToken(f"Invalid pageToken: {token}") from err
+    if not isinstance(after, str):
+        raise InvalidPageToken(f"Invalid pageToken: {token}")
+    return after
+
+
+def paginate(items: list[dict], key: str, limit: int, page_token: str | None = None) -> tuple[list[dict], str | None]:
+    """
+    Keyset pagination over an in-memory listing, with the same tokens as MongoManager.find_page,
+    so that a listing can move between the SRM and Mongo without invalidating clients' tokens.
+    The whole listing is still fetched for every page: only the response is bounded by limit, not the memory
+    or latency of the request.
+
+    Returns the page and the token of the next page (None on the last page).
+    """
+    after = decode_page_token(page_token)
+
+    def sort_key(item):
+        return str(item.get(key, ""))
+
+    remaining = (item for item in items if after is None or sort_key(item) > after)
+    # one extra item tells whether there is a next page
+    page = heapq.nsmallest(limit + 1, remaining, key=sort_key)
+    if len(page) <= limit:
+        return page, None
+    return page[:limit], encode_page_token(sort_key(page[limit - 1]))
@@ -0,0 +1,374 @@
+import asyncio
+import time
+import weakref
+import httpx
+from edge_cloud_management_api.managers.log_manager import logger
+from edge_cloud_management_api.configs.env_config import config
+from edge_cloud_management_api.managers.json_provider import dumps, response_json
+from edge_cloud_management_api.managers.metrics_manager import srm_request_duration
+from edge_cloud_management_api.managers.trace_manager import CLIENT, propagation_headers, start_span
+from edge_cloud_management_api.services.circuit_breaker import CircuitOpenError, srm_circuits
+from edge_cloud_management_api.services.pi_edge_services import SRM_IDEMPOTENCY_KEY_HEADER, srm_endpoint, token_lifetime
+from edge_cloud_management_api.services.json_stream import JsonArrayParser
+from edge_cloud_management_api.services.retry_policy import IDEMPOTENT_METHODS, async_call_with_retries, remaining_time
+from edge_cloud_management_api.services.single_flight import AsyncSingleFlight
+from edge_cloud_management_api.services.srm_cache import cached_srm_read, invalidates_srm_read
+from edge_cloud_management_api.services.srm_transport import get_async_srm_client
+
+
+TIMEOUT_ERROR = "The request to the external API timed out. Please try again later."
+CONNECTION_ERROR = "Failed to connect to the external API service. Service might be unavailable."
+
+
+class AsyncSrmCircuitOpen(CircuitOpenError, httpx.TransportError):
+    """
+    The SRM endpoint is failing and its circuit is open: the call was not sent.
+    """
+
+
+class AsyncPiEdgeAPIClient:
+    """
+    asyncio counterpart of PiEdgeAPIClient.
+    Same methods and same error dictionaries, but SRM calls are awaited on a pooled httpx.AsyncClient
+    instead of blocking a worker thread.
+    """
+
+    def __init__(self, base_url, username, password):
+        self.base_url = base_url
+        self.username = username
+        self.password = password
+        self.token = None
+        self.token_expires_at = 0.0
+        self._token_lock = asyncio.Lock()
+        self.http_client = get_async_srm_client()
+        self._in_flight = AsyncSingleFlight()
+
+    @property
+    def cache_scope(self):
+        """
+        Identity under which SRM responses are cached.
+        """
+        return (self.base_url, self.username)
+
+    async def _authenticate(self):
+        """
+        Private method to login and obtain an authentication token.
+        """
+        login_url = f"{self.base_url}/authentication"
+        credentials = {"username": self.username, "password": self.password}
+
+        try:
+            response = await self.http_client.post(login_url, json=credentials)
+            response.raise_for_status()
+            payload = response_json(response)
+            token = payload.get("token")
+            if not token:
+                raise ValueError("Login failed: No token found")
+            self.token_expires_at = time.monotonic() + token_lifetime(payload, token)
+            self.token = token
+        except httpx.HTTPStatusError as http_err:
+            logger.error(f"HTTP error occurred: {http_err}")
+        except Exception as err:
+            logger.error(f"Error occurred: {err}")
+
+    def _token_needs_refresh(self):
+        return self.token is None or time.monotonic() >= self.token_expires_at - config.SRM_TOKEN_REFRESH_MARGIN
+
+    async def _ensure_token(self):
+        """
+        Login when the token is missing or about to expire; concurrent coroutines wait for a single login.
+        """
+        if not self._token_needs_refresh():
+            return
+        token_still_valid = self.token is not None and time.monotonic() < self.token_expires_at
+        if token_still_valid and self._token_lock.locked():
+            return
+        async with self._token_lock:
+            if self._token_needs_refresh():
+                await self._authenticate()
+
+    async def _get_headers(self):
+        headers = {
+            "Content-Type": "application/json",
+            **propagation_headers(),
+        }
+        if config.SRM_AUTH_ENABLED:
+            await self._ensure_token()
+            if self.token:
+                headers["Authorization"] = f"Bearer {self.token}"
+        return headers
+
+    async def _request(self, method, url, **kwargs) -> httpx.Response:
+        """
+        Send a request to the SRM through the pooled AsyncClient; concurrent GETs of the same URL share one call.
+        Idempotent requests (GET, DELETE) are retried on timeouts, transport errors and 429/502/503/504 answers.
+        The call is a client span of the current trace.
+        """
+        endpoint = srm_endpoint(self.base_url, url)
+
+        async def send():
+            if method not in IDEMPOTENT_METHODS:
+                return await self._send(method, url, **kwargs)
+            return await async_call_with_retries(lambda: self._send(method, url, **kwargs), (httpx.TransportError,), label=f"{method} {endpoint}")
+
+        with start_span(f"SRM {method} {endpoint}", kind=CLIENT, attributes={"http.request.method": method, "url.full": url}) as span:
+            if method != "GET" or not config.SRM_SINGLE_FLIGHT:
+                response = await send()
+            else:
+                response = await self._in_flight.do((url, self.cache_scope), send, label=endpoint)
+            span.set_attribute("http.response.status_code", response.status_code)
+            return response
+
+    async def _send(self, method, url, stream: bool = False, **kwargs) -> httpx.Response:
+        """
+        Send a single request through the endpoint's circuit breaker and adaptive read timeout, retrying once with a
+        fresh login on a 401. Raises AsyncSrmCircuitOpen without calling the SRM while the circuit is open.
+        Within a deadline_scope, the timeouts are capped to the time left.
+        With stream=True the body is not read: the call is timed up to the response headers, and the caller closes
+        the response. Headers passed in kwargs are added to the authorization headers.
+        """
+        remaining = remaining_time()
+        if remaining is not None and remaining <= 0:
+            raise httpx.TimeoutException(f"Deadline exceeded before {method} {url}")
+        endpoint = srm_endpoint(self.base_url, url)
+        guard = srm_circuits.guard(self.base_url, method, endpoint)
+        if not guard.breaker.allow():
+            raise AsyncSrmCircuitOpen(f"Circuit open for {guard.name}")
+        if "timeout" not in kwargs:
+            connect, read = guard.timeout()
+            if remaining is not None:
+                connect, read = min(connect, remaining), min(read, remaining)
+            kwargs["timeout"] = httpx.Timeout(read, connect=connect)
+        if "json" in kwargs:
+            # encoded with the JSON codec, not by httpx with the json module
+            kwargs["content"] = dumps(kwargs.pop("json"))
+        extra_headers = kwargs.pop("headers", None) or {}
+
+        async def request(headers):
+            headers = {**headers, **extra_headers}
+            if not stream:
+                return await self.http_client.request(method, url, headers=headers, **kwargs)
+            return await self.http_client.send(self.http_client.build_request(method, url, headers=headers, **kwargs), stream=True)
+
+        started = time.monotonic()
+        try:
+            headers = await self._get_headers()
+            response = await request(headers)
+            if response.status_code == 401 and config.SRM_AUTH_ENABLED:
+                logger.info(f"SRM rejected the token for {method} {url}, logging in again")
+                await response.aclose()
+                if self.token == headers.get("Authorization", "").removeprefix("Bearer "):
+                    self.token = None
+                response = await request(await self._get_headers())
+        except BaseException as err:
+            # a cancelled call (e.g. a missed fan-out deadline) also releases a half-open probe
+            elapsed = time.monotonic() - started
+            guard.record(elapsed, failed=True)
+            srm_request_duration.observe(elapsed, method, endpoint, type(err).__name__)
+            raise
+        elapsed = time.monotonic() - started
+        guard.record(elapsed, failed=response.status_code >= 500)
+        srm_request_duration.observe(elapsed, method, endpoint, str(response.status_code))
+        return response
+
+    async def _json_request(self, method, url, **kwargs):
+        """
+        Send a request and return its decoded JSON body, or the same error dictionary as PiEdgeAPIClient.
+        """
+        try:
+            response = await self._request(method, url, **kwargs)
+            response.raise_for_status()
+            return response_json(response)
+        except httpx.TimeoutException:
+            return {"error": TIMEOUT_ERROR}
+        except httpx.TransportError:
+            return {"error": CONNECTION_ERROR}
+        except httpx.HTTPStatusError as http_err:
+            return {
+                "error": f"HTTP error occurred: {http_err}.",
+                "status_code": http_err.response.status_code,
+            }
+
+    @cached_srm_read("/serviceFunction")
+    async def get_service_functions_catalogue(self):
+        """
+        Get service function catalogue from the /serviceFunction endpoint.
+        """
+        try:
+            service_functions = await self._json_request("GET", f"{self.base_url}/serviceFunction")
+            if isinstance(service_functions, list):
+                return service_functions
+            if isinstance(service_functions, dict) and "error" in service_functions:
+                return service_functions
+            raise ValueError("Unexpected response from Pi Edge Server")
+        except ValueError as val_err:
+            return {"error": str(val_err)}
+        except Exception as err:
+            return {"error": f"An unexpected error occurred: {err}"}
+
+    @invalidates_srm_read("/serviceFunction")
+    async def submit_app(self, body):
+        """
+        Register app metadata to SRM
+        """
+        return await self._json_request("POST", f"{self.base_url}/serviceFunction", json=body)
+
+    async def get_app(self, appId):
+        """
+        Get app metadata from SRM
+        """
+        return await self._json_request("GET", f"{self.base_url}/serviceFunction/" + appId)
+
+    @invalidates_srm_read("/serviceFunction")
+    async def delete_app(self, appId: str):
+        """
+        Remove app metadata from SRM
+        """
+        try:
+            response = await self._request("DELETE", f"{self.base_url}/serviceFunction/" + appId)
+            response.raise_for_status()
+            return response
+        except httpx.TimeoutException:
+            return {"error": TIMEOUT_ERROR}
+        except httpx.TransportError:
+            return {"error": CONNECTION_ERROR}
+        except httpx.HTTPStatusError as http_err:
+            return {
+                "error": f"HTTP error occurred: {http_err}.",
+                "status_code": http_err.response.status_code,
+            }
+        except Exception as err:
+            return {"error": f"An unexpected error occurred: {err}"}
+
+    @invalidates_srm_read("/deployedServiceFunction")
+    async def deploy_service_function(self, data: dict, idempotency_key: str | None = None):
+        """
+        Post data to the /deployedServiceFunction endpoint.
+        An idempotency_key is sent in the Idempotency-Key header, so that the SRM can recognize a repeated deployment.
+        """
+        headers = {SRM_IDEMPOTENCY_KEY_HEADER: idempotency_key} if idempotency_key is not None else None
+        try:
+            return await self._json_request("POST", f"{self.base_url}/deployedServiceFunction", json=data, headers=headers)
+        except Exception as err:
+            return {"error": f"An unexpected error occurred: {err}"}
+
+    @cached_srm_read("/deployedServiceFunction")
+    async def get_app_instances(self):
+        """
+        Retrieve all app instances.
+        """
+        return await self._json_request("GET", f"{self.base_url}/deployedServiceFunction")
+
+    async def get_app_instance(self, app_instance_id: str):
+        """
+        Retrieve one app instance by id, without listing all of them.
+        """
+        return await self._json_request("GET", f"{self.base_url}/deployedServiceFunction/" + app_instance_id)
+
+    async def get_app_instances_by_id(self, app_instance_ids: list[str]) -> list:
+        """
+        Retrieve several app instances by id concurrently, at most SRM_LOOKUP_MAX_CONCURRENCY at a time; one result
+        per id, in order.
+        """
+        semaphore = asyncio.Semaphore(max(1, int(config.SRM_LOOKUP_MAX_CONCURRENCY)))
+
+        async def lookup(app_instance_id):
+            async with semaphore:
+                return await self.get_app_instance(app_instance_id)
+
+        return list(await asyncio.gather(*(lookup(app_instance_id) for app_instance_id in app_instance_ids)))
+
+    async def iter_app_instances(self):
+        """
+        Stream all app instances, parsing the SRM response incrementally. Errors are raised.
+        Unlike get_app_instances, the listing is neither cached, coalesced nor retried.
+        """
+        url = f"{self.base_url}/deployedServiceFunction"
+        endpoint = srm_endpoint(self.base_url, url)
+        with start_span(f"SRM GET {endpoint}", kind=CLIENT, attributes={"http.request.method": "GET", "url.full": url}) as span:
+            response = await self._send("GET", url, stream=True)
+            span.set_attribute("http.response.status_code", response.status_code)
+        try:
+            response.raise_for_status()
+            parser = JsonArrayParser()
+            async for chunk in response.aiter_bytes(config.STREAM_CHUNK_SIZE):
+                for item in parser.feed(chunk):
+                    yield item
+            parser.close()
+        finally:
+            await response.aclose()
+
+    @invalidates_srm_read("/deployedServiceFunction")
+    async def delete_app_instance(self, app_instance_id: str):
+        """
+        Remove app instance.
+        """
+        try:
+            response = await self._request("DELETE", f"{self.base_url}/deployedServiceFunction/" + app_instance_id)
+            response.raise_for_status()
+            return response
+        except httpx.TimeoutException:
+            return {"error": TIMEOUT_ERROR}
+        except httpx.TransportError:
+            return {"error": CONNECTION_ERROR}
+        except httpx.HTTPStatusError as http_err:
+            return {
+                "error": f"HTTP error occurred: {http_err}.",
+                "status_code": http_err.response.status_code,
+            }
+
+    @cached_srm_read("/node")
+    async def edge_cloud_zones(self):
+        """
+        Get list of edge zones from /node endpoint.
+        """
+        try:
+            nodes = await self._json_request("GET", f"{self.base_url}/node")
+            if isinstance(nodes, dict) and "error" in nodes:
+                return nodes
+            if not nodes:
+                raise ValueError("No edge nodes found")
+            return nodes
+        except ValueError as val_err:
+            return {"error": str(val_err)}
+        except Exception as err:
+            return {"error": f"An unexpected error occurred: {err}"}
+
+
+class AsyncPiEdgeAPIClientFactory:
+    """
+    Factory class to get AsyncPiEdgeAPIClient instances, cached per (base_url, username) and per event loop.
+    """
+
+    _clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict]" = weakref.WeakKeyDictionary()
+
+    def __init__(self):
+        self.default_base_url = config.SRM_HOST
+        self.default_username = config.PI_EDGE_USERNAME
+        self.default_password = config.PI_EDGE_PASSWORD
+
+    def create_pi_edge_api_client(self, base_url=None, username=None, password=None):
+        """
+        Factory method to get the AsyncPiEdgeAPIClient for the given SRM and user. Must be called from a running event loop.
+
+        Args:
+            base_url (str): The base URL for the SRM API. If None, the default is used.
+            username (str): The username for authentication. If None, the default is used.
+            password (str): The password for authentication. If None, the default is used.
+
+        Returns:
+            AsyncPiEdgeAPIClient: The cached instance of the AsyncPiEdgeAPIClient.
+        """
+        if base_url is None:
+            base_url = self.default_base_url
+        if username is None:
+            username = self.default_username
+        if password is None:
+            password = self.default_password
+
+        loop_clients = self._clients.setdefault(asyncio.get_running_loop(), {})
+        client = loop_clients.get((base_url, username))
+        if client is None or client.password != password or client.http_client.is_closed:
+            client = AsyncPiEdgeAPIClient(base_url=base_url, username=username, password=password)
+            loop_clients[(base_url, username)] = client
+        return client
@@ -1,13 +1,33 @@
+import base64
+import json
+import os
+import threading
+import time
 import requests
 from edge_cloud_management_api.managers.log_manager import logger
 from requests.exceptions import Timeout, ConnectionError
 from edge_cloud_management_api.configs.env_config import config
+from edge_cloud_management_api.managers.json_provider import dumps, response_json
+from edge_cloud_management_api.managers.metrics_manager import srm_request_duration
+from edge_cloud_management_api.managers.trace_manager import CLIENT, propagation_headers, start_span
+from edge_cloud_management_api.services.circuit_breaker import CircuitOpenError, srm_circuits
+from edge_cloud_management_api.services.fan_out import bounded_map
+from edge_cloud_management_api.services.json_stream import JsonArrayParser
+from edge_cloud_management_api.services.retry_policy import IDEMPOTENT_METHODS, call_with_retries, remaining_time
+from edge_cloud_management_api.services.single_flight import SingleFlight
+from edge_cloud_management_api.services.srm_cache import cached_srm_read, invalidates_srm_read
+from edge_cloud_management_api.services.srm_transport import get_srm_session, get_srm_timeout
 
 
-proxies = {
-    "http": config.HTTP_PROXY,
-    "https": config.HTTP_PROXY,
-}
+# header carrying the idempotency key of a deployment
+SRM_IDEMPOTENCY_KEY_HEADER = "Idempotency-Key"
+
+
+class SrmCircuitOpen(CircuitOpenError, ConnectionError):
+    """
+    The SRM endpoint is failing and its circuit is open: the call was not sent.
+    A ConnectionError, so that the client methods answer with their usual "service unavailable" error dictionary.
+    """
 
 
 class PiEdgeAPIClient:
@@ -16,13 +36,35 @@ class PiEdgeAPIClient:
         self.username = username
         self.password = password
         self.token = None
-        #self.requests_session = self._get_proxy_session(proxies)
-        
+        self.token_expires_at = 0.0
+        # serializes logins so that concurrent requests on an expired token trigger a single /authentication call
+        self._token_lock = threading.Lock()
+        # a session set on the client (e.g. a test double) instead of the process-wide one
+        self._requests_session = None
+        self.timeout = get_srm_timeout()
+        # identical GETs issued concurrently by several threads share one upstream call
+        self._in_flight = SingleFlight()
+
+    @property
+    def requests_session(self):
+        """
+        The process-wide pooled session, resolved on every call so that consecutive calls reuse kept-alive
+        connections and a forked worker uses its own session instead of the parent's sockets.
+        """
+        if self._requests_session is not None:
+            return self._requests_session
+        return get_srm_session()
+
+    @requests_session.setter
+    def requests_session(self, session):
+        self._requests_session = session
 
-    def _get_proxy_session(self, session_proxies):
-        session = requests.Session()
-        session.proxies.update(session_proxies)
-        return session
+    @property
+    def cache_scope(self):
+        """
+        Identity under which SRM responses are cached.
+        """
+        return (self.base_url, self.username)
 
     def _authenticate(self):
         """
@@ -36,42 +78,139 @@ class PiEdgeAPIClient:
             response = self.requests_session.post(
                 login_url,
                 json=credentials,
-                # proxies=proxies,
+                timeout=self.timeout,
             )
             response.raise_for_status()
 
             # Assuming the token is in the response JSON with key 'access_token'
-            self.token = response.json().get("token")
-            if not self.token:
+            payload = response_json(response)
+            token = payload.get("token")
+            if not token:
                 raise ValueError("Login failed: No token found")
+            self.token_expires_at = time.monotonic() + token_lifetime(payload, token)
+            self.token = token
         except requests.exceptions.HTTPError as http_err:
             logger.error(f"HTTP error occurred: {http_err}")
         except Exception as err:
             logger.error(f"Error occurred: {err}")
 
+    def _token_needs_refresh(self):
+        return self.token is None or time.monotonic() >= self.token_expires_at - config.SRM_TOKEN_REFRESH_MARGIN
+
+    def _ensure_token(self):
+        """
+        Login when the token is missing, expired or about to expire.
+        Only one thread logs in; the others wait for it, or keep using the current token while it is still valid.
+        """
+        if not self._token_needs_refresh():
+            return
+        token_still_valid = self.token is not None and time.monotonic() < self.token_expires_at
+        if not self._token_lock.acquire(blocking=not token_still_valid):
+            return
+        try:
+            if self._token_needs_refresh():
+                self._authenticate()
+        finally:
+            self._token_lock.release()
+
+    def _invalidate_token(self, rejected_token):
+        """
+        Drop a token the SRM rejected, unless another thread already replaced it.
+        """
+        with self._token_lock:
+            if self.token == rejected_token:
+                self.token = None
+                self.token_expires_at = 0.0
+
     def _get_headers(self):
         """
         Helper function to return the authorization headers with token.
         If token is not available, automatically login.
+        Within an API request, its x-correlator and traceparent are forwarded.
         """
-        #if not self.token:
-         #   self._authenticate()
-
-        return {
-           # "Authorization": f"Bearer {self.token}",
+        headers = {
             "Content-Type": "application/json",
+            **propagation_headers(),
         }
+        if config.SRM_AUTH_ENABLED:
+            self._ensure_token()
+            if self.token:
+                headers["Authorization"] = f"Bearer {self.token}"
+        return headers
 
+    def _request(self, method, url, **kwargs):
+        """
+        Send a request to the SRM through the shared pooled session.
+        Idempotent requests (GET, DELETE) are retried on timeouts, connection errors and 429/502/503/504 answers.
+        Concurrent GETs of the same URL are coalesced: one thread calls the SRM and the others receive its response.
+        The call, retries and coalescing included, is a client span of the current trace.
+        """
+        endpoint = srm_endpoint(self.base_url, url)
+
+        def send():
+            if method not in IDEMPOTENT_METHODS:
+                return self._send(method, url, **kwargs)
+            return call_with_retries(lambda: self._send(method, url, **kwargs), (Timeout, ConnectionError), label=f"{method} {endpoint}")
+
+        with start_span(f"SRM {method} {endpoint}", kind=CLIENT, attributes={"http.request.method": method, "url.full": url}) as span:
+            if method != "GET" or not config.SRM_SINGLE_FLIGHT:
+                response = send()
+            else:
+                response = self._in_flight.do((url, self.cache_scope), send, label=endpoint)
+            span.set_attribute("http.response.status_code", response.status_code)
+            return response
+
+    def _send(self, method, url, **kwargs):
+        """
+        Send a single request to the SRM, through the circuit breaker of its endpoint and with its adaptive read timeout.
+        A 401 drops the cached token and the request is retried once with a fresh login.
+        Raises SrmCircuitOpen without calling the SRM while the endpoint's circuit is open. Within a deadline_scope, the
+        timeouts are capped to the time left. Headers passed in kwargs are added to the authorization headers.
+        """
+        remaining = remaining_time()
+        if remaining is not None and remaining <= 0:
+            raise Timeout(f"Deadline exceeded before {method} {url}")
+        endpoint = srm_endpoint(self.base_url, url)
+        guard = srm_circuits.guard(self.base_url, method, endpoint)
+        if not guard.breaker.allow():
+            raise SrmCircuitOpen(f"Circuit open for {guard.name}")
+        timeout = guard.timeout(self.timeout)
+        if remaining is not None:
+            timeout = (min(timeout[0], remaining), min(timeout[1], remaining))
+        kwargs.setdefault("timeout", timeout)
+        if "json" in kwargs:
+            # encoded with the JSON codec, not by requests with the json module
+            kwargs["data"] = dumps(kwargs.pop("json"))
+        extra_headers = kwargs.pop("headers", None) or {}
+        started = time.monotonic()
+        try:
+            headers = {**self._get_headers(), **extra_headers}
+            response = self.requests_session.request(method, url, headers=headers, verify=False, **kwargs)
+            if response.status_code == 401 and config.SRM_AUTH_ENABLED:
+                logger.info(f"SRM rejected the token for {method} {url}, logging in again")
+                response.close()
+                self._invalidate_token(headers.get("Authorization", "").removeprefix("Bearer ") or None)
+                response = self.requests_session.request(method, url, headers={**self._get_headers(), **extra_headers}, verify=False, **kwargs)
+        except Exception as err:
+            elapsed = time.monotonic() - started
+            guard.record(elapsed, failed=True)
+            srm_request_duration.observe(elapsed, method, endpoint, type(err).__name__)
+            raise
+        elapsed = time.monotonic() - started
+        guard.record(elapsed, failed=response.status_code >= 500)
+        srm_request_duration.observe(elapsed, method, endpoint, str(response.status_code))
+        return response
+
+    @cached_srm_read("/serviceFunction")
     def get_service_functions_catalogue(self):
         """
         Get service function catalogue from the /serviceFunction endpoint.
         """
         url = f"{self.base_url}/serviceFunction"
         try:
-            request_headers = self._get_headers()
-            response = requests.get(url, headers=request_headers, verify=False)
+            response = self._request("GET", url)
             response.raise_for_status()
-            service_functions = response.json()
+            service_functions = response_json(response)
             if isinstance(service_functions, list):
                 return service_functions
             raise ValueError("Unexpected response from Pi Edge Server")
@@ -95,16 +234,16 @@ class PiEdgeAPIClient:
             return {"error": f"An unexpected error occurred: {err}"}
         
         
+    @invalidates_srm_read("/serviceFunction")
     def submit_app(self, body):
         """
         Register app metadata to SRM
         """
         url = f"{self.base_url}/serviceFunction"
         try:
-            request_headers = self._get_headers()
-            response = requests.post(url, headers=request_headers, verify=False, json=body)
+            response = self._request("POST", url, json=body)
             response.raise_for_status()
-            return response.json()
+            return response_json(response)
         except Timeout:
             return {"error": "The request to the external API timed out. Please try again later."}
 
@@ -123,10 +262,9 @@ class PiEdgeAPIClient:
         """
         url = f"{self.base_url}/serviceFunction/"+appId
         try:
-            request_headers = self._get_headers()
-            response = requests.get(url, headers=request_headers, verify=False)
+            response = self._request("GET", url)
             response.raise_for_status()
-            return response.json()
+            return response_json(response)
         except Timeout:
             return {"error": "The request to the external API timed out. Please try again later."}
 
@@ -139,13 +277,14 @@ class PiEdgeAPIClient:
                 "status_code": response.status_code,
             }
         
+    @invalidates_srm_read("/serviceFunction")
     def delete_app(self, appId:str):
         """
         Remove app metadata from SRM
         """
         url = f"{self.base_url}/serviceFunction/"+appId
         try:
-            response = requests.delete(url,headers=self._get_headers(), verify=False)
+            response = self._request("DELETE", url)
             response.raise_for_status()
             return response
         except Timeout:
@@ -163,15 +302,18 @@ class PiEdgeAPIClient:
         except Exception as err:
             return {"error": f"An unexpected error occurred: {err}"}
 
-    def deploy_service_function(self, data: dict):
+    @invalidates_srm_read("/deployedServiceFunction")
+    def deploy_service_function(self, data: dict, idempotency_key: str | None = None):
         """
         Post data to the /deployedServiceFunction endpoint.
+        An idempotency_key is sent in the Idempotency-Key header, so that the SRM can recognize a repeated deployment.
         """
         url = f"{self.base_url}/deployedServiceFunction"
+        headers = {SRM_IDEMPOTENCY_KEY_HEADER: idempotency_key} if idempotency_key is not None else None
         try:
-            response = requests.post(url, json=data, headers=self._get_headers(), verify=False)
+            response = self._request("POST", url, json=data, headers=headers)
             response.raise_for_status()
-            return response.json()
+            return response_json(response)
         except Timeout:
             return {"error": "The request to the external API timed out. Please try again later."}
 
@@ -188,15 +330,16 @@ class PiEdgeAPIClient:
             return {"error": f"An unexpected error occurred: {err}"}
         
 
+    @cached_srm_read("/deployedServiceFunction")
     def get_app_instances(self):
         """
         Retrieve all app instances.
         """
         url = f"{self.base_url}/deployedServiceFunction"
         try:
-            response = requests.get(url, headers=self._get_headers(), verify=False)
+            response = self._request("GET", url)
             response.raise_for_status()
-            return response.json()
+            return response_json(response)
         except Timeout:
             return {"error": "The request to the external API timed out. Please try again later."}
 
@@ -208,15 +351,62 @@ class PiEdgeAPIClient:
                 "error": f"HTTP error occurred: {http_err}.",
                 "status_code": response.status_code,
             }
+
+    def get_app_instance(self, app_instance_id: str):
+        """
+        Retrieve one app instance by id, without listing all of them.
+        """
+        url = f"{self.base_url}/deployedServiceFunction/" + app_instance_id
+        try:
+            response = self._request("GET", url)
+            response.raise_for_status()
+            return response_json(response)
+        except Timeout:
+            return {"error": "The request to the external API timed out. Please try again later."}
+
+        except ConnectionError:
+            return {"error": "Failed to connect to the external API service. Service might be unavailable."}
+
+        except requests.exceptions.HTTPError as http_err:
+            return {
+                "error": f"HTTP error occurred: {http_err}.",
+                "status_code": response.status_code,
+            }
+
+    def get_app_instances_by_id(self, app_instance_ids: list[str]) -> list:
+        """
+        Retrieve several app instances by id, in parallel on the srm-lookups pool, each in a copy of the caller's context,
+        with at most SRM_LOOKUP_MAX_CONCURRENCY lookups in flight.
+        Returns one result per id, in order: the instance or get_app_instance's error dictionary.
+        """
+        return bounded_map(self.get_app_instance, app_instance_ids, int(config.SRM_LOOKUP_MAX_CONCURRENCY), pool="srm-lookups")
+
+    def iter_app_instances(self):
+        """
+        Stream all app instances, parsing the SRM response incrementally.
+        Unlike get_app_instances, errors are raised, and the listing is neither cached nor coalesced.
+        """
+        url = f"{self.base_url}/deployedServiceFunction"
+        endpoint = srm_endpoint(self.base_url, url)
+        with start_span(f"SRM GET {endpoint}", kind=CLIENT, attributes={"http.request.method": "GET", "url.full": url}) as span:
+            response = self._send("GET", url, stream=True)
+            span.set_attribute("http.response.status_code", response.status_code)
+        with response:
+            response.raise_for_status()
+            parser = JsonArrayParser()
+            for chunk in response.iter_content(chunk_size=config.STREAM_CHUNK_SIZE):
+                yield from parser.feed(chunk)
+            parser.close()
         
 
+    @invalidates_srm_read("/deployedServiceFunction")
     def delete_app_instance(self, app_instance_id:str):
         """
         Remove app instance.
         """
         url = f"{self.base_url}/deployedServiceFunction/"+app_instance_id
         try:
-            response = requests.delete(url, headers=self._get_headers(), verify=False)
+            response = self._request("DELETE", url)
             response.raise_for_status()
             return response
         except Timeout:
@@ -232,44 +422,75 @@ class PiEdgeAPIClient:
             }
 
 
+    @cached_srm_read("/node")
     def edge_cloud_zones(self):
         """
         Get list of edge zones from /node endpoint.
         """
         url = f"{self.base_url}/node"
-        #try:
-        request_headers = self._get_headers()
-        response = requests.get(url, headers=request_headers,verify=False)
-        response.raise_for_status()
-        nodes = response.json()
-        if not nodes:
-            raise ValueError("No edge nodes found")
-        return nodes
+        try:
+            response = self._request("GET", url)
+            response.raise_for_status()
+            nodes = response_json(response)
+            if not nodes:
+                raise ValueError("No edge nodes found")
+            return nodes
+
+        except Timeout:
+            return {"error": "The request to the external API timed out. Please try again later."}
+
+        except ConnectionError:
+            return {"error": "Failed to connect to the external API service. Service might be unavailable."}
 
-        #except Timeout:
-         #   return {"error": "The request to the external API timed out. Please try again later."}
+        except requests.exceptions.HTTPError as http_err:
+            return {
+                "error": f"HTTP error occurred: {http_err}.",
+                "status_code": response.status_code,
+            }
 
-        #except ConnectionError:
-         #   return {"error": "Failed to connect to the external API service. Service might be unavailable."}
+        except ValueError as val_err:
+            return {"error": str(val_err)}
 
-        #except requests.exceptions.HTTPError as http_err:
-         #   return {
-          #      "error": f"HTTP error occurred: {http_err}.",
-           #     "status_code": response.status_code,
-           # }
+        except Exception as err:
+            return {"error": f"An unexpected error occurred: {err}"}
 
-        #except ValueError as val_err:
-         #   return {"error": str(val_err)}
 
-        #except Exception as err:
-         #   return {"error": f"An unexpected error occurred: {err}"}
+def srm_endpoint(base_url: str, url: str) -> str:
+    """
+    Return the route template of an SRM URL: "/serviceFunction" for {base_url}/serviceFunction, and
+    "/serviceFunction/{id}" for {base_url}/serviceFunction/<id>. Calls by id and listings have their own circuit
+    breaker, adaptive read timeout and metrics.
+    """
+    collection, *ids = url.removeprefix(base_url).split("?")[0].strip("/").split("/")
+    return "/" + "/".join([collection, *("{id}" for _ in ids)])
+
+
+def token_lifetime(login_payload: dict, token: str) -> float:
+    """
+    Seconds until the token expires: 'expires_in' from the login response, else the JWT 'exp' claim, else SRM_TOKEN_TTL.
+    """
+    if login_payload.get("expires_in"):
+        return float(login_payload["expires_in"])
+    try:
+        claims_segment = token.split(".")[1]
+        claims = json.loads(base64.urlsafe_b64decode(claims_segment + "=" * (-len(claims_segment) % 4)))
+        return float(claims["exp"]) - time.time()
+    except (IndexError, KeyError, TypeError, ValueError):
+        return float(config.SRM_TOKEN_TTL)
 
 
 class PiEdgeAPIClientFactory:
     """
     Factory class to create instances of PiEdgeAPIClient.
+    Clients are cached per (base_url, username) for the lifetime of the process,
+    so the bearer token obtained by one request is reused by the following ones.
+    A forked worker starts with no cached client, rather than with the parent's tokens and locks.
     """
 
+    _clients: dict[tuple, PiEdgeAPIClient] = {}
+    _clients_pid: int | None = None
+    _clients_lock = threading.Lock()
+
     def __init__(self):
         self.default_base_url = config.SRM_HOST
         self.default_username = config.PI_EDGE_USERNAME
@@ -277,7 +498,7 @@ class PiEdgeAPIClientFactory:
 
     def create_pi_edge_api_client(self, base_url=None, username=None, password=None):
         """
-        Factory method to create a new SRMAPIClient instance.
+        Factory method to get the SRMAPIClient instance for the given SRM and user, creating it on first use.
 
         Args:
             base_url (str): The base URL for the SRM API. If None, the default is used.
@@ -285,7 +506,7 @@ class PiEdgeAPIClientFactory:
             password (str): The password for authentication. If None, the default is used.
 
         Returns:
-            PiEdgeAPIClient: A new instance of the PiEdgeAPIClient.
+            PiEdgeAPIClient: The cached instance of the PiEdgeAPIClient.
         """
         if base_url is None:
             base_url = self.default_base_url
@@ -294,7 +515,26 @@ class PiEdgeAPIClientFactory:
         if password is None:
             password = self.default_password
 
-        return PiEdgeAPIClient(base_url=base_url, username=username, password=password)
+        key = (base_url, username)
+        if PiEdgeAPIClientFactory._clients_pid != os.getpid():
+            # the lock may have been held by another thread of the parent when it forked
+            PiEdgeAPIClientFactory._clients_lock = threading.Lock()
+            PiEdgeAPIClientFactory._clients = {}
+            PiEdgeAPIClientFactory._clients_pid = os.getpid()
+        with self._clients_lock:
+            client = self._clients.get(key)
+            if client is None or client.password != password:
+                client = PiEdgeAPIClient(base_url=base_url, username=username, password=password)
+                self._clients[key] = client
+        return client
+
+    @classmethod
+    def clear_clients(cls):
+        """
+        Forget all cached clients (and their tokens).
+        """
+        with cls._clients_lock:
+            cls._clients.clear()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,214 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from edge_cloud_management_api.configs.env_config import config
+from edge_cloud_management_api.managers.db_manager import MongoManager
+from edge_cloud_management_api.managers.log_manager import logger
+from edge_cloud_management_api.managers.mongo_indexes import apply_indexes
+from edge_cloud_management_api.services.pagination import decode_page_token, encode_page_token
+from edge_cloud_management_api.services.pi_edge_services import PiEdgeAPIClientFactory
+from edge_cloud_management_api.services.srm_cache import get_srm_cache
+
+APPS_COLLECTION = "apps"
+APP_INSTANCES_COLLECTION = "appinstances"
+HASH_FIELD = "_hash"
+# documents are stored as the SRM returns them, plus the bookkeeping fields hidden here
+READ_PROJECTION = {"_id": 0, HASH_FIELD: 0}
+
+
+def content_hash(document: dict) -> str:
+    """
+    Stable digest of a document, used to tell which SRM items changed since the last sync.
+    """
+    return hashlib.sha1(json.dumps(document, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def mirror(db: MongoManager, collection_name: str, items: list[dict], key: str) -> dict:
+    """
+    Make the collection hold exactly the given items, keyed on their key field, with the fewest writes:
+    new and changed items are upserted, items gone from the listing are deleted, unchanged ones are not touched.
+
+    Returns the counts {"upserted": 2, "unchanged": 998, "deleted": 1, "errors": 0}.
+    """
+    existing = {document["_id"]: document.get(HASH_FIELD) for document in db.find_documents(collection_name, {}, projection={HASH_FIELD: 1})}
+    changed = []
+    seen = set()
+    for item in items:
+        if item.get(key) is None:
+            logger.warning(f"Skipping {collection_name} item without {key}: {item}")
+            continue
+        document_id = str(item[key])
+        seen.add(document_id)
+        digest = content_hash(item)
+        if existing.get(document_id) != digest:
+            changed.append({**item, "_id": document_id, HASH_FIELD: digest})
+    removed = [document_id for document_id in existing if document_id not in seen]
+
+    results = db.bulk_upsert(collection_name, changed) + db.bulk_delete(collection_name, removed)
+    errors = sum(len(result["errors"]) for result in results)
+    if errors:
+        logger.warning(f"{errors} write errors while syncing {collection_name}")
+    return {"upserted": len(changed), "unchanged": len(seen) - len(changed), "deleted": len(removed), "errors": errors}
+
+
+def read_listing(collection_name: str, key: str, query: dict | None = None, limit=None, page_token=None):
+    """
+    Read documents of the read model ordered on key, all of them or one page when limit or page_token is given
+    (same tokens as pagination.paginate). Both walk the key indexes of mongo_indexes.MONGO_INDEXES.
+
+    Returns the documents and the token of the next page (None on the last page).
+    """
+    with MongoManager() as db:
+        if limit is None and page_token is None:
+            return list(db.find_documents(collection_name, query or {}, projection=READ_PROJECTION).sort(key, 1)), None
+        documents, next_after = db.find_page(
+            collection_name,
+            query or {},
+            limit or config.PAGE_SIZE_DEFAULT,
+            after=decode_page_token(page_token),
+            sort_key=key,
+            projection=READ_PROJECTION,
+        )
+        return documents, (encode_page_token(next_after) if next_after is not None else None)
+
+
+def read_one(collection_name: str, query: dict) -> dict | None:
+    with MongoManager() as db:
+        return db.find_document(collection_name, query, projection=READ_PROJECTION)
+
+
+def app_instance_query(app_id=None, app_instance_ids=None, region=None) -> dict:
+    query = {}
+    if app_id:
+        query["appId"] = app_id
+    if app_instance_ids:
+        query["appInstanceId"] = app_instance_ids[0] if len(app_instance_ids) == 1 else {"$in": list(app_instance_ids)}
+    if region:
+        query["edgeCloudZone.edgeCloudRegion"] = region
+    return query
+
+
+def fetch_srm_listing(endpoint: str, read) -> list[dict]:
+    """
+    Read an SRM listing bypassing the read cache. Raises on SRM errors, so that a failed read never empties the mirror.
+    """
+    api_client = PiEdgeAPIClientFactory().create_pi_edge_api_client()
+    get_srm_cache().invalidate(api_client.cache_scope, endpoint)
+    result = read(api_client)
+    if not isinstance(result, list):
+        raise RuntimeError(f"SRM error on {endpoint}: {result}")
+    return result
+
+
+def sync_read_model(db: MongoManager) -> dict:
+    """
+    Mirror the SRM catalogue and deployed instances into the apps and appinstances collections.
+    """
+    apps = fetch_srm_listing("/serviceFunction", lambda client: client.get_service_functions_catalogue())
+    instances = fetch_srm_listing("/deployedServiceFunction", lambda client: client.get_app_instances())
+    return {
+        APPS_COLLECTION: mirror(db, APPS_COLLECTION, apps, key="appId"),
+        APP_INSTANCES_COLLECTION: mirror(db, APP_INSTANCES_COLLECTION, instances, key="appInstanceId"),
+    }
+
+
+class ReadModelSync:
+    """
+    Keep the Mongo read model in sync with the SRM from a background thread: every `interval` seconds,
+    and as soon as possible after a write through this API (trigger()).
+
+    GET handlers read from Mongo once a sync of this process succeeded, and from the SRM until then: the first read
+    of a process waits for one sync attempt, and a failed one must not answer from an empty or outdated database.
+
+    Example:
+        if read_model_sync.ready():
+            apps, _ = read_listing(APPS_COLLECTION, "appId")
+    """
+
+    def __init__(self, interval: float, syncer=sync_read_model):
+        self.interval = interval
+        self.syncer = syncer
+        self.failures = 0
+        self.last_result: dict | None = None
+        self.synced_at: float | None = None
+        self._attempted = False
+        self._indexed = False
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._pid: int | None = None
+
+    def sync(self, only_if_never: bool = False) -> dict | None:
+        """
+        Run one sync; failures are logged and counted, the read model then keeps its previous content.
+        """
+        with self._sync_lock:
+            if only_if_never and self._attempted:
+                return self.last_result
+            self._attempted = True
+            try:
+                with MongoManager() as db:
+                    if not self._indexed:
+                        apply_indexes(db)
+                        self._indexed = True
+                    self.last_result = self.syncer(db)
+            except Exception as err:
+                self.failures += 1
+                logger.warning(f"Read model sync failed, serving the last synced data: {err}")
+                return None
+            self.synced_at = time.monotonic()
+            logger.debug(f"Read model synced: {self.last_result}")
+            return self.last_result
+
+    def ready(self) -> bool:
+        """
+        Start the background sync if needed and wait for the first sync attempt of this process.
+        Returns whether a sync of this process succeeded, i.e. whether the read model can be served.
+        """
+        self.start()
+        if not self._attempted:
+            self.sync(only_if_never=True)
+        return self.synced_at is not None
+
+    def trigger(self):
+        """
+        Ask for a sync now, e.g. after a write to the SRM.
+        """
+        self.start()
+        self._wake.set()
+
+    def start(self):
+        """
+        Start the sync thread, once per process (a forked worker starts its own).
+        """
+        if self._pid == os.getpid() and self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._pid == os.getpid() and self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="read-model-sync", daemon=True)
+            self._pid = os.getpid()
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=self.interval)
+        self._thread = None
+
+    def _run(self):
+        self.sync(only_if_never=True)
+        while not self._stop.is_set():
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            if not self._stop.is_set():
+                self.sync()
+
+
+read_model_sync = ReadModelSync(interval=config.READ_MODEL_SYNC_INTERVAL)
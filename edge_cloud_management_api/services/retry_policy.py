@@ -0,0 +1,215 @@
+import asyncio
+import contextlib
+import contextvars
+import random
+import threading
+import time
+from collections import deque
+from edge_cloud_management_api.configs.env_config import config
+from edge_cloud_management_api.managers.log_manager import logger
+from edge_cloud_management_api.managers.metrics_manager import MetricFamily, registry
+from edge_cloud_management_api.services.circuit_breaker import CircuitOpenError
+
+# only these SRM calls can be sent twice without changing the outcome
+IDEMPOTENT_METHODS = frozenset({"GET", "DELETE"})
+RETRYABLE_STATUS_CODES = frozenset({429, 502, 503, 504})
+
+_deadline: contextvars.ContextVar[float | None] = contextvars.ContextVar("srm_deadline", default=None)
+
+
+@contextlib.contextmanager
+def deadline_scope(seconds: float):
+    """
+    Run the block with a deadline `seconds` from now (time.monotonic), or with the enclosing deadline if it is earlier.
+    SRM calls made in the block neither wait nor retry past it.
+
+    Example:
+        with deadline_scope(1.5):
+            api_client.edge_cloud_zones()
+    """
+    deadline = time.monotonic() + seconds
+    enclosing = _deadline.get()
+    if enclosing is not None:
+        deadline = min(deadline, enclosing)
+    token = _deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _deadline.reset(token)
+
+
+def remaining_time() -> float | None:
+    """
+    Seconds left before the current deadline, or None outside of a deadline_scope.
+    """
+    deadline = _deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+class RetryBudget:
+    """
+    Caps retries at `ratio` of the requests seen over the last `window` seconds, plus min_per_second x window,
+    so that retries add at most that share of extra load on an SRM that is failing for everybody.
+    """
+
+    def __init__(self, ratio: float = 0.1, min_per_second: float = 1.0, window: float = 10.0, clock=time.monotonic):
+        self.ratio = ratio
+        self.min_per_second = min_per_second
+        self.window = window
+        self._clock = clock
+        self._requests: deque[float] = deque()
+        self._retries: deque[float] = deque()
+        self._exhausted = 0
+        self._lock = threading.Lock()
+
+    def _prune(self, now):
+        for events in (self._requests, self._retries):
+            while events and events[0] <= now - self.window:
+                events.popleft()
+
+    def record_request(self):
+        with self._lock:
+            now = self._clock()
+            self._prune(now)
+            self._requests.append(now)
+
+    def try_spend(self) -> bool:
+        """
+        Take one retry from the budget; False when it is exhausted.
+        """
+        with self._lock:
+            now = self._clock()
+            self._prune(now)
+            if len(self._retries) >= self.ratio * len(self._requests) + self.min_per_second * self.window:
+                self._exhausted += 1
+                return False
+            self._retries.append(now)
+            return True
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            self._prune(self._clock())
+            return {"requests": len(self._requests), "retries": len(self._retries), "exhausted": self._exhausted}
+
+    def reset(self):
+        with self._lock:
+            self._requests.clear()
+            self._retries.clear()
+            self._exhausted = 0
+
+
+class RetryPolicy:
+    """
+    Retries with full-jitter exponential backoff: the n-th retry waits a random time in [0, min(max_delay, base_delay x 2^(n-1))].
+    A retry is only made while attempts remain, the wait ends before the current deadline and the budget allows it.
+    """
+
+    def __init__(self, max_attempts: int, base_delay: float, max_delay: float, budget: RetryBudget, rng=random.random):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.budget = budget
+        self._rng = rng
+
+    def backoff(self, attempt: int) -> float:
+        return self._rng() * min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+
+    def next_delay(self, attempt: int) -> float | None:
+        """
+        Delay before retrying after the given (1-based) failed attempt, or None to give up.
+        """
+        if attempt >= self.max_attempts:
+            return None
+        delay = self.backoff(attempt)
+        remaining = remaining_time()
+        if remaining is not None and delay >= remaining:
+            return None
+        if not self.budget.try_spend():
+            logger.warning("SRM retry budget exhausted, not retrying")
+            return None
+        return delay
+
+
+srm_retry_budget = RetryBudget(
+    ratio=float(config.SRM_RETRY_BUDGET_RATIO),
+    min_per_second=float(config.SRM_RETRY_BUDGET_MIN_PER_SECOND),
+    window=float(config.SRM_RETRY_BUDGET_WINDOW),
+)
+
+
+@registry.add_collector
+def srm_retry_budget_metrics() -> list[MetricFamily]:
+    snapshot = srm_retry_budget.snapshot()
+    window = MetricFamily("oeg_srm_retry_budget_window", "gauge", "SRM requests and retries within the retry budget window", ("kind",))
+    window.add(snapshot["requests"], "requests").add(snapshot["retries"], "retries")
+    exhausted = MetricFamily("oeg_srm_retry_budget_exhausted_total", "counter", "Retries refused because the retry budget was exhausted")
+    return [window, exhausted.add(snapshot["exhausted"])]
+
+
+def srm_retry_policy() -> RetryPolicy:
+    return RetryPolicy(
+        max_attempts=int(config.SRM_RETRY_MAX_ATTEMPTS),
+        base_delay=float(config.SRM_RETRY_BASE_DELAY),
+        max_delay=float(config.SRM_RETRY_MAX_DELAY),
+        budget=srm_retry_budget,
+    )
+
+
+def call_with_retries(send, retryable_errors: tuple, policy: RetryPolicy | None = None, label: str = "SRM call"):
+    """
+    Call send() until it returns a response whose status is not in RETRYABLE_STATUS_CODES, or raises an error that is not
+    one of retryable_errors, or the policy gives up. The last response is returned and the last error raised.
+    An open circuit is never retried. Only meant for idempotent requests.
+    """
+    policy = policy or srm_retry_policy()
+    policy.budget.record_request()
+    attempt = 1
+    while True:
+        try:
+            response = send()
+        except retryable_errors as err:
+            if isinstance(err, CircuitOpenError):
+                raise
+            delay = policy.next_delay(attempt)
+            if delay is None:
+                raise
+            logger.info(f"{label} attempt {attempt} failed ({type(err).__name__}), retrying in {delay:.2f}s")
+        else:
+            if response.status_code not in RETRYABLE_STATUS_CODES:
+                return response
+            delay = policy.next_delay(attempt)
+            if delay is None:
+                return response
+            logger.info(f"{label} attempt {attempt} answered {response.status_code}, retrying in {delay:.2f}s")
+            response.close()
+        time.sleep(delay)
+        attempt += 1
+
+
+async def async_call_with_retries(send, retryable_errors: tuple, policy: RetryPolicy | None = None, label: str = "SRM call"):
+    """
+    asyncio counterpart of call_with_retries; send is a coroutine function.
+    """
+    policy = policy or srm_retry_policy()
+    policy.budget.record_request()
+    attempt = 1
+    while True:
+        try:
+            response = await send()
+        except retryable_errors as err:
+            if isinstance(err, CircuitOpenError):
+                raise
+            delay = policy.next_delay(attempt)
+            if delay is None:
+                raise
+            logger.info(f"{label} attempt {attempt} failed ({type(err).__name__}), retrying in {delay:.2f}s")
+        else:
+            if response.status_code not in RETRYABLE_STATUS_CODES:
+                return response
+            delay = policy.next_delay(attempt)
+            if delay is None:
+                return response
+            logger.info(f"{label} attempt {attempt} answered {response.status_code}, retrying in {delay:.2f}s")
+            await response.aclose()
+        await asyncio.sleep(delay)
+        attempt += 1
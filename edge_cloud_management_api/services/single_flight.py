@@ -0,0 +1,95 @@
+import asyncio
+import threading
+from concurrent.futures import Future
+
+
+class SingleFlightStats:
+    """
+    Counters shared by every single-flight group: upstream calls made and callers that joined an in-flight call instead.
+    """
+
+    def __init__(self):
+        self._counters: dict[str, dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, label: str, leader: bool):
+        with self._lock:
+            counters = self._counters.setdefault(label, {"calls": 0, "collapsed": 0})
+            counters["calls" if leader else "collapsed"] += 1
+
+    def snapshot(self) -> dict[str, dict[str, int]]:
+        with self._lock:
+            return {label: dict(counters) for label, counters in self._counters.items()}
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+
+
+single_flight_stats = SingleFlightStats()
+
+
+class SingleFlight:
+    """
+    Collapse concurrent identical calls made from worker threads into one.
+
+    The first caller for a key (the leader) runs the function; callers arriving while it is in flight
+    wait for it and receive the same result or exception.
+
+    Example:
+        group = SingleFlight()
+        nodes = group.do(("GET", url, principal), lambda: session.get(url))
+    """
+
+    def __init__(self, stats: SingleFlightStats = single_flight_stats):
+        self.stats = stats
+        self._in_flight: dict = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, fn, label: str = "default"):
+        with self._lock:
+            future = self._in_flight.get(key)
+            leader = future is None
+            if future is None:
+                future = self._in_flight[key] = Future()
+        self.stats.record(label, leader)
+
+        if not leader:
+            return future.result()
+        try:
+            result = fn()
+        except BaseException as err:
+            future.set_exception(err)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+
+
+class AsyncSingleFlight:
+    """
+    asyncio counterpart of SingleFlight, for coroutines running on one event loop.
+    The shared call runs as its own task, so a cancelled caller does not cancel it for the others.
+    """
+
+    def __init__(self, stats: SingleFlightStats = single_flight_stats):
+        self.stats = stats
+        self._in_flight: dict = {}
+
+    async def do(self, key, coro_fn, label: str = "default"):
+        task = self._in_flight.get(key)
+        leader = task is None
+        if task is None:
+            task = self._in_flight[key] = asyncio.ensure_future(coro_fn())
+            task.add_done_callback(lambda done: self._forget(key, done))
+        self.stats.record(label, leader)
+        return await asyncio.shield(task)
+
+    def _forget(self, key, task):
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        if not task.cancelled():
+            task.exception()  # mark as retrieved even if every caller went away
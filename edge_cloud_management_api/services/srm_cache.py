@@ -0,0 +1,346 @@
+import functools
+import inspect
+import threading
+import time
+from collections import OrderedDict
+from edge_cloud_management_api.configs.env_config import config
+from edge_cloud_management_api.managers.json_provider import dumps, loads
+from edge_cloud_management_api.services.circuit_breaker import srm_circuits
+from edge_cloud_management_api.managers.log_manager import logger
+from edge_cloud_management_api.managers.metrics_manager import MetricFamily, registry
+
+
+class CacheBackend:
+    """
+    Interface of the SRM cache storage. Values must be JSON-serializable and are treated as read-only by callers.
+    """
+
+    def get(self, key: str):
+        """
+        Return (True, value) on a hit and (False, None) on a miss or an expired entry.
+        """
+        raise NotImplementedError
+
+    def set(self, key: str, value, ttl: float):
+        raise NotImplementedError
+
+    def delete(self, key: str):
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+
+class InMemoryTTLCache(CacheBackend):
+    """
+    Process-local LRU cache whose entries also expire after their TTL.
+    """
+
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self._entries: OrderedDict[str, tuple[float, object]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+            expires_at, value = entry
+            if time.monotonic() >= expires_at:
+                del self._entries[key]
+                return False, None
+            self._entries.move_to_end(key)
+            return True, value
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class RedisCache(CacheBackend):
+    """
+    Cache shared by all workers through a Redis-compatible server (Redis, Valkey, KeyDB, ...).
+    Requires the optional 'redis' package.
+    """
+
+    def __init__(self, url: str, key_prefix: str = "oeg:srm:"):
+        try:
+            import redis
+        except ImportError as err:
+            raise RuntimeError("SRM_CACHE_BACKEND=redis requires the 'redis' package to be installed") from err
+        self.client = redis.Redis.from_url(url)
+        self.key_prefix = key_prefix
+
+    def get(self, key):
+        raw = self.client.get(self.key_prefix + key)
+        if raw is None:
+            return False, None
+        return True, loads(raw)
+
+    def set(self, key, value, ttl):
+        self.client.set(self.key_prefix + key, dumps(value), px=int(ttl * 1000))
+
+    def delete(self, key):
+        self.client.delete(self.key_prefix + key)
+
+    def clear(self):
+        keys = list(self.client.scan_iter(match=self.key_prefix + "*"))
+        if keys:
+            self.client.delete(*keys)
+
+
+class SrmCache:
+    """
+    Read-through cache for SRM listings with a TTL per endpoint and hit/miss counters.
+
+    Entries are scoped per SRM and user, so that clients with different credentials never see each other's data.
+    Error dictionaries returned by the clients are never cached.
+
+    The last value stored per key is also kept in process, past its TTL, to answer while the SRM endpoint's circuit
+    is open (see last_good).
+    """
+
+    def __init__(self, backend: CacheBackend, ttls: dict[str, float]):
+        self.backend = backend
+        self.ttls = ttls
+        self._counters = {endpoint: {"hits": 0, "misses": 0} for endpoint in ttls}
+        self._counters_lock = threading.Lock()
+        self._last_good: dict[str, object] = {}
+
+    @staticmethod
+    def key(scope: tuple, endpoint: str) -> str:
+        return "|".join(str(part) for part in scope) + "|" + endpoint
+
+    def enabled(self, endpoint: str) -> bool:
+        return self.ttls.get(endpoint, 0) > 0
+
+    def _count(self, endpoint, counter):
+        with self._counters_lock:
+            self._counters.setdefault(endpoint, {"hits": 0, "misses": 0})[counter] += 1
+
+    def lookup(self, scope: tuple, endpoint: str):
+        """
+        Return (hit, value) and update the counters. Backend failures count as misses.
+        """
+        try:
+            hit, value = self.backend.get(self.key(scope, endpoint))
+        except Exception as err:
+            logger.warning(f"SRM cache lookup failed for {endpoint}: {err}")
+            hit, value = False, None
+        self._count(endpoint, "hits" if hit else "misses")
+        return hit, value
+
+    def store(self, scope: tuple, endpoint: str, value):
+        """
+        Cache the value, and keep it as the endpoint's last good value even when its caching is disabled.
+        """
+        if isinstance(value, dict) and "error" in value:
+            return
+        self._last_good[self.key(scope, endpoint)] = value
+        if not self.enabled(endpoint):
+            return
+        try:
+            self.backend.set(self.key(scope, endpoint), value, self.ttls[endpoint])
+        except Exception as err:
+            logger.warning(f"SRM cache store failed for {endpoint}: {err}")
+
+    def invalidate(self, scope: tuple, endpoint: str):
+        try:
+            self.backend.delete(self.key(scope, endpoint))
+        except Exception as err:
+            logger.warning(f"SRM cache invalidation failed for {endpoint}: {err}")
+
+    def last_good(self, scope: tuple, endpoint: str):
+        """
+        Return (True, value) with the last value stored for the key, however old, or (False, None).
+        """
+        key = self.key(scope, endpoint)
+        return (True, self._last_good[key]) if key in self._last_good else (False, None)
+
+    def stats(self) -> dict[str, dict[str, int]]:
+        """
+        Hit/miss counters per endpoint since start-up.
+        """
+        with self._counters_lock:
+            return {endpoint: dict(counters) for endpoint, counters in self._counters.items()}
+
+    def clear(self):
+        self.backend.clear()
+        self._last_good.clear()
+
+
+def build_srm_cache() -> SrmCache:
+    """
+    Build the SRM cache selected by SRM_CACHE_BACKEND ("memory", "redis" or "none").
+    The memory cache is turned off with more than one worker (SERVER_WORKERS): a write invalidates the cache of the
+    worker that handled it only, and the other workers would serve the old listings for the whole TTL.
+    """
+    ttls = {
+        "/serviceFunction": config.SRM_CACHE_TTL_SERVICE_FUNCTION,
+        "/node": config.SRM_CACHE_TTL_NODE,
+        "/deployedServiceFunction": config.SRM_CACHE_TTL_DEPLOYED_SERVICE_FUNCTION,
+    }
+    backend_name = (config.SRM_CACHE_BACKEND or "none").lower()
+    backend: CacheBackend
+    if backend_name == "memory" and int(config.SERVER_WORKERS) > 1:
+        logger.warning(f"SRM_CACHE_BACKEND=memory is not shared by the {config.SERVER_WORKERS} workers, SRM reads are not cached; use redis")
+        backend_name = "none"
+    if backend_name == "redis":
+        backend = RedisCache(config.SRM_CACHE_REDIS_URL)
+    elif backend_name == "memory":
+        backend = InMemoryTTLCache(maxsize=config.SRM_CACHE_MAXSIZE)
+    else:
+        backend = InMemoryTTLCache(maxsize=config.SRM_CACHE_MAXSIZE)
+        ttls = {endpoint: 0 for endpoint in ttls}
+    return SrmCache(backend, ttls)
+
+
+_srm_cache = None
+_srm_cache_lock = threading.Lock()
+
+
+def get_srm_cache() -> SrmCache:
+    """
+    Return the process-wide SRM cache, creating it on first use.
+    """
+    global _srm_cache
+    if _srm_cache is None:
+        with _srm_cache_lock:
+            if _srm_cache is None:
+                _srm_cache = build_srm_cache()
+    return _srm_cache
+
+
+def set_srm_cache(cache: SrmCache | None):
+    """
+    Replace the process-wide SRM cache (None rebuilds it from the configuration on next use).
+    """
+    global _srm_cache
+    with _srm_cache_lock:
+        _srm_cache = cache
+
+
+@registry.add_collector
+def srm_cache_metrics() -> list[MetricFamily]:
+    """
+    Hit/miss counters of the SRM cache, once it has been built.
+    """
+    family = MetricFamily("oeg_srm_cache_lookups_total", "counter", "SRM cache lookups per endpoint and result", ("endpoint", "result"))
+    cache = _srm_cache
+    if cache is not None:
+        for endpoint, counters in sorted(cache.stats().items()):
+            family.add(counters["hits"], endpoint, "hit").add(counters["misses"], endpoint, "miss")
+    return [family]
+
+
+def circuit_fallback(client, cache: SrmCache, endpoint: str):
+    """
+    Return (True, value) with the last good value of the endpoint when its circuit is open, else (False, None).
+    """
+    base_url = getattr(client, "base_url", "")
+    if not srm_circuits.rejecting(base_url, "GET", endpoint):
+        return False, None
+    found, value = cache.last_good(client.cache_scope, endpoint)
+    if found:
+        logger.info(f"Circuit open for GET {base_url}{endpoint}, serving the last cached value")
+        srm_circuits.guard(base_url, "GET", endpoint).breaker.record_fallback()
+    return found, value
+
+
+def cached_srm_read(endpoint: str):
+    """
+    Decorator for client methods that list an SRM endpoint: serve them from the SRM cache when fresh.
+    While the endpoint's circuit is open, the last good value is served instead of an error, however old it is,
+    also for an endpoint whose caching is disabled. Works on both PiEdgeAPIClient and AsyncPiEdgeAPIClient methods.
+    """
+
+    def failed(value):
+        return isinstance(value, dict) and "error" in value
+
+    def decorator(method):
+        if inspect.iscoroutinefunction(method):
+
+            @functools.wraps(method)
+            async def async_wrapper(self, *args, **kwargs):
+                cache = get_srm_cache()
+                hit, value = cache.lookup(self.cache_scope, endpoint) if cache.enabled(endpoint) else (False, None)
+                if not hit:
+                    hit, value = circuit_fallback(self, cache, endpoint)
+                if hit:
+                    return value
+                try:
+                    value = await method(self, *args, **kwargs)
+                except Exception:
+                    # this call may have opened the circuit
+                    hit, value = circuit_fallback(self, cache, endpoint)
+                    if hit:
+                        return value
+                    raise
+                if failed(value):
+                    hit, stale = circuit_fallback(self, cache, endpoint)
+                    return stale if hit else value
+                cache.store(self.cache_scope, endpoint, value)
+                return value
+
+            return async_wrapper
+
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            cache = get_srm_cache()
+            hit, value = cache.lookup(self.cache_scope, endpoint) if cache.enabled(endpoint) else (False, None)
+            if not hit:
+                hit, value = circuit_fallback(self, cache, endpoint)
+            if hit:
+                return value
+            value = method(self, *args, **kwargs)
+            if failed(value):
+                # this call may have opened the circuit
+                hit, stale = circuit_fallback(self, cache, endpoint)
+                return stale if hit else value
+            cache.store(self.cache_scope, endpoint, value)
+            return value
+
+        return wrapper
+
+    return decorator
+
+
+def invalidates_srm_read(endpoint: str):
+    """
+    Decorator for client methods that modify an SRM endpoint: drop its cached listing once the call returns.
+    """
+
+    def decorator(method):
+        if inspect.iscoroutinefunction(method):
+
+            @functools.wraps(method)
+            async def async_wrapper(self, *args, **kwargs):
+                try:
+                    return await method(self, *args, **kwargs)
+                finally:
+                    get_srm_cache().invalidate(self.cache_scope, endpoint)
+
+            return async_wrapper
+
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                get_srm_cache().invalidate(self.cache_scope, endpoint)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,190 @@
+import asyncio
+import os
+import socket
+import threading
+import weakref
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+from edge_cloud_management_api.configs.env_config import config
+from edge_cloud_management_api.managers.metrics_manager import MetricFamily, registry
+
+
+class KeepAliveHTTPAdapter(HTTPAdapter):
+    """
+    HTTPAdapter that enables TCP keep-alive probes on the pooled sockets,
+    so idle connections to the SRM are not silently dropped by middleboxes.
+    """
+
+    def __init__(self, *args, tcp_keepalive=True, **kwargs):
+        self.tcp_keepalive = tcp_keepalive
+        super().__init__(*args, **kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        if self.tcp_keepalive:
+            kwargs["socket_options"] = keepalive_socket_options()
+        super().init_poolmanager(*args, **kwargs)
+
+    def proxy_manager_for(self, *args, **kwargs):
+        if self.tcp_keepalive:
+            kwargs["socket_options"] = keepalive_socket_options()
+        return super().proxy_manager_for(*args, **kwargs)
+
+
+def keepalive_socket_options():
+    """
+    Default urllib3 socket options plus SO_KEEPALIVE (and the Linux idle/interval knobs where available).
+    """
+    options = list(HTTPConnection.default_socket_options)
+    options.append((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1))
+    if hasattr(socket, "TCP_KEEPIDLE"):
+        options.append((socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, 60))
+    if hasattr(socket, "TCP_KEEPINTVL"):
+        options.append((socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, 15))
+    return options
+
+
+def build_srm_session(
+    pool_connections=None,
+    pool_maxsize=None,
+    pool_block=None,
+    tcp_keepalive=None,
+    proxy=None,
+) -> requests.Session:
+    """
+    Build a requests.Session with a tuned connection pool towards the SRM.
+
+    Args:
+        pool_connections (int): Number of per-host pools to cache. If None, the configured value is used.
+        pool_maxsize (int): Maximum number of kept-alive connections per host. If None, the configured value is used.
+        pool_block (bool): Block when the pool is exhausted instead of opening throwaway connections.
+        tcp_keepalive (bool): Enable TCP keep-alive probes on pooled sockets.
+        proxy (str): Proxy URL used for both http and https. If None, HTTP_PROXY from the configuration is used.
+
+    Returns:
+        requests.Session: A session that reuses connections across requests.
+    """
+    adapter = KeepAliveHTTPAdapter(
+        pool_connections=config.SRM_POOL_CONNECTIONS if pool_connections is None else pool_connections,
+        pool_maxsize=config.SRM_POOL_MAXSIZE if pool_maxsize is None else pool_maxsize,
+        pool_block=config.SRM_POOL_BLOCK if pool_block is None else pool_block,
+        tcp_keepalive=config.SRM_TCP_KEEPALIVE if tcp_keepalive is None else tcp_keepalive,
+    )
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+
+    proxy = config.HTTP_PROXY if proxy is None else proxy
+    if proxy:
+        session.proxies.update({"http": proxy, "https": proxy})
+    return session
+
+
+_session = None
+_session_pid = None
+_session_lock = threading.Lock()
+
+
+def get_srm_session() -> requests.Session:
+    """
+    Return the process-wide SRM session, creating it on first use.
+    A forked child gets its own session instead of sharing the parent's sockets.
+    """
+    global _session, _session_pid
+    if _session is None or _session_pid != os.getpid():
+        with _session_lock:
+            if _session is None or _session_pid != os.getpid():
+                _session = build_srm_session()
+                _session_pid = os.getpid()
+    return _session
+
+
+def close_srm_session():
+    """
+    Close the process-wide SRM session and release its pooled connections.
+    """
+    global _session, _session_pid
+    with _session_lock:
+        if _session is not None and _session_pid == os.getpid():
+            _session.close()
+        _session = None
+        _session_pid = None
+
+
+@registry.add_collector
+def srm_pool_metrics() -> list[MetricFamily]:
+    """
+    Connections of the process-wide SRM session per host: idle in the pool, checked out, and opened since start-up.
+    """
+    connections = MetricFamily("oeg_srm_http_pool_connections", "gauge", "Pooled SRM connections per host and state", ("host", "state"))
+    opened = MetricFamily("oeg_srm_http_connections_opened_total", "counter", "SRM connections opened per host", ("host",))
+    session = _session if _session_pid == os.getpid() else None
+    # one adapter is mounted for both http:// and https://
+    adapters = {id(adapter): adapter for adapter in session.adapters.values()} if session is not None else {}
+    for adapter in adapters.values():
+        pools = adapter.poolmanager.pools
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is None or pool.pool is None:
+                continue
+            host = f"{pool.scheme}://{pool.host}:{pool.port}"
+            queued = list(pool.pool.queue)
+            connections.add(sum(connection is not None for connection in queued), host, "idle")
+            connections.add(max(0, pool.pool.maxsize - len(queued)), host, "in_use")
+            opened.add(pool.num_connections, host)
+    return [connections, opened]
+
+
+def get_srm_timeout() -> tuple[float, float]:
+    """
+    (connect, read) timeout applied to every SRM call.
+    """
+    return (config.SRM_CONNECT_TIMEOUT, config.SRM_READ_TIMEOUT)
+
+
+def build_async_srm_client(max_connections=None, max_keepalive_connections=None, proxy=None) -> httpx.AsyncClient:
+    """
+    Build an httpx.AsyncClient with a connection pool towards the SRM, the asyncio counterpart of build_srm_session.
+
+    Args:
+        max_connections (int): Upper bound of concurrent connections. If None, SRM_ASYNC_MAX_CONNECTIONS is used.
+        max_keepalive_connections (int): Idle connections kept open for reuse. If None, SRM_POOL_MAXSIZE is used.
+        proxy (str): Proxy URL. If None, HTTP_PROXY from the configuration is used.
+
+    Returns:
+        httpx.AsyncClient: A client that reuses connections across requests.
+    """
+    limits = httpx.Limits(
+        max_connections=config.SRM_ASYNC_MAX_CONNECTIONS if max_connections is None else max_connections,
+        max_keepalive_connections=config.SRM_POOL_MAXSIZE if max_keepalive_connections is None else max_keepalive_connections,
+        keepalive_expiry=config.SRM_KEEPALIVE_EXPIRY,
+    )
+    timeout = httpx.Timeout(config.SRM_READ_TIMEOUT, connect=config.SRM_CONNECT_TIMEOUT)
+    proxy = config.HTTP_PROXY if proxy is None else proxy
+    return httpx.AsyncClient(limits=limits, timeout=timeout, proxy=proxy or None, verify=False)
+
+
+# httpx.AsyncClient is bound to the event loop it was first used on, so keep one per loop
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+
+
+def get_async_srm_client() -> httpx.AsyncClient:
+    """
+    Return the SRM AsyncClient of the running event loop, creating it on first use.
+    """
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None or client.is_closed:
+        client = build_async_srm_client()
+        _async_clients[loop] = client
+    return client
+
+
+async def aclose_async_srm_client():
+    """
+    Close the SRM AsyncClient of the running event loop.
+    """
+    client = _async_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
@@ -0,0 +1,124 @@
+import os
+import threading
+import time
+from edge_cloud_management_api.managers.log_manager import logger
+
+
+class ZonesUnavailable(Exception):
+    """
+    No zone snapshot was ever loaded: the first load failed, so there are no zones to serve, not even stale ones.
+    """
+
+
+class ZoneSnapshot:
+    """
+    Materialized list of edge cloud zones, as fetched at a given time.
+    A snapshot is stale when the latest refresh failed and it is being served in place of fresh data.
+    """
+
+    def __init__(self, zones: list[dict], fetched_at: float, stale: bool = False):
+        self.zones = zones
+        self.fetched_at = fetched_at
+        self.stale = stale
+
+    @property
+    def age(self) -> float:
+        """
+        Seconds since the zones were fetched.
+        """
+        return max(0.0, time.monotonic() - self.fetched_at)
+
+    def mark_stale(self) -> "ZoneSnapshot":
+        return ZoneSnapshot(self.zones, self.fetched_at, stale=True)
+
+
+class ZoneRefresher:
+    """
+    Keep a zone snapshot warm by calling the loader every `interval` seconds on a background thread (stale-while-revalidate).
+
+    Readers get the latest snapshot immediately. When the loader fails, the last good snapshot keeps being served and is
+    marked stale. Only the very first read waits for the loader; it raises ZonesUnavailable when the loader fails and
+    there is no previous snapshot to fall back on.
+
+    Example:
+        refresher = ZoneRefresher(lambda: fetch_local_zones(fresh=True), interval=15)
+        zones = refresher.get().zones
+    """
+
+    def __init__(self, loader, interval: float):
+        self.loader = loader
+        self.interval = interval
+        self.failures = 0
+        self.last_error: Exception | None = None
+        self._snapshot: ZoneSnapshot | None = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._pid: int | None = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.interval > 0
+
+    @property
+    def current(self) -> ZoneSnapshot | None:
+        """
+        The latest snapshot, or None before the first successful refresh.
+        """
+        return self._snapshot
+
+    def refresh(self) -> ZoneSnapshot | None:
+        """
+        Call the loader once and publish its result; on failure keep (and mark stale) the previous snapshot.
+        """
+        try:
+            zones = self.loader()
+        except Exception as err:
+            self.failures += 1
+            self.last_error = err
+            logger.warning(f"Zone refresh failed, serving the last good snapshot: {err}")
+            if self._snapshot is not None:
+                self._snapshot = self._snapshot.mark_stale()
+            return self._snapshot
+        self._snapshot = ZoneSnapshot(zones, time.monotonic())
+        return self._snapshot
+
+    def get(self) -> ZoneSnapshot:
+        """
+        Return the latest snapshot, loading it synchronously on first use. Starts the background refresh if needed.
+        Raises ZonesUnavailable while no load has succeeded yet.
+        """
+        self.start()
+        snapshot = self._snapshot
+        if snapshot is None:
+            with self._lock:
+                snapshot = self._snapshot or self.refresh()
+        if snapshot is None:
+            raise ZonesUnavailable(f"Edge cloud zones are not available yet: {self.last_error}")
+        return snapshot
+
+    def start(self):
+        """
+        Start the refresh thread, once per process (a forked worker starts its own). No-op when the interval is 0.
+        """
+        if not self.enabled:
+            return
+        if self._pid == os.getpid() and self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._pid == os.getpid() and self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="zone-refresher", daemon=True)
+            self._pid = os.getpid()
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=self.interval)
+        self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.refresh()
@@ -0,0 +1,76 @@
+import threading
+from edge_cloud_management_api.managers.log_manager import logger
+
+
+class ZoneStore:
+    """
+    Pre-validated edge cloud zones indexed by id, region, status and (region, status).
+
+    Zones are validated once when the store is built; invalid zones are logged and left out.
+    Queries are dictionary lookups and return shared lists, which callers must not modify.
+
+    Example:
+        store = ZoneStore(zones, validate=lambda zone: EdgeCloudZone(**zone).model_dump())
+        store.query(region="Region1", status="active")
+    """
+
+    def __init__(self, zones: list[dict], validate=None):
+        self.zones: list[dict] = []
+        self._by_id: dict[str, dict] = {}
+        self._by_region: dict[str | None, list[dict]] = {}
+        self._by_status: dict[str | None, list[dict]] = {}
+        self._by_region_status: dict[tuple, list[dict]] = {}
+
+        for zone in zones:
+            if validate is not None:
+                try:
+                    zone = validate(zone)
+                except Exception as err:
+                    logger.warning(f"Skipping invalid edge cloud zone {zone.get('edgeCloudZoneId')}: {err}")
+                    continue
+            region, status = zone.get("edgeCloudRegion"), zone.get("edgeCloudZoneStatus")
+            self.zones.append(zone)
+            self._by_id[zone["edgeCloudZoneId"]] = zone
+            self._by_region.setdefault(region, []).append(zone)
+            self._by_status.setdefault(status, []).append(zone)
+            self._by_region_status.setdefault((region, status), []).append(zone)
+
+    def __len__(self):
+        return len(self.zones)
+
+    def get(self, zone_id: str) -> dict | None:
+        return self._by_id.get(zone_id)
+
+    def query(self, region: str | None = None, status: str | None = None) -> list[dict]:
+        """
+        Zones matching the region and status; a None criterion matches every zone.
+        """
+        if region is None and status is None:
+            return self.zones
+        if status is None:
+            return self._by_region.get(region, [])
+        if region is None:
+            return self._by_status.get(status, [])
+        return self._by_region_status.get((region, status), [])
+
+
+_last_store: tuple[list, ZoneStore] | None = None
+_last_store_lock = threading.Lock()
+
+
+def zone_store_for(zones: list[dict], validate=None) -> ZoneStore:
+    """
+    Return the ZoneStore of a zone list, reusing the previous one while the same list (e.g. the current zone snapshot)
+    is passed in, so the zones are validated and indexed once per snapshot instead of once per request.
+    """
+    global _last_store
+    last = _last_store
+    if last is not None and last[0] is zones:
+        return last[1]
+    with _last_store_lock:
+        last = _last_store
+        if last is not None and last[0] is zones:
+            return last[1]
+        store = ZoneStore(zones, validate=validate)
+        _last_store = (zones, store)
+        return store
@@ -0,0 +1,35 @@
+import pytest
+
+from edge_cloud_management_api.managers.db_manager import MongoClientRegistry, MongoManager
+from edge_cloud_management_api.managers.mongo_indexes import QUERY_SHAPES, apply_indexes, collection_scans
+from benchmarks.stub_srm import make_app_instances, make_service_functions
+
+
+@pytest.fixture
+def indexed_db():
+    """
+    Test database with the registered indexes and enough documents for the planner to prefer them.
+    """
+    from edge_cloud_management_api.configs.env_config import config
+
+    if not config.MONGO_URI:
+        raise ValueError("MONGO_URI is not set in the environment configuration.")
+
+    with MongoManager() as db:
+        if db.db.name != "test_db":
+            raise ValueError("Query plan checks rewrite the apps and appinstances collections, they only run against 'test_db'.")
+        for collection_name, documents in (("apps", make_service_functions(500)), ("appinstances", make_app_instances(500))):
+            db.db[collection_name].delete_many({})
+            db.db[collection_name].insert_many(documents)
+        apply_indexes(db)
+        yield db
+        db.db["appinstances"].delete_many({})
+    MongoClientRegistry.close_all()
+
+
+@pytest.mark.component
+def test_controller_queries_use_indexes(indexed_db):
+    """
+    Fail when a query shape issued by the controllers is answered with a collection scan.
+    """
+    assert collection_scans(indexed_db, QUERY_SHAPES) == []
@@ -0,0 +1,271 @@
+import json
+import pytest
+from unittest.mock import patch
+from flask import Flask
+
+from edge_cloud_management_api.app import get_app_instance
+from edge_cloud_management_api.controllers.app_controllers import get_app_instance as get_app_instances_controller
+from edge_cloud_management_api.controllers.app_controllers import get_apps
+from edge_cloud_management_api.services.job_queue import InMemoryJobStore, JobQueue
+from edge_cloud_management_api.services.pagination import encode_page_token
+
+
+@pytest.fixture
+def test_app():
+    flask_app = get_app_instance()
+    return flask_app.app
+
+
+@pytest.fixture
+def mock_api_client():
+    with patch("edge_cloud_management_api.controllers.app_controllers.PiEdgeAPIClientFactory") as factory:
+        api_client = factory.return_value.create_pi_edge_api_client.return_value
+        api_client.get_service_functions_catalogue.return_value = [{"appId": f"app-{i}"} for i in range(5)]
+        api_client.get_app_instances.return_value = [{"appInstanceId": f"instance-{i}"} for i in range(3)]
+        yield api_client
+
+
+@pytest.mark.unit
+def test_get_apps_without_pagination(mock_api_client, test_app: Flask):
+    """
+    Test that get_apps returns the whole catalogue when no page is requested.
+    """
+    with test_app.test_request_context():
+        assert len(get_apps()) == 5
+
+
+@pytest.mark.unit
+def test_get_apps_pages(mock_api_client, test_app: Flask):
+    """
+    Test that get_apps walks the catalogue with limit and the x-next-page-token header.
+    """
+    with test_app.test_request_context():
+        response, status = get_apps(limit=2)
+        assert status == 200
+        assert [app["appId"] for app in response.json] == ["app-0", "app-1"]
+
+        token = response.headers["x-next-page-token"]
+        response, status = get_apps(limit=4, pageToken=token)
+        assert [app["appId"] for app in response.json] == ["app-2", "app-3", "app-4"]
+        assert "x-next-page-token" not in response.headers
+
+        response, status = get_apps(limit=2, pageToken="garbage")
+        assert status == 400
+        assert response.json["code"] == "INVALID_ARGUMENT"
+
+        response, status = get_apps(limit=2, pageToken=encode_page_token(2))
+        assert status == 400
+        assert response.json["code"] == "INVALID_ARGUMENT"
+
+
+@pytest.mark.unit
+def test_get_app_instances_pages(mock_api_client, test_app: Flask):
+    """
+    Test that app instances are paginated inside the appInstanceInfo envelope.
+    """
+    with test_app.test_request_context():
+        response, status = get_app_instances_controller(limit=2)
+        assert status == 200
+        assert [instance["appInstanceId"] for instance in response.json["appInstanceInfo"]] == ["instance-0", "instance-1"]
+        assert response.headers["x-next-page-token"]
+
+
+@pytest.mark.unit
+def test_get_app_instances_streamed(mock_api_client, test_app: Flask):
+    """
+    Test that with STREAMING_RESPONSES the listing is streamed from the SRM in the appInstanceInfo envelope.
+    """
+    mock_api_client.iter_app_instances.side_effect = lambda: iter([{"appInstanceId": f"instance-{i}"} for i in range(3)])
+    with patch("edge_cloud_management_api.controllers.app_controllers.config.STREAMING_RESPONSES", True):
+        with test_app.test_request_context():
+            response, status = get_app_instances_controller()
+            assert status == 200
+            assert response.is_streamed
+            assert len(json.loads(response.get_data())["appInstanceInfo"]) == 3
+            mock_api_client.get_app_instances.assert_not_called()
+
+            mock_api_client.iter_app_instances.side_effect = lambda: iter([])
+            response, status = get_app_instances_controller()
+            assert status == 404
+
+
+@pytest.mark.unit
+def test_get_app_instances_from_read_model(mock_api_client, test_app: Flask):
+    """
+    Test that with READ_MODEL_ENABLED instances are read from Mongo with the query filters, not from the SRM.
+    """
+    with patch("edge_cloud_management_api.controllers.app_controllers.config.READ_MODEL_ENABLED", True), \
+            patch("edge_cloud_management_api.controllers.app_controllers.read_model_sync") as read_model_sync, \
+            patch("edge_cloud_management_api.controllers.app_controllers.read_listing") as read_listing:
+        read_listing.return_value = ([{"appInstanceId": "instance-0"}], "next")
+        with test_app.test_request_context():
+            response, status = get_app_instances_controller(region="region-1", limit=1)
+            assert status == 200
+            assert response.json == {"appInstanceInfo": [{"appInstanceId": "instance-0"}]}
+            assert response.headers["x-next-page-token"] == "next"
+        read_model_sync.ready.assert_called_once()
+        assert read_listing.call_args.args[2] == {"edgeCloudZone.edgeCloudRegion": "region-1"}
+        mock_api_client.get_app_instances.assert_not_called()
+
+
+@pytest.mark.unit
+def test_get_app_instances_from_srm_until_read_model_synced(mock_api_client, test_app: Flask):
+    """
+    Test that while no read model sync succeeded, instances are read from the SRM instead of an empty mirror.
+    """
+    mock_api_client.get_app_instances.return_value = [{"appInstanceId": "instance-0"}]
+    with patch("edge_cloud_management_api.controllers.app_controllers.config.READ_MODEL_ENABLED", True), \
+            patch("edge_cloud_management_api.controllers.app_controllers.read_model_sync") as read_model_sync, \
+            patch("edge_cloud_management_api.controllers.app_controllers.read_listing") as read_listing:
+        read_model_sync.ready.return_value = False
+        with test_app.test_request_context():
+            response, status = get_app_instances_controller()
+            assert status == 200
+            assert response.json == {"appInstanceInfo": [{"appInstanceId": "instance-0"}]}
+        read_listing.assert_not_called()
+
+
+@pytest.mark.unit
+def test_get_app_instances_filters(mock_api_client, test_app: Flask):
+    """
+    Test that appInstanceId is looked up per id and appId/region filter the SRM listing, through the API.
+    """
+    instance_ids = ["6f2a5e4c-1d1e-4c8b-9a0a-3f1f5b2a1c11", "7f2a5e4c-1d1e-4c8b-9a0a-3f1f5b2a1c11"]
+    mock_api_client.get_app_instances_by_id.return_value = [
+        {"appInstanceId": instance_ids[0], "appId": "app-0"},
+        {"error": "HTTP error occurred: 404.", "status_code": 404},
+    ]
+    mock_api_client.get_app_instances.return_value = [
+        {"appInstanceId": f"instance-{i}", "appId": f"app-{i % 2}", "edgeCloudZone": {"edgeCloudRegion": f"region-{i % 3}"}} for i in range(6)
+    ]
+    client = get_app_instance().test_client()
+
+    response = client.get(f"/appinstances?appInstanceId={','.join(instance_ids)}")
+    assert response.status_code == 200
+    assert response.json()["appInstanceInfo"] == [{"appInstanceId": instance_ids[0], "appId": "app-0"}]
+    mock_api_client.get_app_instances_by_id.assert_called_once_with(instance_ids)
+    mock_api_client.get_app_instances.assert_not_called()
+
+    response = client.get("/appinstances?appId=app-1&region=region-0")
+    assert [instance["appInstanceId"] for instance in response.json()["appInstanceInfo"]] == ["instance-3"]
+
+    response = client.get("/appinstances?region=region-9")
+    assert response.status_code == 404
+
+
+@pytest.mark.unit
+def test_create_app_instance_queues_a_deployment_job():
+    """
+    Test that POST /appinstances answers 202 with the job's Location before the SRM is called, and that the job
+    status resource follows the deployment.
+    """
+    deployments = []
+    queue = JobQueue("deployment", InMemoryJobStore, handler=lambda payload: deployments.append(payload) or {"id": "srm-1"}, workers=0)
+    body = {
+        "name": "instance_1",
+        "appId": "6f2a5e4c-1d1e-4c8b-9a0a-3f1f5b2a1c11",
+        "edgeCloudZoneId": "7f2a5e4c-1d1e-4c8b-9a0a-3f1f5b2a1c11",
+        "kubernetesClusterRef": "8f2a5e4c-1d1e-4c8b-9a0a-3f1f5b2a1c11",
+    }
+    with patch("edge_cloud_management_api.controllers.app_controllers.deployment_queue", new=queue):
+        client = get_app_instance().test_client()
+        response = client.post("/appinstances", json=body, headers={"Idempotency-Key": "key-1"})
+        assert response.status_code == 202
+        assert response.json()["status"] == "pending"
+        assert deployments == []
+        location = response.headers["Location"]
+
+        assert client.post("/appinstances", json=body, headers={"Idempotency-Key": "key-1"}).headers["Location"] == location
+        assert client.post("/appinstances", json=dict(body, name="instance_2"), headers={"Idempotency-Key": "key-1"}).status_code == 409
+
+        queue.run_once()
+        response = client.get(location)
+        assert response.status_code == 200
+        assert response.json()["status"] == "succeeded"
+        assert response.json()["result"] == {"id": "srm-1"}
+        assert deployments == [body]
+        assert client.get("/deployment-jobs/unknown").status_code == 404
+
+
+@pytest.mark.unit
+def test_create_app_instances_batch(mock_api_client):
+    """
+    Test that POST /appinstances/batch deploys every zone with its own idempotency key, repeated with the request's
+    Idempotency-Key, and reports a failed zone with 207.
+    """
+    keys = []
+
+    def deploy(data, idempotency_key):
+        keys.append(idempotency_key)
+        if data["edgeCloudZoneId"] == "9f2a5e4c-1d1e-4c8b-9a0a-3f1f5b2a1c11":
+            return {"error": "HTTP error occurred: 409 Conflict.", "status_code": 409}
+        return {"appInstanceId": "instance-1"}
+
+    mock_api_client.deploy_service_function.side_effect = deploy
+    body = {
+        "name": "instance_1",
+        "appId": "6f2a5e4c-1d1e-4c8b-9a0a-3f1f5b2a1c11",
+        "appZones": [
+            {
+                "EdgeCloudZone": {"edgeCloudZoneId": zone_id, "edgeCloudZoneName": "zone", "edgeCloudProvider": "provider_1"},
+                "kubernetesClusterRef": "8f2a5e4c-1d1e-4c8b-9a0a-3f1f5b2a1c11",
+            }
+            for zone_id in ("7f2a5e4c-1d1e-4c8b-9a0a-3f1f5b2a1c11", "9f2a5e4c-1d1e-4c8b-9a0a-3f1f5b2a1c11")
+        ],
+    }
+    client = get_app_instance().test_client()
+    response = client.post("/appinstances/batch", json=body, headers={"Idempotency-Key": "batch-1"})
+    assert response.status_code == 207
+    assert response.json()["succeeded"] == 1
+    assert [result["status"] for result in response.json()["results"]] == ["succeeded", "failed"]
+    assert mock_api_client.deploy_service_function.call_count == 2
+    assert len(set(keys)) == 2
+
+    client.post("/appinstances/batch", json=body, headers={"Idempotency-Key": "batch-1"})
+    assert set(keys[2:]) == set(keys[:2])
+
+    body["appZones"] = body["appZones"][:1]
+    assert client.post("/appinstances/batch", json=body).status_code == 200
+
+    del body["appZones"][0]["kubernetesClusterRef"]
+    assert client.post("/appinstances/batch", json=body).status_code == 400
+
+
+@pytest.mark.unit
+def test_srm_errors_are_not_answered_with_200(mock_api_client):
+    """
+    Test that SRM error dictionaries become 503 (unavailable) or the SRM's own client error.
+    """
+    client = get_app_instance().test_client()
+    mock_api_client.get_service_functions_catalogue.return_value = {"error": "The request to the external API timed out."}
+    response = client.get("/apps")
+    assert response.status_code == 503
+    assert response.json()["code"] == "UNAVAILABLE"
+
+    mock_api_client.get_app.return_value = {"error": "HTTP error occurred: 404.", "status_code": 404}
+    assert client.get("/apps/6f2a5e4c-1d1e-4c8b-9a0a-3f1f5b2a1c11").status_code == 404
+
+    mock_api_client.delete_app.return_value = {"error": "Failed to connect to the external API service."}
+    response = client.delete("/apps/6f2a5e4c-1d1e-4c8b-9a0a-3f1f5b2a1c11")
+    assert response.status_code == 503
+    assert response.json()["code"] == "UNAVAILABLE"
+
+    mock_api_client.delete_app_instance.return_value = {"error": "HTTP error occurred: 404.", "status_code": 404}
+    assert client.delete("/appinstances/6f2a5e4c-1d1e-4c8b-9a0a-3f1f5b2a1c11").status_code == 404
+
+
+@pytest.mark.unit
+def test_metrics_endpoint_reports_requests_per_operation(mock_api_client):
+    """
+    Test that GET /metrics counts and times the API requests per operationId.
+    """
+    client = get_app_instance().test_client()
+    assert client.get("/apps").status_code == 200
+    assert client.get("/no-such-path").status_code == 404
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert 'oeg_http_requests_total{operation="app_controllers.get_apps",method="GET",status="200"}' in response.text
+    assert 'oeg_http_request_duration_seconds_count{operation="app_controllers.get_apps",method="GET"}' in response.text
+    assert 'oeg_http_requests_total{operation="unmatched",method="GET",status="404"}' in response.text
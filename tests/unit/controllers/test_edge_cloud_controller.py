@@ -4,9 +4,12 @@ import pytest
 from unittest.mock import MagicMock, patch
 from flask import Flask
 from edge_cloud_management_api.controllers.edge_cloud_controller import (
+    discover_zones,
     get_edge_cloud_zones,
 )
+from edge_cloud_management_api.services.federation_services import FederationPartner
 from edge_cloud_management_api.app import get_app_instance
+from edge_cloud_management_api.services.zone_snapshot import ZoneRefresher
 
 
 @pytest.fixture
@@ -67,3 +70,77 @@ def test_get_edge_cloud_zones(
             mock_get_all_cloud_zones.assert_called_once()
         else:
             assert False
+
+
+@pytest.mark.unit
+def test_get_edge_cloud_zones_served_from_snapshot(mock_zones, test_app: Flask):
+    """
+    Test that zones served from the background snapshot carry its Age, and a stale Warning once the SRM fails.
+    """
+    loader = MagicMock(return_value=mock_zones)
+    refresher = ZoneRefresher(loader, interval=60)
+    with patch("edge_cloud_management_api.controllers.edge_cloud_controller.zone_refresher", new=refresher):
+        with test_app.test_request_context():
+            response, response_status = get_edge_cloud_zones()
+            assert response_status == 200
+            assert len(response.json) == 3
+            assert response.headers["Age"] == "0"
+            assert "Warning" not in response.headers
+
+            loader.side_effect = ConnectionError("SRM down")
+            refresher.refresh()
+            response, response_status = get_edge_cloud_zones()
+            assert response_status == 200
+            assert len(response.json) == 3
+            assert response.headers["Warning"] == '110 - "Response is Stale"'
+    refresher.stop()
+    loader.assert_called()
+
+
+@pytest.mark.unit
+def test_get_edge_cloud_zones_unavailable_until_first_load(mock_zones, test_app: Flask):
+    """
+    Test that a failing first load is answered with 503 rather than an empty list, and that zones are served once loaded.
+    """
+    loader = MagicMock(side_effect=ConnectionError("SRM down"))
+    refresher = ZoneRefresher(loader, interval=60)
+    with patch("edge_cloud_management_api.controllers.edge_cloud_controller.zone_refresher", new=refresher):
+        with test_app.test_request_context():
+            response, response_status = get_edge_cloud_zones()
+            assert response_status == 503
+            assert response.json["code"] == "UNAVAILABLE"
+            assert "SRM down" in response.json["message"]
+
+            loader.side_effect = None
+            loader.return_value = mock_zones
+            response, response_status = get_edge_cloud_zones()
+            assert response_status == 200
+            assert len(response.json) == 3
+    refresher.stop()
+
+
+@pytest.mark.unit
+def test_discover_zones_flags_missing_partners(mock_zones, test_app: Flask):
+    """
+    Test that zone discovery returns the zones that arrived and flags the partners that did not.
+    """
+    partners = [FederationPartner(name="op-b", url="http://op-b"), FederationPartner(name="op-c", url="http://op-c")]
+
+    def fetch_partner_zones(partner):
+        if partner.name == "op-c":
+            raise ConnectionError("unreachable")
+        return [dict(mock_zones[0], edgeCloudZoneId="op-b-zone", edgeCloudProvider="op-b")]
+
+    controller = "edge_cloud_management_api.controllers.edge_cloud_controller"
+    with patch(f"{controller}.fetch_local_zones", return_value=mock_zones), patch(
+        f"{controller}.load_federation_partners", return_value=partners
+    ), patch(f"{controller}.fetch_partner_zones", side_effect=fetch_partner_zones):
+        zones = discover_zones()
+        assert [zone["edgeCloudZoneId"] for zone in zones][-1] == "op-b-zone"
+        assert len(zones) == len(mock_zones) + 1
+        assert zones.missing == {"op-c": "unreachable"}
+
+        with patch(f"{controller}.get_all_cloud_zones", return_value=zones), test_app.test_request_context():
+            response, response_status = get_edge_cloud_zones()
+            assert response_status == 200
+            assert response.headers["X-Missing-Zone-Sources"] == "op-c"
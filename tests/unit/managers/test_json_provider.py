@@ -0,0 +1,86 @@
+import datetime
+import json
+import sys
+import uuid
+import pytest
+from decimal import Decimal
+from unittest.mock import MagicMock, patch
+from flask import jsonify
+
+from edge_cloud_management_api.app import get_app_instance
+from edge_cloud_management_api.managers import json_provider
+from edge_cloud_management_api.managers.json_provider import STDLIB_JSON, Jsonifier, build_json_codec, connexion_default
+from edge_cloud_management_api.services.pi_edge_services import PiEdgeAPIClient
+
+
+def codecs():
+    yield STDLIB_JSON
+    try:
+        yield build_json_codec("orjson")
+    except RuntimeError:
+        pass
+
+
+DOCUMENT = {
+    "appId": uuid.UUID("6f2a5e4c-1d1e-4c8b-9a0a-3f1f5b2a1c11"),
+    "createdAt": datetime.datetime(2024, 5, 1, 12, 30),
+    "cost": Decimal("1.5"),
+    "name": "zone-ä",
+    "replicas": {1: "a"},
+    "size": 2**70,
+    "zones": [{"edgeCloudZoneId": "z1", "status": None, "ready": True}],
+}
+
+
+@pytest.mark.unit
+class TestJSONProvider:
+    """
+    Test the JSON codec used for responses and SRM payloads.
+    """
+
+    @pytest.mark.parametrize("codec", codecs(), ids=lambda codec: codec.name)
+    def test_codecs_encode_like_the_json_module(self, codec):
+        expected = json.dumps(DOCUMENT, default=connexion_default, sort_keys=True)
+        assert json.loads(codec.dumps(DOCUMENT, connexion_default, sort_keys=True)) == json.loads(expected)
+        assert codec.loads(codec.dumps(DOCUMENT, str)) == json.loads(json.dumps(DOCUMENT, default=str))
+
+    @pytest.mark.parametrize("codec", codecs(), ids=lambda codec: codec.name)
+    def test_codecs_reject_what_the_json_module_rejects(self, codec):
+        with pytest.raises(TypeError):
+            codec.dumps({"value": object()})
+        with pytest.raises(ValueError):
+            codec.loads(b"{not json")
+
+    def test_missing_orjson_falls_back_to_stdlib(self):
+        with patch.dict(sys.modules, {"orjson": None}):
+            assert build_json_codec("auto") is STDLIB_JSON
+            with pytest.raises(RuntimeError):
+                build_json_codec("orjson")
+        with pytest.raises(ValueError):
+            build_json_codec("simplejson")
+
+    def test_flask_responses_keep_flask_encoding(self):
+        flask_app = get_app_instance().app
+        with flask_app.app_context():
+            response = jsonify({"b": 1, "a": datetime.date(2024, 5, 1)})
+        assert response.get_data() == b'{"a":"Wed, 01 May 2024 00:00:00 GMT","b":1}\n'
+        assert flask_app.json.loads(b'{"a": [1, 2]}') == {"a": [1, 2]}
+
+    def test_jsonifier_encodes_handler_results(self):
+        jsonifier = Jsonifier()
+        assert jsonifier.dumps({"at": datetime.datetime(2024, 5, 1)}) == '{"at":"2024-05-01T00:00:00Z"}\n'
+        assert jsonifier.loads(b'{"a": 1}') == {"a": 1}
+        assert jsonifier.loads("not json") == "not json"
+
+    def test_srm_client_uses_the_codec(self):
+        client = PiEdgeAPIClient(base_url="http://srm", username="user", password="secret")
+        client.requests_session = MagicMock()
+        client.requests_session.request.return_value.status_code = 201
+        client.requests_session.request.return_value.content = b'{"id": "sf-1"}'
+        body = {"name": "app", "version": "1.0"}
+
+        with patch.object(json_provider, "json_codec", wraps=STDLIB_JSON) as codec:
+            assert client.submit_app(body) == {"id": "sf-1"}
+        assert client.requests_session.request.call_args.kwargs["data"] == STDLIB_JSON.dumps(body)
+        assert "json" not in client.requests_session.request.call_args.kwargs
+        codec.loads.assert_called_once_with(b'{"id": "sf-1"}')
@@ -0,0 +1,95 @@
+import asyncio
+import pytest
+
+from edge_cloud_management_api.managers.metrics_manager import (
+    Counter,
+    Histogram,
+    MetricFamily,
+    MetricsMiddleware,
+    Registry,
+    operation_label,
+    timed_mongo_operation,
+    mongo_operation_duration,
+)
+
+
+@pytest.mark.unit
+class TestMetrics:
+    """
+    Test the metric types and their text exposition.
+    """
+
+    def test_counter_renders_per_labels(self):
+        registry = Registry()
+        requests = registry.register(Counter("requests_total", "Requests", ("method",)))
+        requests.inc("GET")
+        requests.inc("GET", amount=2)
+        requests.inc('P"O\\ST')
+        text = registry.render()
+        assert "# TYPE requests_total counter" in text
+        assert 'requests_total{method="GET"} 3' in text
+        assert 'requests_total{method="P\\"O\\\\ST"} 1' in text
+
+    def test_histogram_buckets_are_cumulative(self):
+        registry = Registry()
+        latency = registry.register(Histogram("latency_seconds", "Latency", ("endpoint",), buckets=(0.1, 1.0)))
+        for value in (0.05, 0.1, 0.5, 3.0):
+            latency.observe(value, "/node")
+        lines = registry.render().splitlines()
+        assert 'latency_seconds_bucket{endpoint="/node",le="0.1"} 2' in lines
+        assert 'latency_seconds_bucket{endpoint="/node",le="1"} 3' in lines
+        assert 'latency_seconds_bucket{endpoint="/node",le="+Inf"} 4' in lines
+        assert 'latency_seconds_count{endpoint="/node"} 4' in lines
+        assert 'latency_seconds_sum{endpoint="/node"} 3.65' in lines
+
+    def test_constant_labels_tag_every_sample(self):
+        registry = Registry()
+        requests = registry.register(Counter("requests_total", "Requests", ("method",)))
+        requests.inc("GET")
+        registry.add_collector(lambda: [MetricFamily("pool_idle", "gauge", "Idle connections").add(3)])
+        registry.set_constant_labels(worker=4242)
+        lines = registry.render().splitlines()
+        assert 'requests_total{method="GET",worker="4242"} 1' in lines
+        assert 'pool_idle{worker="4242"} 3' in lines
+
+    def test_collectors_are_called_on_scrape_and_failures_skipped(self):
+        registry = Registry()
+        pool = {"idle": 3}
+        registry.add_collector(lambda: [MetricFamily("pool_idle", "gauge", "Idle connections").add(pool["idle"])])
+        registry.add_collector(lambda: 1 / 0)
+        assert "pool_idle 3" in registry.render()
+        pool["idle"] = 1
+        assert "pool_idle 1" in registry.render()
+
+    def test_duplicate_metric_is_rejected(self):
+        registry = Registry()
+        registry.register(Counter("requests_total", "Requests"))
+        with pytest.raises(ValueError):
+            registry.register(Counter("requests_total", "Requests"))
+
+    def test_timed_mongo_operation(self):
+        class Manager:
+            @timed_mongo_operation
+            def find_document(self, collection_name, query):
+                return query
+
+        before = mongo_operation_duration.count("find_document", "apps")
+        assert Manager().find_document("apps", {"_id": 1}) == {"_id": 1}
+        assert mongo_operation_duration.count("find_document", "apps") == before + 1
+
+    def test_operation_label(self):
+        assert operation_label("edge_cloud_management_api.controllers.app_controllers.get_apps") == "app_controllers.get_apps"
+        assert operation_label(None) == "unmatched"
+
+    def test_middleware_serves_metrics_path(self):
+        sent = []
+
+        async def app(scope, receive, send):
+            raise AssertionError("the metrics path must not reach the application")
+
+        async def send(message):
+            sent.append(message)
+
+        asyncio.run(MetricsMiddleware(app, path="/metrics")({"type": "http", "path": "/metrics", "method": "GET"}, None, send))
+        assert sent[0]["status"] == 200
+        assert b"oeg_http_requests_total" in sent[1]["body"]
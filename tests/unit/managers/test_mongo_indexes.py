@@ -0,0 +1,75 @@
+import pytest
+from unittest.mock import MagicMock, patch
+import mongomock
+
+from edge_cloud_management_api.managers.db_manager import MongoClientRegistry, MongoManager
+from edge_cloud_management_api.managers import mongo_indexes
+from edge_cloud_management_api.managers.mongo_indexes import MONGO_INDEXES, QUERY_SHAPES, apply_indexes, bootstrap_indexes, collection_scans, plan_stages
+
+
+class TestConfig:
+    MONGO_URI = "mongodb://localhost:27017/test_db"
+    MONGO_MAX_POOL_SIZE = 50
+    MONGO_MIN_POOL_SIZE = 0
+    MONGO_WAIT_QUEUE_TIMEOUT_MS = 10000
+    MONGO_BULK_CHUNK_SIZE = 1000
+    PAGE_SIZE_DEFAULT = 100
+    MONGO_INDEX_BOOTSTRAP = True
+    MONGO_INDEX_BOOTSTRAP_TIMEOUT_MS = 500
+
+
+INDEXED_PLAN = {"stage": "LIMIT", "inputStage": {"stage": "FETCH", "inputStage": {"stage": "IXSCAN", "indexName": "appId"}}}
+SCAN_PLAN = {"stage": "SORT", "inputStage": {"stage": "COLLSCAN"}}
+
+
+@pytest.mark.unit
+class TestMongoIndexes:
+    """
+    Test the index registry and the query plan check.
+    """
+
+    def test_apply_indexes_is_idempotent(self):
+        with patch("edge_cloud_management_api.managers.db_manager.config", new=TestConfig):
+            with patch("edge_cloud_management_api.managers.db_manager.MongoClient", new=mongomock.MongoClient):
+                MongoClientRegistry.close_all()
+                with MongoManager() as db:
+                    apply_indexes(db)
+                    apply_indexes(db)
+                    for collection_name, models in MONGO_INDEXES.items():
+                        names = set(db.db[collection_name].index_information())
+                        assert {model.document["name"] for model in models} <= names
+                MongoClientRegistry.close_all()
+
+    def test_plan_stages_walks_nested_plans(self):
+        plan = {"stage": "OR", "inputStages": [INDEXED_PLAN, {"queryPlan": SCAN_PLAN}]}
+        assert list(plan_stages(plan)) == ["OR", "LIMIT", "FETCH", "IXSCAN", "SORT", "COLLSCAN"]
+
+    def test_collection_scans_reports_offending_shapes(self):
+        db = MagicMock()
+        db.explain_find.side_effect = lambda collection, query, **kwargs: {
+            "queryPlanner": {"winningPlan": SCAN_PLAN if "edgeCloudZone.edgeCloudRegion" in query else INDEXED_PLAN}
+        }
+        with patch("edge_cloud_management_api.managers.mongo_indexes.config", new=TestConfig):
+            assert collection_scans(db) == ["app instances by region", "app instances by app and region"]
+        assert db.explain_find.call_count == len(QUERY_SHAPES)
+
+    def test_bootstrap_applies_the_indexes_once(self):
+        client = mongomock.MongoClient()
+        with patch.object(mongo_indexes, "config", new=TestConfig), patch.object(mongo_indexes, "MongoClient", return_value=client) as mongo_client:
+            with patch.dict(mongo_indexes._bootstrapped, clear=True):
+                assert bootstrap_indexes()
+                assert bootstrap_indexes()
+        mongo_client.assert_called_once_with(TestConfig.MONGO_URI, serverSelectionTimeoutMS=500, connectTimeoutMS=500)
+        for collection_name, models in MONGO_INDEXES.items():
+            assert {model.document["name"] for model in models} <= set(client["test_db"][collection_name].index_information())
+
+    def test_bootstrap_failure_is_recorded_and_not_retried(self):
+        client = MagicMock()
+        client.__getitem__.return_value.__getitem__.return_value.create_indexes.side_effect = ConnectionError("mongo is down")
+        with patch.object(mongo_indexes, "config", new=TestConfig), patch.object(mongo_indexes, "MongoClient", return_value=client) as mongo_client:
+            with patch.dict(mongo_indexes._bootstrapped, clear=True):
+                assert not bootstrap_indexes()
+                assert not bootstrap_indexes()
+                assert mongo_indexes._bootstrapped == {TestConfig.MONGO_URI: "mongo is down"}
+        mongo_client.assert_called_once()
+        client.close.assert_called_once()
@@ -0,0 +1,98 @@
+import pytest
+from unittest.mock import patch
+from connexion.json_schema import Draft4RequestValidator
+from jsonschema import Draft4Validator
+
+from edge_cloud_management_api.app import get_app_instance
+from edge_cloud_management_api.managers.request_validation import (
+    Unsupported,
+    compile_check,
+    compiled_check,
+    compiled_validator,
+    validated_by_spec,
+)
+
+APP_ID = "6f2a5e4c-1d1e-4c8b-9a0a-3f1f5b2a1c11"
+SCHEMA = {
+    "type": "object",
+    "required": ["name", "zones"],
+    "properties": {
+        "name": {"type": "string", "pattern": "^[A-Za-z][A-Za-z0-9_]{1,63}$", "maxLength": 8},
+        "status": {"type": "string", "enum": ["active", "inactive"], "nullable": True},
+        "port": {"type": "integer", "minimum": 1, "maximum": 65535},
+        "ratio": {"type": "number", "minimum": 0, "exclusiveMinimum": True},
+        "zones": {"type": "array", "minItems": 1, "maxItems": 2, "items": {"type": "object", "required": ["id"], "additionalProperties": False, "properties": {"id": {"type": "string"}}}},
+        "resources": {"oneOf": [{"required": ["numCPU"]}, {"required": ["vCPU"]}]},
+        "contact": {"type": "string", "format": "email"},
+    },
+}
+INSTANCES = [
+    {"name": "app_1", "zones": [{"id": "zone"}]},
+    {"name": "app_1", "zones": [{"id": "zone"}], "status": None, "port": 8080, "ratio": 0.5, "resources": {"numCPU": 2}, "contact": "ops@example.com"},
+    {"name": "1app", "zones": [{"id": "zone"}]},
+    {"name": "app_1_too_long", "zones": [{"id": "zone"}]},
+    {"name": "app_1", "zones": []},
+    {"name": "app_1", "zones": [{"id": "zone"}] * 3},
+    {"name": "app_1", "zones": [{"id": "zone", "extra": 1}]},
+    {"name": "app_1", "zones": [{}]},
+    {"name": "app_1"},
+    {"name": "app_1", "zones": [{"id": "zone"}], "status": "unknown"},
+    {"name": "app_1", "zones": [{"id": "zone"}], "port": True},
+    {"name": "app_1", "zones": [{"id": "zone"}], "port": 1.0},
+    {"name": "app_1", "zones": [{"id": "zone"}], "port": 0},
+    {"name": "app_1", "zones": [{"id": "zone"}], "ratio": 0},
+    {"name": "app_1", "zones": [{"id": "zone"}], "resources": {"numCPU": 2, "vCPU": 2}},
+    {"name": "app_1", "zones": [{"id": "zone"}], "contact": "not an email"},
+    {"name": None, "zones": [{"id": "zone"}]},
+    [],
+    None,
+]
+
+
+@pytest.mark.unit
+class TestCompiledValidation:
+    """
+    Test the request validators compiled once per schema.
+    """
+
+    @pytest.mark.parametrize("instance", INSTANCES)
+    def test_compiled_check_agrees_with_connexion(self, instance):
+        expected = Draft4RequestValidator(SCHEMA, format_checker=Draft4Validator.FORMAT_CHECKER).is_valid(instance)
+        assert compile_check(SCHEMA)(instance) is expected
+
+    def test_nullable_is_a_request_validator_extension(self):
+        schema = {"type": "string", "nullable": True}
+        assert compile_check(schema)(None)
+        assert not compile_check(schema, nullable=False)(None)
+
+    def test_unknown_keywords_fall_back_to_jsonschema(self):
+        schema = {"type": "array", "uniqueItems": True}
+        with pytest.raises(Unsupported):
+            compile_check(schema)
+        assert compiled_check(schema)([1, 2])
+        assert not compiled_check(schema)([1, 1])
+
+    def test_validators_are_compiled_once_per_schema(self):
+        schema = {"type": "string"}
+        assert compiled_validator(schema) is compiled_validator(schema)
+        assert compiled_check(schema) is compiled_check(schema)
+        assert compiled_validator(schema) is not compiled_validator(dict(schema))
+
+    def test_invalid_body_is_answered_with_connexion_error(self):
+        response = get_app_instance().test_client().post("/appinstances", json={"name": "instance_1", "appId": APP_ID})
+        assert response.status_code == 400
+        assert response.json()["detail"] == "'edgeCloudZoneId' is a required property"
+
+    def test_invalid_parameter_is_answered_with_connexion_error(self):
+        response = get_app_instance().test_client().get("/edge-cloud-zones", params={"status": "bogus"})
+        assert response.status_code == 400
+        assert response.json()["detail"].startswith("'bogus' is not one of ['active', 'inactive', 'unknown']")
+
+    def test_controllers_behind_connexion_skip_pydantic(self):
+        assert not validated_by_spec()
+        with patch("edge_cloud_management_api.controllers.edge_cloud_controller.EdgeCloudQueryParams") as query_params, patch(
+            "edge_cloud_management_api.controllers.edge_cloud_controller.get_all_cloud_zones", return_value=[]
+        ):
+            response = get_app_instance().test_client().get("/edge-cloud-zones", params={"status": "active"})
+        assert response.status_code == 200
+        query_params.assert_not_called()
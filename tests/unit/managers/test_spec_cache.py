@@ -0,0 +1,56 @@
+import pytest
+from unittest.mock import patch
+from connexion.exceptions import InvalidSpecification
+
+from edge_cloud_management_api.app import get_app_instance
+from edge_cloud_management_api.managers import spec_cache
+from edge_cloud_management_api.managers.spec_cache import SPEC_FILE, cache_file, load_specification, validated_specification
+
+
+@pytest.fixture
+def spec_copy(tmp_path):
+    spec_file = tmp_path / "openapi.yaml"
+    spec_file.write_bytes(SPEC_FILE.read_bytes())
+    return spec_file
+
+
+@pytest.mark.unit
+class TestSpecCache:
+    """
+    Test the OpenAPI spec cache keyed by the spec's hash.
+    """
+
+    def test_first_load_writes_the_cache_and_the_next_reads_it(self, spec_copy, tmp_path):
+        cache_dir = tmp_path / "cache"
+        specification = load_specification(spec_copy, cache_dir)
+        assert cache_file(spec_copy, cache_dir).exists()
+        with patch.object(spec_cache, "parse_specification", side_effect=AssertionError("the spec must come from the cache")):
+            assert load_specification(spec_copy, cache_dir) == specification
+
+    def test_edited_spec_gets_a_new_cache_entry(self, spec_copy, tmp_path):
+        before = cache_file(spec_copy, tmp_path)
+        spec_copy.write_text(spec_copy.read_text().replace("Edge Application Management", "Edited title", 1))
+        assert cache_file(spec_copy, tmp_path) != before
+
+    def test_invalid_spec_is_rejected_and_not_cached(self, tmp_path):
+        spec_file = tmp_path / "openapi.yaml"
+        spec_file.write_text("openapi: 3.0.3\npaths: 42\n")
+        with pytest.raises(InvalidSpecification):
+            load_specification(spec_file, tmp_path / "cache")
+        assert not (tmp_path / "cache").exists()
+
+    def test_unwritable_cache_is_bypassed(self, spec_copy, tmp_path):
+        blocker = tmp_path / "not-a-directory"
+        blocker.write_text("")
+        assert load_specification(spec_copy, blocker)["openapi"].startswith("3.")
+
+    def test_validation_is_restored_after_the_block(self, spec_copy, tmp_path):
+        with validated_specification(spec_copy, tmp_path):
+            pass
+        with pytest.raises(InvalidSpecification):
+            spec_cache.Specification.from_dict({"openapi": "3.0.3", "paths": 42})
+
+    def test_app_serves_the_same_spec_with_and_without_cache(self):
+        cached = get_app_instance().test_client().get("/openapi.json").json()
+        with patch("edge_cloud_management_api.app.config.SPEC_CACHE_ENABLED", False):
+            assert get_app_instance().test_client().get("/openapi.json").json() == cached
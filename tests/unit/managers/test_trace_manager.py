@@ -0,0 +1,125 @@
+import json
+import uuid
+import pytest
+
+from edge_cloud_management_api.app import get_app_instance
+from edge_cloud_management_api.managers.trace_manager import (
+    CLIENT,
+    SERVER,
+    STATUS_ERROR,
+    BatchSpanProcessor,
+    FileSpanExporter,
+    SpanExporter,
+    correlator_or_new,
+    propagation_headers,
+    request_trace,
+    set_span_processor,
+    spans_dropped,
+    start_span,
+    trace_id_for,
+    traced_mongo_operation,
+)
+
+
+class RecordingExporter(SpanExporter):
+    def __init__(self):
+        self.spans = []
+
+    def export(self, spans):
+        self.spans.extend(spans)
+
+
+@pytest.fixture
+def exporter():
+    exporter = RecordingExporter()
+    processor = BatchSpanProcessor(exporter, start=False)
+    set_span_processor(processor)
+    yield exporter, processor
+    set_span_processor(None)
+
+
+@pytest.mark.unit
+class TestTracing:
+    """
+    Test trace ids, span nesting, propagation headers and export.
+    """
+
+    def test_correlator_and_trace_id(self):
+        correlator = "6f2a5e4c-1d1e-4c8b-9a0a-3f1f5b2a1c11"
+        assert correlator_or_new(correlator) == correlator
+        assert trace_id_for(correlator) == "6f2a5e4c1d1e4c8b9a0a3f1f5b2a1c11"
+        assert len(trace_id_for("order-42")) == 32
+        assert uuid.UUID(correlator_or_new("bad\r\nheader"))
+        assert uuid.UUID(correlator_or_new(None))
+
+    def test_spans_nest_under_the_request(self, exporter):
+        recorder, processor = exporter
+
+        class Manager:
+            @traced_mongo_operation
+            def find_document(self, collection_name, query):
+                return query
+
+        with request_trace("order-42", "GET /apps") as root:
+            with start_span("SRM GET /serviceFunction", kind=CLIENT) as srm_span:
+                headers = propagation_headers()
+            Manager().find_document("apps", {})
+            with pytest.raises(ValueError):
+                with start_span("failing"):
+                    raise ValueError("boom")
+        processor.flush()
+
+        spans = {span.name: span for span in recorder.spans}
+        assert spans["GET /apps"].kind == SERVER and spans["GET /apps"].parent_id is None
+        assert spans["SRM GET /serviceFunction"].parent_id == root.span_id
+        assert spans["mongo.find_document"].attributes["db.collection.name"] == "apps"
+        assert spans["failing"].status == STATUS_ERROR
+        assert {span.trace_id for span in recorder.spans} == {trace_id_for("order-42")}
+        assert headers == {"x-correlator": "order-42", "traceparent": f"00-{root.trace_id}-{srm_span.span_id}-01"}
+
+    def test_no_spans_without_exporter_but_correlator_is_propagated(self):
+        set_span_processor(None)
+        assert propagation_headers() == {}
+        with request_trace("order-42", "GET /apps"):
+            with start_span("SRM GET /node") as span:
+                span.set_attribute("ignored", True)
+                assert propagation_headers()["x-correlator"] == "order-42"
+
+    def test_full_queue_drops_spans(self):
+        processor = BatchSpanProcessor(RecordingExporter(), max_queue_size=1, start=False)
+        set_span_processor(processor)
+        try:
+            before = spans_dropped.value()
+            with request_trace("order-42", "GET /apps"):
+                with start_span("SRM GET /node"):
+                    pass
+            assert spans_dropped.value() == before + 1
+        finally:
+            set_span_processor(None)
+
+    def test_file_exporter_writes_otlp_json_lines(self, tmp_path):
+        path = tmp_path / "traces.jsonl"
+        processor = BatchSpanProcessor(FileSpanExporter(str(path), "oeg-test"), start=False)
+        set_span_processor(processor)
+        try:
+            with request_trace("order-42", "GET /apps"):
+                with start_span("SRM GET /node", attributes={"http.response.status_code": 200}):
+                    pass
+            processor.flush()
+        finally:
+            set_span_processor(None)
+        request = json.loads(path.read_text().splitlines()[0])
+        spans = request["resourceSpans"][0]["scopeSpans"][0]["spans"]
+        assert [span["name"] for span in spans] == ["SRM GET /node", "GET /apps"]
+        assert spans[0]["parentSpanId"] == spans[1]["spanId"]
+        assert {"key": "http.response.status_code", "value": {"intValue": "200"}} in spans[0]["attributes"]
+
+    def test_api_echoes_the_correlator_and_names_the_root_span(self, exporter):
+        recorder, processor = exporter
+        client = get_app_instance().test_client()
+        response = client.get("/deployment-jobs/unknown", headers={"x-correlator": "order-42"})
+        assert response.headers["x-correlator"] == "order-42"
+        assert uuid.UUID(client.get("/deployment-jobs/unknown").headers["x-correlator"])
+        processor.flush()
+        assert recorder.spans[0].name == "app_controllers.get_deployment_job"
+        assert recorder.spans[0].correlator == "order-42"
@@ -0,0 +1,41 @@
+import pytest
+
+from edge_cloud_management_api.services.app_instance_index import AppInstanceIndex, app_instance_index_for
+
+
+def make_instances(count):
+    return [
+        {"appInstanceId": f"instance-{i}", "appId": f"app-{i % 3}", "edgeCloudZone": {"edgeCloudRegion": f"region-{i % 2}"}}
+        for i in range(count)
+    ]
+
+
+@pytest.mark.unit
+class TestAppInstanceIndex:
+    """
+    Test filtered lookups of app instances.
+    """
+
+    def test_query_by_each_criterion(self):
+        index = AppInstanceIndex(make_instances(12))
+        assert len(index.query()) == 12
+        assert [i["appInstanceId"] for i in index.query(app_id="app-1")] == ["instance-1", "instance-4", "instance-7", "instance-10"]
+        assert len(index.query(region="region-0")) == 6
+        assert [i["appInstanceId"] for i in index.query(app_id="app-1", region="region-0")] == ["instance-4", "instance-10"]
+        assert index.query(app_id="unknown") == []
+
+    def test_query_by_ids(self):
+        index = AppInstanceIndex(make_instances(12))
+        result = index.query(app_instance_ids=["instance-3", "missing", "instance-5", "instance-3"])
+        assert [i["appInstanceId"] for i in result] == ["instance-3", "instance-5"]
+        assert index.query(app_instance_ids=["instance-3", "instance-4"], region="region-0") == [index.get("instance-4")]
+
+    def test_instances_without_zone(self):
+        index = AppInstanceIndex([{"appInstanceId": "1", "appId": "a", "edgeCloudZone": None}])
+        assert index.query(region="region-0") == []
+        assert len(index.query(app_id="a")) == 1
+
+    def test_index_reused_for_the_same_listing(self):
+        instances = make_instances(3)
+        assert app_instance_index_for(instances) is app_instance_index_for(instances)
+        assert app_instance_index_for(list(instances)) is not app_instance_index_for(instances)
@@ -0,0 +1,131 @@
+import asyncio
+import threading
+import time
+import pytest
+
+from edge_cloud_management_api.managers.trace_manager import propagation_headers, request_trace
+from edge_cloud_management_api.services.batch_deployment import (
+    FAILED,
+    SUCCEEDED,
+    InvalidBatch,
+    async_deploy_zones,
+    batch_summary,
+    deploy_zones,
+    with_zone_idempotency_keys,
+    zone_deployments,
+)
+
+APP_ID = "6f2a5e4c-1d1e-4c8b-9a0a-3f1f5b2a1c11"
+
+
+def batch_body(zone_count):
+    return {
+        "name": "instance_1",
+        "appId": APP_ID,
+        "appZones": [{"EdgeCloudZone": {"edgeCloudZoneId": f"zone-{i}"}, "kubernetesClusterRef": f"cluster-{i}"} for i in range(zone_count)],
+    }
+
+
+class ConcurrencyProbe:
+    """
+    Deploy stub recording the highest number of concurrent calls.
+    """
+
+    def __init__(self, delay=0.02, failing=()):
+        self.delay = delay
+        self.failing = set(failing)
+        self.active = self.peak = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, payload):
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(self.delay)
+        with self.lock:
+            self.active -= 1
+        if payload["edgeCloudZoneId"] in self.failing:
+            return {"error": "HTTP error occurred: 409 Conflict.", "status_code": 409}
+        return {"appInstanceId": f"instance-{payload['edgeCloudZoneId']}"}
+
+
+@pytest.mark.unit
+class TestBatchDeployment:
+    """
+    Test the split of batch requests into zone deployments and their capped concurrent submission.
+    """
+
+    def test_zone_deployments(self):
+        payloads = zone_deployments(batch_body(2))
+        assert payloads == [
+            {"name": "instance_1", "appId": APP_ID, "edgeCloudZoneId": "zone-0", "kubernetesClusterRef": "cluster-0"},
+            {"name": "instance_1", "appId": APP_ID, "edgeCloudZoneId": "zone-1", "kubernetesClusterRef": "cluster-1"},
+        ]
+
+    @pytest.mark.parametrize(
+        "body",
+        [
+            {"appId": APP_ID, "appZones": []},
+            {"appId": APP_ID, "appZones": [{"EdgeCloudZone": {}}]},
+            {"appId": APP_ID, "appZones": [{"EdgeCloudZone": {"edgeCloudZoneId": "zone-0"}}]},
+            dict(batch_body(1), appZones=batch_body(1)["appZones"] * 2),
+            batch_body(4),
+        ],
+    )
+    def test_invalid_batches(self, body):
+        with pytest.raises(InvalidBatch):
+            zone_deployments(body, max_zones=3)
+
+    def test_zone_idempotency_keys_repeat_with_the_batch_key(self):
+        def keys(batch_key):
+            sent = []
+            deploy_zones(with_zone_idempotency_keys(lambda payload, idempotency_key: sent.append(idempotency_key), batch_key), zone_deployments(batch_body(3)))
+            return sent
+
+        assert keys("batch-1") == keys("batch-1")
+        assert len(set(keys("batch-1"))) == 3
+        assert not set(keys("batch-1")) & set(keys("batch-2"))
+        assert not set(keys(None)) & set(keys(None))
+
+    def test_deployments_are_capped_and_keep_their_order(self):
+        probe = ConcurrencyProbe(failing={"zone-3"})
+        results = deploy_zones(probe, zone_deployments(batch_body(12)), max_concurrency=4)
+        assert probe.peak == 4
+        assert [result["edgeCloudZoneId"] for result in results] == [f"zone-{i}" for i in range(12)]
+        assert results[3]["status"] == FAILED and results[3]["statusCode"] == 409
+        assert results[0]["status"] == SUCCEEDED and results[0]["result"] == {"appInstanceId": "instance-zone-0"}
+        summary = batch_summary(results)
+        assert (summary["succeeded"], summary["failed"]) == (11, 1)
+
+    def test_exception_fails_only_its_zone(self):
+        def deploy(payload):
+            if payload["edgeCloudZoneId"] == "zone-1":
+                raise ConnectionError("SRM unavailable")
+            return {}
+
+        results = deploy_zones(deploy, zone_deployments(batch_body(3)), max_concurrency=2)
+        assert [result["status"] for result in results] == [SUCCEEDED, FAILED, SUCCEEDED]
+        assert "SRM unavailable" in results[1]["error"]
+
+    def test_deployments_forward_the_correlator(self):
+        def deploy(payload):
+            return {"x-correlator": propagation_headers().get("x-correlator")}
+
+        with request_trace("order-42", "POST /appinstances/batch"):
+            results = deploy_zones(deploy, zone_deployments(batch_body(3)), max_concurrency=2)
+        assert [result["result"] for result in results] == [{"x-correlator": "order-42"}] * 3
+
+    def test_async_deployments_are_capped(self):
+        active, peak = 0, 0
+
+        async def deploy(payload):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            return {"appInstanceId": payload["edgeCloudZoneId"]}
+
+        results = asyncio.run(async_deploy_zones(deploy, zone_deployments(batch_body(10)), max_concurrency=3))
+        assert peak == 3
+        assert [result["result"]["appInstanceId"] for result in results] == [f"zone-{i}" for i in range(10)]
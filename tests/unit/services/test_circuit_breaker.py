@@ -0,0 +1,165 @@
+import json
+import pytest
+from unittest.mock import MagicMock
+from requests.exceptions import ReadTimeout
+
+from edge_cloud_management_api.services.circuit_breaker import CLOSED, HALF_OPEN, OPEN, AdaptiveTimeout, CircuitBreaker, srm_circuits
+from edge_cloud_management_api.services.pi_edge_services import PiEdgeAPIClient
+from edge_cloud_management_api.services.retry_policy import srm_retry_budget
+from edge_cloud_management_api.services.srm_cache import InMemoryTTLCache, SrmCache, get_srm_cache, set_srm_cache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_response(status_code=200, payload=None):
+    response = MagicMock()
+    response.status_code = status_code
+    response.content = json.dumps(payload).encode()
+    return response
+
+
+@pytest.fixture
+def api_client():
+    """
+    Fixture to provide a PiEdgeAPIClient with a mocked session, a fresh SRM cache, fresh circuits and retry budget.
+    """
+    srm_circuits.reset()
+    srm_retry_budget.reset()
+    set_srm_cache(SrmCache(InMemoryTTLCache(), ttls={"/node": 10}))
+    client = PiEdgeAPIClient(base_url="http://srm", username="user", password="secret")
+    client.requests_session = MagicMock()
+    yield client
+    set_srm_cache(None)
+    srm_circuits.reset()
+
+
+@pytest.mark.unit
+class TestCircuitBreaker:
+    """
+    Test the closed -> open -> half-open -> closed cycle.
+    """
+
+    def test_opens_after_consecutive_failures(self):
+        breaker = CircuitBreaker("GET /node", failure_threshold=3, reset_timeout=10, clock=FakeClock())
+        for _ in range(2):
+            assert breaker.allow()
+            breaker.record_failure()
+        breaker.record_success()
+        for _ in range(3):
+            assert breaker.allow()
+            breaker.record_failure()
+        assert breaker.state == OPEN
+        assert not breaker.allow()
+        assert breaker.snapshot()["rejected"] == 1
+
+    def test_half_open_lets_one_probe_through(self):
+        clock = FakeClock()
+        breaker = CircuitBreaker("GET /node", failure_threshold=1, reset_timeout=10, clock=clock)
+        breaker.allow()
+        breaker.record_failure()
+        clock.now = 10
+        assert breaker.state == HALF_OPEN
+        assert breaker.allow()
+        assert not breaker.allow()
+        breaker.record_failure()
+        assert breaker.state == OPEN
+
+        clock.now = 20
+        assert breaker.allow()
+        breaker.record_success()
+        assert breaker.state == CLOSED
+        assert breaker.allow() and breaker.allow()
+        assert breaker.snapshot()["opened"] == 2
+
+    def test_disabled_breaker_never_opens(self):
+        breaker = CircuitBreaker("GET /node", failure_threshold=1, enabled=False)
+        for _ in range(3):
+            assert breaker.allow()
+            breaker.record_failure()
+        assert breaker.state == CLOSED
+
+
+@pytest.mark.unit
+class TestAdaptiveTimeout:
+    """
+    Test the latency-based read timeout.
+    """
+
+    def test_maximum_until_enough_samples(self):
+        timeout = AdaptiveTimeout(maximum=30, minimum=0.1, factor=3, min_samples=5)
+        for _ in range(4):
+            timeout.record(0.2)
+        assert timeout.current() == 30
+        timeout.record(0.2)
+        assert timeout.current() == pytest.approx(0.6)
+
+    def test_clamped(self):
+        fast = AdaptiveTimeout(maximum=30, minimum=1, factor=3, min_samples=1)
+        fast.record(0.01)
+        assert fast.current() == 1
+        slow = AdaptiveTimeout(maximum=30, minimum=1, factor=3, min_samples=1)
+        slow.record(20)
+        assert slow.current() == 30
+
+
+@pytest.mark.unit
+class TestClientCircuit:
+    """
+    Test the circuit breaker around PiEdgeAPIClient calls.
+    """
+
+    def test_open_circuit_does_not_call_the_srm(self, api_client):
+        api_client.requests_session.request.side_effect = ReadTimeout("slow")
+        results = [api_client.get_app("abc") for _ in range(8)]
+        # 3 attempts for the first call, the fifth failed attempt (second call) opens the circuit
+        assert api_client.requests_session.request.call_count == 5
+        assert results[-1] == {"error": "Failed to connect to the external API service. Service might be unavailable."}
+        snapshot = {entry["endpoint"]: entry for entry in srm_circuits.snapshot()}
+        assert snapshot["/serviceFunction/{id}"]["state"] == OPEN
+        assert snapshot["/serviceFunction/{id}"]["rejected"] == 7
+        assert "/serviceFunction" not in snapshot
+
+    def test_lookups_by_id_do_not_lower_the_listing_timeout(self, api_client):
+        api_client.requests_session.request.return_value = make_response(payload={"id": "instance"})
+        for i in range(200):
+            api_client.get_app_instance(f"instance-{i}")
+        snapshot = {entry["endpoint"]: entry for entry in srm_circuits.snapshot()}
+        assert snapshot["/deployedServiceFunction/{id}"]["timeoutSeconds"] < api_client.timeout[1]
+
+        api_client.requests_session.request.return_value = make_response(payload=[])
+        api_client.get_app_instances()
+        assert api_client.requests_session.request.call_args.kwargs["timeout"] == api_client.timeout
+
+    def test_open_circuit_serves_last_cached_value(self, api_client):
+        nodes = [{"id": "zone-1"}]
+        api_client.requests_session.request.return_value = make_response(payload=nodes)
+        assert api_client.edge_cloud_zones() == nodes
+
+        get_srm_cache().backend.clear()  # the entry expired
+        api_client.requests_session.request.return_value = make_response(503)
+        results = [api_client.edge_cloud_zones() for _ in range(4)]
+        # the error is reported while the circuit is closed; the fifth failed attempt (second call) opens it
+        assert "error" in results[0]
+        assert results[1:] == [nodes] * 3
+        assert api_client.requests_session.request.call_count == 6
+        snapshot = {entry["endpoint"]: entry for entry in srm_circuits.snapshot()}
+        assert snapshot["/node"]["fallbacks"] == 3
+
+    def test_open_circuit_serves_last_good_value_with_caching_disabled(self, api_client):
+        set_srm_cache(SrmCache(InMemoryTTLCache(), ttls={}))
+        nodes = [{"id": "zone-1"}]
+        api_client.requests_session.request.return_value = make_response(payload=nodes)
+        assert api_client.edge_cloud_zones() == nodes
+        assert api_client.edge_cloud_zones() == nodes
+        assert api_client.requests_session.request.call_count == 2
+
+        api_client.requests_session.request.return_value = make_response(503)
+        results = [api_client.edge_cloud_zones() for _ in range(4)]
+        assert "error" in results[0]
+        assert results[1:] == [nodes] * 3
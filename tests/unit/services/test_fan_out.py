@@ -0,0 +1,116 @@
+import asyncio
+import threading
+import time
+import pytest
+from unittest.mock import patch
+
+from edge_cloud_management_api.services.fan_out import FanOutStats, PartialResult, async_fan_out, bounded_map, fan_out
+
+
+def sleeper(seconds, items):
+    def call():
+        time.sleep(seconds)
+        return items
+
+    return call
+
+
+def failing():
+    raise ConnectionError("partner unreachable")
+
+
+@pytest.mark.unit
+class TestFanOut:
+    """
+    Test the threaded fan-out engine.
+    """
+
+    def test_sources_run_in_parallel_and_merge_in_order(self):
+        sources = {"local": sleeper(0.1, [1, 2]), "op-b": sleeper(0.1, [3]), "op-c": sleeper(0.1, [4])}
+        started = time.monotonic()
+        result = fan_out(sources, deadlines=1.0, stats=FanOutStats())
+        assert time.monotonic() - started < 0.25
+        assert result == [1, 2, 3, 4]
+        assert result.complete
+
+    def test_late_and_failing_sources_are_reported_missing(self):
+        stats = FanOutStats()
+        sources = {"local": sleeper(0, [1]), "slow": sleeper(0.5, [2]), "broken": failing}
+        started = time.monotonic()
+        result = fan_out(sources, deadlines={"local": 1.0, "slow": 0.05, "broken": 1.0}, stats=stats)
+        assert time.monotonic() - started < 0.4
+        assert result == [1]
+        assert result.missing == {"slow": "deadline exceeded", "broken": "partner unreachable"}
+        assert stats.snapshot()["slow"]["timeouts"] == 1
+        assert stats.snapshot()["broken"]["errors"] == 1
+
+    def test_latency_recorded_per_source(self):
+        stats = FanOutStats()
+        fan_out({"local": sleeper(0.05, [])}, deadlines=1.0, stats=stats)
+        counters = stats.snapshot()["local"]
+        assert counters["calls"] == 1
+        assert counters["last_ms"] >= 50
+        assert counters["max_ms"] == counters["total_ms"] == counters["last_ms"]
+
+    def test_bounded_map_is_capped_and_keeps_order(self):
+        lock = threading.Lock()
+        active = peak = 0
+
+        def square(value):
+            nonlocal active, peak
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            time.sleep(0.01)
+            with lock:
+                active -= 1
+            return value * value
+
+        assert bounded_map(square, range(10), max_concurrency=3) == [value * value for value in range(10)]
+        assert peak == 3
+        with pytest.raises(ZeroDivisionError):
+            bounded_map(lambda value: 1 / value, [1, 0], max_concurrency=2)
+
+    def test_hung_sources_do_not_block_other_pools(self):
+        class SmallPoolConfig:
+            FAN_OUT_MAX_WORKERS = 2
+
+        release = threading.Event()
+
+        def hung():
+            release.wait(5)
+            return []
+
+        try:
+            with patch("edge_cloud_management_api.services.fan_out.config", new=SmallPoolConfig):
+                result = fan_out({"op-b": hung, "op-c": hung}, deadlines=0.05, stats=FanOutStats(), pool="test-hung-zones")
+                assert result.missing == {"op-b": "deadline exceeded", "op-c": "deadline exceeded"}
+
+                # both threads of the zones pool are still held by the late sources
+                result = fan_out({"local": sleeper(0, [1])}, deadlines=0.05, stats=FanOutStats(), pool="test-hung-zones")
+                assert result.missing == {"local": "deadline exceeded"}
+
+                started = time.monotonic()
+                assert bounded_map(lambda value: value * 2, range(4), max_concurrency=2, pool="test-lookups") == [0, 2, 4, 6]
+                assert time.monotonic() - started < 1
+        finally:
+            release.set()
+
+    def test_async_fan_out(self):
+        stats = FanOutStats()
+
+        async def quick():
+            return ["local-zone"]
+
+        async def hanging():
+            await asyncio.sleep(10)
+
+        result = asyncio.run(async_fan_out({"local": quick, "op-b": hanging}, deadlines={"op-b": 0.05}, stats=stats))
+        assert result == ["local-zone"]
+        assert result.missing == {"op-b": "deadline exceeded"}
+        assert stats.snapshot()["op-b"]["timeouts"] == 1
+
+    def test_partial_result_is_a_list(self):
+        result = PartialResult([1], {"op-b": "deadline exceeded"})
+        assert isinstance(result, list)
+        assert not result.complete
@@ -0,0 +1,42 @@
+import json
+import pytest
+from unittest.mock import MagicMock, patch
+
+from edge_cloud_management_api.services.federation_services import (
+    FederationPartner,
+    fetch_partner_zones,
+    load_federation_partners,
+)
+
+
+@pytest.mark.unit
+class TestFederationPartners:
+    """
+    Test the federation partner configuration and zone mapping.
+    """
+
+    def test_load_partners(self):
+        partners = load_federation_partners('[{"name": "op-b", "url": "http://op-b/ctx/partner", "deadline": 1.5}]')
+        assert partners == [FederationPartner(name="op-b", url="http://op-b/ctx/partner", deadline=1.5)]
+
+    def test_invalid_configuration_is_ignored(self):
+        assert load_federation_partners("not json") == []
+        assert load_federation_partners("") == []
+
+    def test_offered_zones_mapped_to_edge_cloud_zones(self):
+        session = MagicMock()
+        session.get.return_value.content = json.dumps(
+            {"offeredAvailabilityZones": [{"zoneId": "zone-1", "geolocation": "40.4,-3.7", "geographyDetails": "Madrid"}]}
+        ).encode()
+        partner = FederationPartner(name="op-b", url="http://op-b/ctx/partner")
+        with patch("edge_cloud_management_api.services.federation_services.get_srm_session", return_value=session):
+            zones = fetch_partner_zones(partner)
+        assert zones == [
+            {
+                "edgeCloudZoneId": "zone-1",
+                "edgeCloudZoneName": "zone-1",
+                "edgeCloudZoneStatus": "unknown",
+                "edgeCloudProvider": "op-b",
+                "edgeCloudRegion": "Madrid",
+            }
+        ]
@@ -0,0 +1,173 @@
+import time
+import pytest
+from unittest.mock import MagicMock, patch
+import mongomock
+
+from edge_cloud_management_api.managers.db_manager import MongoClientRegistry
+from edge_cloud_management_api.services import deployment_jobs
+from edge_cloud_management_api.services.job_queue import (
+    FAILED,
+    PENDING,
+    RUNNING,
+    SUCCEEDED,
+    IdempotencyConflict,
+    InMemoryJobStore,
+    JobQueue,
+    MongoJobStore,
+    PermanentJobError,
+    current_job_id,
+)
+
+
+class TestConfig:
+    MONGO_URI = "mongodb://localhost:27017/test_db"
+    MONGO_MAX_POOL_SIZE = 50
+    MONGO_MIN_POOL_SIZE = 0
+    MONGO_WAIT_QUEUE_TIMEOUT_MS = 10000
+
+
+@pytest.fixture
+def mongo_store():
+    with patch("edge_cloud_management_api.managers.db_manager.config", new=TestConfig):
+        with patch("edge_cloud_management_api.managers.db_manager.MongoClient", new=mongomock.MongoClient):
+            MongoClientRegistry.close_all()
+            yield MongoJobStore("deployment_jobs")
+            MongoClientRegistry.close_all()
+
+
+def make_queue(handler, store=None, **kwargs):
+    # no worker threads: the tests drive the queue with run_once()
+    return JobQueue("test", lambda: store or InMemoryJobStore(), handler=handler, workers=0, retry_backoff=0, **kwargs)
+
+
+@pytest.mark.unit
+class TestJobQueue:
+    """
+    Test job submission, retries and idempotency.
+    """
+
+    @pytest.mark.parametrize("backend", ["memory", "mongo"])
+    def test_job_runs_once_and_succeeds(self, backend, request):
+        store = request.getfixturevalue("mongo_store") if backend == "mongo" else InMemoryJobStore()
+        calls = []
+        queue = make_queue(lambda payload: calls.append(payload) or {"id": "srm-1"}, store=store)
+        job, created = queue.submit({"appId": "a"})
+        assert created and job["status"] == PENDING
+        assert queue.run_once()
+        assert not queue.run_once()
+        job = queue.get(job["_id"])
+        assert job["status"] == SUCCEEDED
+        assert job["result"] == {"id": "srm-1"}
+        assert job["attempts"] == 1
+        assert calls == [{"appId": "a"}]
+
+    def test_transient_failures_are_retried(self):
+        outcomes = [RuntimeError("SRM unavailable"), RuntimeError("SRM unavailable"), {"id": "srm-1"}]
+
+        def handler(payload):
+            outcome = outcomes.pop(0)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+
+        queue = make_queue(handler)
+        job, _ = queue.submit({"appId": "a"})
+        while queue.run_once():
+            pass
+        job = queue.get(job["_id"])
+        assert job["status"] == SUCCEEDED
+        assert job["attempts"] == 3
+
+    def test_retries_are_bounded(self):
+        queue = make_queue(lambda payload: 1 / 0, max_attempts=3)
+        job, _ = queue.submit({"appId": "a"})
+        while queue.run_once():
+            pass
+        job = queue.get(job["_id"])
+        assert job["status"] == FAILED
+        assert job["attempts"] == 3
+
+    def test_permanent_error_is_not_retried(self):
+        def handler(payload):
+            raise PermanentJobError("HTTP error occurred: 400")
+
+        queue = make_queue(handler)
+        job, _ = queue.submit({"appId": "a"})
+        queue.run_once()
+        assert not queue.run_once()
+        assert queue.get(job["_id"])["status"] == FAILED
+
+    def test_backoff_delays_the_retry(self):
+        queue = JobQueue("test", InMemoryJobStore, handler=lambda payload: 1 / 0, workers=0, retry_backoff=60)
+        queue.submit({"appId": "a"})
+        assert queue.run_once()
+        assert not queue.run_once()
+
+    @pytest.mark.parametrize("backend", ["memory", "mongo"])
+    def test_idempotency_key(self, backend, request):
+        store = request.getfixturevalue("mongo_store") if backend == "mongo" else InMemoryJobStore()
+        queue = make_queue(lambda payload: None, store=store)
+        first, created = queue.submit({"appId": "a"}, idempotency_key="key-1")
+        again, created_again = queue.submit({"appId": "a"}, idempotency_key="key-1")
+        assert created and not created_again
+        assert again["_id"] == first["_id"]
+        with pytest.raises(IdempotencyConflict):
+            queue.submit({"appId": "b"}, idempotency_key="key-1")
+        # jobs without a key never collide
+        assert queue.submit({"appId": "a"})[1] and queue.submit({"appId": "a"})[1]
+
+    def test_expired_lease_is_claimed_again(self):
+        store = InMemoryJobStore()
+        queue = make_queue(lambda payload: "done", store=store)
+        job, _ = queue.submit({"appId": "a"})
+        claimed = store.claim(now=job["runAt"], lease=10)
+        assert claimed["status"] == RUNNING
+        assert store.claim(now=job["runAt"] + 5, lease=10) is None
+        assert store.claim(now=job["runAt"] + 11, lease=10)["attempts"] == 2
+
+    def test_lease_is_renewed_while_the_handler_runs(self):
+        store = InMemoryJobStore()
+        seen = {}
+
+        def handler(payload):
+            seen["job_id"] = current_job_id()
+            time.sleep(0.25)
+            # another worker polling now must not take the job over
+            seen["claimed_again"] = store.claim(now=time.time(), lease=0.1)
+            return "done"
+
+        queue = make_queue(handler, store=store, lease=0.1)
+        job, _ = queue.submit({"appId": "a"})
+        assert queue.run_once()
+        assert seen == {"job_id": job["_id"], "claimed_again": None}
+        assert current_job_id() is None
+        job = queue.get(job["_id"])
+        assert job["status"] == SUCCEEDED and job["attempts"] == 1
+
+    def test_deployment_sends_the_job_id_as_idempotency_key(self):
+        api_client = MagicMock()
+        api_client.deploy_service_function.return_value = {"appInstanceId": "instance-1"}
+        queue = make_queue(deployment_jobs.deploy_app_instance)
+        job, _ = queue.submit({"appId": "a"})
+        with patch.object(deployment_jobs.PiEdgeAPIClientFactory, "create_pi_edge_api_client", return_value=api_client):
+            assert queue.run_once()
+        api_client.deploy_service_function.assert_called_once_with(data={"appId": "a"}, idempotency_key=job["_id"])
+
+    @pytest.mark.parametrize(
+        "backend, mongo_uri, workers, error",
+        [
+            ("mongo", None, 1, RuntimeError),
+            ("mongo", TestConfig.MONGO_URI, 2, None),
+            ("memory", None, 1, None),
+            ("memory", None, 2, RuntimeError),
+            ("disk", None, 1, ValueError),
+        ],
+    )
+    def test_job_store_must_be_shared_by_the_workers(self, backend, mongo_uri, workers, error):
+        settings = MagicMock(JOB_QUEUE_BACKEND=backend, MONGO_URI=mongo_uri, SERVER_WORKERS=workers)
+        with patch.object(deployment_jobs, "config", new=settings):
+            if error is None:
+                deployment_jobs.check_job_store(workers)
+            else:
+                with pytest.raises(error):
+                    deployment_jobs.build_job_store()
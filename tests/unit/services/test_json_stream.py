@@ -0,0 +1,97 @@
+import asyncio
+import json
+
+import pytest
+
+from edge_cloud_management_api.services.json_stream import (
+    JsonArrayParser,
+    apeek,
+    astream_json_array,
+    peek,
+    stream_json_array,
+)
+
+ITEMS = [{"id": 1, "name": "zone-é"}, 12345, -1.5e3, "a,b]", [1, [2]], None, True, {"nested": {"k": [1, 2]}}]
+
+
+def parse_in_chunks(data: bytes, size: int):
+    parser = JsonArrayParser()
+    items = []
+    for i in range(0, len(data), size):
+        items.extend(parser.feed(data[i : i + size]))
+    parser.close()
+    return items
+
+
+@pytest.mark.unit
+class TestJsonArrayParser:
+    """
+    Test incremental parsing of a JSON array split at arbitrary byte boundaries.
+    """
+
+    @pytest.mark.parametrize("size", [1, 2, 3, 7, 64, 4096])
+    def test_any_chunk_size(self, size):
+        data = json.dumps(ITEMS, indent=2).encode()
+        assert parse_in_chunks(data, size) == ITEMS
+
+    def test_number_at_chunk_boundary_is_not_cut(self):
+        parser = JsonArrayParser()
+        assert parser.feed(b"[12") == []
+        assert parser.feed(b"34, 5") == [1234]
+        assert parser.feed(b"6]") == [56]
+        parser.close()
+
+    def test_empty_array(self):
+        assert parse_in_chunks(b" [ ] ", 1) == []
+
+    def test_truncated_array(self):
+        parser = JsonArrayParser()
+        parser.feed(b'[{"id": 1}, {"id"')
+        with pytest.raises(ValueError):
+            parser.close()
+
+    def test_not_an_array(self):
+        with pytest.raises(ValueError):
+            JsonArrayParser().feed(b'{"error": "not found"}')
+
+
+@pytest.mark.unit
+class TestStreamJsonArray:
+    """
+    Test that streamed listings encode to the same JSON as a single dump.
+    """
+
+    @pytest.mark.parametrize("batch_size", [1, 3, 256])
+    def test_array(self, batch_size):
+        assert json.loads("".join(stream_json_array(iter(ITEMS), batch_size=batch_size))) == ITEMS
+
+    def test_envelope(self):
+        body = "".join(stream_json_array([], envelope="appInstanceInfo"))
+        assert json.loads(body) == {"appInstanceInfo": []}
+
+    def test_async_envelope(self):
+        async def items():
+            for item in ITEMS:
+                yield item
+
+        async def collect():
+            return "".join([chunk async for chunk in astream_json_array(items(), envelope="appInstanceInfo", batch_size=3)])
+
+        assert json.loads(asyncio.run(collect())) == {"appInstanceInfo": ITEMS}
+
+    def test_peek(self):
+        assert peek(iter([]))[0] is True
+        empty, items = peek(iter([1, 2]))
+        assert empty is False
+        assert list(items) == [1, 2]
+
+    def test_apeek(self):
+        async def items():
+            yield 1
+            yield 2
+
+        async def collect():
+            empty, iterator = await apeek(items())
+            return empty, [item async for item in iterator]
+
+        assert asyncio.run(collect()) == (False, [1, 2])
@@ -0,0 +1,39 @@
+import pytest
+
+from edge_cloud_management_api.services.pagination import InvalidPageToken, decode_page_token, encode_page_token, paginate
+
+
+@pytest.mark.unit
+class TestPagination:
+    """
+    Test keyset pagination over in-memory listings.
+    """
+
+    def test_walk_all_pages(self):
+        items = [{"appId": f"app-{i:02d}"} for i in reversed(range(7))]
+        pages, token = [], None
+        while True:
+            page, token = paginate(items, "appId", limit=3, page_token=token)
+            pages.append([item["appId"] for item in page])
+            if token is None:
+                break
+        assert pages == [["app-00", "app-01", "app-02"], ["app-03", "app-04", "app-05"], ["app-06"]]
+
+    def test_items_inserted_before_the_cursor_do_not_shift_pages(self):
+        items = [{"appId": "b"}, {"appId": "d"}, {"appId": "f"}]
+        page, token = paginate(items, "appId", limit=2)
+        items.append({"appId": "a"})
+        page, token = paginate(items, "appId", limit=2, page_token=token)
+        assert page == [{"appId": "f"}]
+        assert token is None
+
+    def test_token_round_trip(self):
+        assert decode_page_token(encode_page_token("app-3")) == "app-3"
+        assert decode_page_token(None) is None
+
+    @pytest.mark.parametrize("after", [3, ["app-3"], {"appId": "app-3"}, None])
+    def test_invalid_token(self, after):
+        with pytest.raises(InvalidPageToken):
+            decode_page_token("not-a-token")
+        with pytest.raises(InvalidPageToken):
+            paginate([{"appId": "app-1"}], "appId", limit=1, page_token=encode_page_token(after))
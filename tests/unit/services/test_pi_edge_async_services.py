@@ -0,0 +1,201 @@
+import asyncio
+import httpx
+import pytest
+from unittest.mock import patch
+
+from edge_cloud_management_api.app import resolve_async_handler
+from edge_cloud_management_api.controllers import async_app_controllers
+from edge_cloud_management_api.services.circuit_breaker import srm_circuits
+from edge_cloud_management_api.services.retry_policy import srm_retry_budget
+from edge_cloud_management_api.services.pi_edge_async_services import AsyncPiEdgeAPIClient, AsyncPiEdgeAPIClientFactory, AsyncSrmCircuitOpen
+from edge_cloud_management_api.services.srm_cache import InMemoryTTLCache, SrmCache, set_srm_cache
+
+
+class TestConfig:
+    SRM_AUTH_ENABLED = True
+    SRM_TOKEN_TTL = 3600
+    SRM_TOKEN_REFRESH_MARGIN = 60
+    SRM_SINGLE_FLIGHT = True
+    STREAM_CHUNK_SIZE = 16
+    SRM_LOOKUP_MAX_CONCURRENCY = 2
+
+
+def run_with_srm(handler, scenario, auth_enabled=False):
+    """
+    Run the scenario coroutine against an AsyncPiEdgeAPIClient whose SRM is answered by handler.
+    The read cache is disabled so that every call reaches the handler.
+    """
+
+    async def main():
+        client = AsyncPiEdgeAPIClient(base_url="http://srm", username="user", password="secret")
+        client.http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        try:
+            return await scenario(client)
+        finally:
+            await client.http_client.aclose()
+
+    config = TestConfig if auth_enabled else type("NoAuthConfig", (TestConfig,), {"SRM_AUTH_ENABLED": False})
+    set_srm_cache(SrmCache(InMemoryTTLCache(), ttls={}))
+    srm_circuits.reset()
+    srm_retry_budget.reset()
+    try:
+        with patch("edge_cloud_management_api.services.pi_edge_async_services.config", new=config):
+            return asyncio.run(main())
+    finally:
+        set_srm_cache(None)
+        srm_circuits.reset()
+
+
+@pytest.mark.unit
+class TestAsyncPiEdgeAPIClient:
+    """
+    Test the asyncio SRM client.
+    """
+
+    def test_get_app_instances(self):
+        instances = [{"appInstanceId": "1"}]
+        result = run_with_srm(lambda request: httpx.Response(200, json=instances), lambda client: client.get_app_instances())
+        assert result == instances
+
+    def test_get_app_instances_by_id(self):
+        def handler(request):
+            instance_id = request.url.path.rsplit("/", 1)[-1]
+            return httpx.Response(404) if instance_id == "missing" else httpx.Response(200, json={"appInstanceId": instance_id})
+
+        result = run_with_srm(handler, lambda client: client.get_app_instances_by_id(["1", "missing", "2"]))
+        assert result[0] == {"appInstanceId": "1"}
+        assert result[1]["status_code"] == 404
+        assert result[2] == {"appInstanceId": "2"}
+
+    def test_http_error_dictionary(self):
+        result = run_with_srm(lambda request: httpx.Response(503), lambda client: client.get_app("abc"))
+        assert result["status_code"] == 503
+        assert result["error"].startswith("HTTP error occurred")
+
+    def test_connection_error_dictionary(self):
+        def refuse(request):
+            raise httpx.ConnectError("refused", request=request)
+
+        result = run_with_srm(refuse, lambda client: client.get_service_functions_catalogue())
+        assert result == {"error": "Failed to connect to the external API service. Service might be unavailable."}
+
+    def test_timeout_error_dictionary(self):
+        def time_out(request):
+            raise httpx.ReadTimeout("slow", request=request)
+
+        result = run_with_srm(time_out, lambda client: client.deploy_service_function({"appId": "1"}))
+        assert result == {"error": "The request to the external API timed out. Please try again later."}
+
+    def test_edge_cloud_zones_error_dictionaries(self):
+        result = run_with_srm(lambda request: httpx.Response(404), lambda client: client.edge_cloud_zones())
+        assert result["status_code"] == 404
+        result = run_with_srm(lambda request: httpx.Response(200, json=[]), lambda client: client.edge_cloud_zones())
+        assert result == {"error": "No edge nodes found"}
+
+    def test_open_circuit_fails_fast(self):
+        calls = []
+
+        def unavailable(request):
+            calls.append(request)
+            return httpx.Response(503)
+
+        async def scenario(client):
+            return [await client.get_app("abc") for _ in range(7)]
+
+        results = run_with_srm(unavailable, scenario)
+        assert len(calls) == 5
+        assert results[-1] == {"error": "Failed to connect to the external API service. Service might be unavailable."}
+
+    def test_concurrent_requests_login_once_and_retry_on_401(self):
+        logins = []
+
+        async def handler(request):
+            if request.url.path == "/authentication":
+                logins.append(request)
+                await asyncio.sleep(0.01)
+                return httpx.Response(200, json={"token": f"token-{len(logins)}"})
+            if request.headers["Authorization"] == "Bearer token-1" and request.url.path == "/serviceFunction/expired":
+                return httpx.Response(401)
+            return httpx.Response(200, json={"id": request.url.path})
+
+        async def scenario(client):
+            await asyncio.gather(*(client.get_app(str(i)) for i in range(20)))
+            return await client.get_app("expired")
+
+        result = run_with_srm(handler, scenario, auth_enabled=True)
+        assert result == {"id": "/serviceFunction/expired"}
+        assert len(logins) == 2
+
+    def test_deployment_idempotency_key_survives_the_401_retry(self):
+        deployments = []
+
+        def handler(request):
+            if request.url.path == "/authentication":
+                return httpx.Response(200, json={"token": "token-1"})
+            deployments.append(request.headers)
+            return httpx.Response(401 if len(deployments) == 1 else 201, json={"id": "sf-1"})
+
+        result = run_with_srm(handler, lambda client: client.deploy_service_function({"appId": "a"}, idempotency_key="job-1"), auth_enabled=True)
+        assert result == {"id": "sf-1"}
+        assert [headers["Idempotency-Key"] for headers in deployments] == ["job-1", "job-1"]
+        assert all(headers["Authorization"] == "Bearer token-1" for headers in deployments)
+
+    def test_iter_app_instances_retries_on_401(self):
+        instances = [{"appInstanceId": str(i)} for i in range(10)]
+        logins = []
+
+        def handler(request):
+            if request.url.path == "/authentication":
+                logins.append(request)
+                return httpx.Response(200, json={"token": f"token-{len(logins)}"})
+            if request.headers["Authorization"] == "Bearer token-1":
+                return httpx.Response(401)
+            return httpx.Response(200, json=instances)
+
+        async def scenario(client):
+            return [instance async for instance in client.iter_app_instances()]
+
+        assert run_with_srm(handler, scenario, auth_enabled=True) == instances
+        assert len(logins) == 2
+
+    def test_iter_app_instances_goes_through_the_circuit(self):
+        calls = []
+
+        def unavailable(request):
+            calls.append(request)
+            return httpx.Response(503)
+
+        async def scenario(client):
+            errors = []
+            for _ in range(7):
+                try:
+                    [instance async for instance in client.iter_app_instances()]
+                except httpx.HTTPError as err:
+                    errors.append(err)
+            return errors
+
+        errors = run_with_srm(unavailable, scenario)
+        assert len(errors) == 7
+        # the fifth failure opens the circuit: the later listings are not sent
+        assert len(calls) == 5
+        assert isinstance(errors[-1], AsyncSrmCircuitOpen)
+
+    def test_factory_caches_client_per_loop(self):
+        async def create_twice():
+            factory = AsyncPiEdgeAPIClientFactory()
+            return factory.create_pi_edge_api_client(base_url="http://srm"), factory.create_pi_edge_api_client(base_url="http://srm")
+
+        first, second = asyncio.run(create_twice())
+        assert first is second
+        other_loop_client, _ = asyncio.run(create_twice())
+        assert other_loop_client is not first
+
+
+@pytest.mark.unit
+def test_resolve_async_handler():
+    """
+    Test that controller operationIds resolve to their async twins.
+    """
+    handler = resolve_async_handler("edge_cloud_management_api.controllers.app_controllers.get_apps")
+    assert handler is async_app_controllers.get_apps
+    assert asyncio.iscoroutinefunction(handler)
@@ -0,0 +1,193 @@
+import base64
+import json
+import threading
+import time
+import pytest
+from unittest.mock import MagicMock, patch
+
+from edge_cloud_management_api.managers.trace_manager import BatchSpanProcessor, request_trace, set_span_processor
+from edge_cloud_management_api.services.pi_edge_services import PiEdgeAPIClientFactory
+from edge_cloud_management_api.services.srm_cache import InMemoryTTLCache, SrmCache, set_srm_cache
+
+
+class TestConfig:
+    SRM_HOST = "http://srm"
+    PI_EDGE_USERNAME = "user"
+    PI_EDGE_PASSWORD = "secret"
+    SRM_AUTH_ENABLED = True
+    SRM_TOKEN_TTL = 3600
+    SRM_TOKEN_REFRESH_MARGIN = 60
+    SRM_SINGLE_FLIGHT = True
+    SRM_LOOKUP_MAX_CONCURRENCY = 2
+
+
+class RecordingExporter:
+    def __init__(self):
+        self.spans = []
+
+    def export(self, spans):
+        self.spans.extend(spans)
+
+    def close(self):
+        pass
+
+
+def make_response(status_code=200, payload=None):
+    response = MagicMock()
+    response.status_code = status_code
+    response.content = json.dumps(payload).encode()
+    return response
+
+
+@pytest.fixture
+def auth_config():
+    """
+    Fixture to enable SRM authentication, with the read cache disabled so that every call reaches the (mocked) SRM.
+    """
+    with patch("edge_cloud_management_api.services.pi_edge_services.config", new=TestConfig):
+        PiEdgeAPIClientFactory.clear_clients()
+        set_srm_cache(SrmCache(InMemoryTTLCache(), ttls={}))
+        yield TestConfig
+        set_srm_cache(None)
+        PiEdgeAPIClientFactory.clear_clients()
+
+
+@pytest.fixture
+def api_client(auth_config):
+    """
+    Fixture to provide a PiEdgeAPIClient whose session is mocked.
+    The mocked SRM hands out a new token on every login.
+    """
+    client = PiEdgeAPIClientFactory().create_pi_edge_api_client()
+    client.requests_session = MagicMock()
+    logins = iter(range(1, 1000))
+    client.requests_session.post.side_effect = lambda *args, **kwargs: make_response(payload={"token": f"token-{next(logins)}"})
+    client.requests_session.request.return_value = make_response(payload=[])
+    return client
+
+
+@pytest.mark.unit
+class TestPiEdgeAPIClientFactory:
+    """
+    Test the cached client registry.
+    """
+
+    def test_same_client_for_same_srm_and_user(self, auth_config):
+        first = PiEdgeAPIClientFactory().create_pi_edge_api_client()
+        second = PiEdgeAPIClientFactory().create_pi_edge_api_client()
+        assert first is second
+
+    def test_different_client_per_user(self, auth_config):
+        first = PiEdgeAPIClientFactory().create_pi_edge_api_client(username="alice")
+        second = PiEdgeAPIClientFactory().create_pi_edge_api_client(username="bob")
+        assert first is not second
+
+    def test_new_client_when_password_changes(self, auth_config):
+        first = PiEdgeAPIClientFactory().create_pi_edge_api_client(password="old")
+        second = PiEdgeAPIClientFactory().create_pi_edge_api_client(password="new")
+        assert first is not second
+        assert PiEdgeAPIClientFactory().create_pi_edge_api_client(password="new") is second
+
+
+@pytest.mark.unit
+class TestPiEdgeAPIClientAuthentication:
+    """
+    Test bearer token caching, refresh and the 401 retry.
+    """
+
+    def test_token_reused_across_requests(self, api_client):
+        api_client.get_app_instances()
+        api_client.get_app_instances()
+        assert api_client.requests_session.post.call_count == 1
+        headers = api_client.requests_session.request.call_args.kwargs["headers"]
+        assert headers["Authorization"] == "Bearer token-1"
+
+    def test_token_refreshed_before_expiry(self, api_client):
+        api_client.get_app_instances()
+        api_client.token_expires_at = time.monotonic() + 10  # inside the refresh margin
+        api_client.get_app_instances()
+        assert api_client.requests_session.post.call_count == 2
+        assert api_client.token == "token-2"
+
+    def test_token_lifetime_from_expires_in(self, api_client):
+        api_client.requests_session.post.side_effect = None
+        api_client.requests_session.post.return_value = make_response(payload={"token": "abc", "expires_in": 120})
+        api_client.get_app_instances()
+        assert 100 < api_client.token_expires_at - time.monotonic() <= 120
+
+    def test_token_lifetime_from_jwt_exp(self, api_client):
+        claims = base64.urlsafe_b64encode(json.dumps({"exp": time.time() + 600}).encode()).decode().rstrip("=")
+        api_client.requests_session.post.side_effect = None
+        api_client.requests_session.post.return_value = make_response(payload={"token": f"header.{claims}.signature"})
+        api_client.get_app_instances()
+        assert 580 < api_client.token_expires_at - time.monotonic() <= 600
+
+    def test_retry_once_on_401(self, api_client):
+        api_client.requests_session.request.side_effect = [make_response(401), make_response(payload=[{"id": "1"}])]
+        assert api_client.get_app_instances() == [{"id": "1"}]
+        assert api_client.requests_session.post.call_count == 2
+        retried_headers = api_client.requests_session.request.call_args.kwargs["headers"]
+        assert retried_headers["Authorization"] == "Bearer token-2"
+
+    def test_deployment_idempotency_key_survives_the_401_retry(self, api_client):
+        api_client.requests_session.request.side_effect = [make_response(401), make_response(payload={"id": "sf-1"})]
+        assert api_client.deploy_service_function({"appId": "a"}, idempotency_key="job-1") == {"id": "sf-1"}
+        for call in api_client.requests_session.request.call_args_list:
+            assert call.kwargs["headers"]["Idempotency-Key"] == "job-1"
+            assert call.kwargs["headers"]["Authorization"].startswith("Bearer ")
+
+    def test_no_second_retry_on_repeated_401(self, api_client):
+        api_client.requests_session.request.return_value = make_response(401)
+        api_client.requests_session.request.return_value.raise_for_status.side_effect = Exception("401")
+        api_client.get_service_functions_catalogue()
+        assert api_client.requests_session.request.call_count == 2
+
+    def test_concurrent_requests_login_once(self, api_client):
+        login_started = threading.Event()
+
+        def slow_login(*args, **kwargs):
+            login_started.set()
+            time.sleep(0.05)
+            return make_response(payload={"token": "shared"})
+
+        api_client.requests_session.post.side_effect = slow_login
+        threads = [threading.Thread(target=api_client.get_app_instances) for _ in range(20)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert api_client.requests_session.post.call_count == 1
+        assert api_client.token == "shared"
+
+
+@pytest.mark.unit
+def test_srm_call_forwards_the_correlator(api_client):
+    """
+    Test that an SRM call made while serving a request carries its x-correlator and is recorded as a span.
+    """
+    exporter = RecordingExporter()
+    processor = BatchSpanProcessor(exporter, start=False)
+    set_span_processor(processor)
+    try:
+        with request_trace("order-42", "GET /appinstances"):
+            api_client.get_app_instances()
+        processor.flush()
+    finally:
+        set_span_processor(None)
+    headers = api_client.requests_session.request.call_args.kwargs["headers"]
+    assert headers["x-correlator"] == "order-42"
+    srm_span = exporter.spans[0]
+    assert srm_span.name == "SRM GET /deployedServiceFunction"
+    assert headers["traceparent"] == f"00-{srm_span.trace_id}-{srm_span.span_id}-01"
+
+
+@pytest.mark.unit
+def test_lookups_by_id_forward_the_correlator(api_client):
+    """
+    Test that the lookups run on the fan-out pool carry the x-correlator of the request.
+    """
+    api_client.requests_session.request.side_effect = lambda *args, **kwargs: make_response(payload={"id": args[1].rsplit("/", 1)[-1]})
+    with request_trace("order-42", "GET /appinstances"):
+        assert api_client.get_app_instances_by_id(["1", "2", "3"]) == [{"id": "1"}, {"id": "2"}, {"id": "3"}]
+    for call in api_client.requests_session.request.call_args_list:
+        assert call.kwargs["headers"]["x-correlator"] == "order-42"
@@ -0,0 +1,101 @@
+import pytest
+from unittest.mock import patch
+import mongomock
+
+from edge_cloud_management_api.managers.db_manager import MongoClientRegistry, MongoManager
+from edge_cloud_management_api.services.read_model import (
+    APP_INSTANCES_COLLECTION,
+    APPS_COLLECTION,
+    ReadModelSync,
+    app_instance_query,
+    mirror,
+    read_listing,
+    read_one,
+)
+
+
+class TestConfig:
+    MONGO_URI = "mongodb://localhost:27017/test_db"
+    MONGO_MAX_POOL_SIZE = 50
+    MONGO_MIN_POOL_SIZE = 0
+    MONGO_WAIT_QUEUE_TIMEOUT_MS = 10000
+    MONGO_BULK_CHUNK_SIZE = 1000
+    PAGE_SIZE_DEFAULT = 100
+
+
+@pytest.fixture
+def db():
+    with patch("edge_cloud_management_api.managers.db_manager.config", new=TestConfig):
+        with patch("edge_cloud_management_api.services.read_model.config", new=TestConfig):
+            with patch("edge_cloud_management_api.managers.db_manager.MongoClient", new=mongomock.MongoClient):
+                MongoClientRegistry.close_all()
+                with MongoManager() as mongo_manager:
+                    yield mongo_manager
+                MongoClientRegistry.close_all()
+
+
+def instance(i, region="region-1", status="ready"):
+    return {"appInstanceId": f"instance-{i}", "appId": f"app-{i % 2}", "status": status, "edgeCloudZone": {"edgeCloudRegion": region}}
+
+
+@pytest.mark.unit
+class TestMirror:
+    """
+    Test the incremental sync of SRM listings into Mongo.
+    """
+
+    def test_only_changes_are_written(self, db):
+        assert mirror(db, APP_INSTANCES_COLLECTION, [instance(i) for i in range(5)], "appInstanceId")["upserted"] == 5
+
+        listing = [instance(0, status="failed")] + [instance(i) for i in range(1, 4)] + [instance(9)]
+        result = mirror(db, APP_INSTANCES_COLLECTION, listing, "appInstanceId")
+        assert result == {"upserted": 2, "unchanged": 3, "deleted": 1, "errors": 0}
+        assert read_one(APP_INSTANCES_COLLECTION, {"appInstanceId": "instance-0"})["status"] == "failed"
+        assert read_one(APP_INSTANCES_COLLECTION, {"appInstanceId": "instance-4"}) is None
+
+    def test_items_without_key_are_skipped(self, db):
+        result = mirror(db, APPS_COLLECTION, [{"appId": "a"}, {"name": "no id"}], "appId")
+        assert result["upserted"] == 1
+
+    def test_read_listing_filters_and_pages(self, db):
+        mirror(db, APP_INSTANCES_COLLECTION, [instance(i, region=f"region-{i % 3}") for i in range(9)], "appInstanceId")
+
+        instances, next_token = read_listing(APP_INSTANCES_COLLECTION, "appInstanceId", app_instance_query(region="region-0"))
+        assert [item["appInstanceId"] for item in instances] == ["instance-0", "instance-3", "instance-6"]
+        assert "_id" not in instances[0] and "_hash" not in instances[0]
+        assert next_token is None
+
+        page, next_token = read_listing(APP_INSTANCES_COLLECTION, "appInstanceId", limit=5)
+        assert len(page) == 5
+        page, next_token = read_listing(APP_INSTANCES_COLLECTION, "appInstanceId", limit=5, page_token=next_token)
+        assert [item["appInstanceId"] for item in page] == ["instance-5", "instance-6", "instance-7", "instance-8"]
+        assert next_token is None
+
+
+@pytest.mark.unit
+class TestReadModelSync:
+    """
+    Test the read model sync worker.
+    """
+
+    def test_first_read_waits_for_one_sync(self, db):
+        calls = []
+        sync = ReadModelSync(interval=3600, syncer=lambda db: calls.append(db) or {"apps": {}})
+        assert sync.ready()
+        assert sync.ready()
+        sync.stop()
+        assert len(calls) == 1
+        assert sync.synced_at is not None
+
+    def test_failed_sync_keeps_data(self, db):
+        def fail(db):
+            raise RuntimeError("SRM down")
+
+        sync = ReadModelSync(interval=3600, syncer=fail)
+        assert sync.sync() is None
+        assert sync.failures == 1
+        assert sync.synced_at is None
+        # the first attempt already happened, reads do not retry it, and go to the SRM until a sync succeeds
+        assert not sync.ready()
+        sync.stop()
+        assert sync.failures == 1
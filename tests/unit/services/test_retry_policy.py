@@ -0,0 +1,139 @@
+import json
+import pytest
+from unittest.mock import MagicMock
+from requests.exceptions import ConnectionError
+
+from edge_cloud_management_api.services.circuit_breaker import CircuitOpenError, srm_circuits
+from edge_cloud_management_api.services.fan_out import fan_out
+from edge_cloud_management_api.services.pi_edge_services import PiEdgeAPIClient
+from edge_cloud_management_api.services.retry_policy import (
+    RetryBudget,
+    RetryPolicy,
+    call_with_retries,
+    deadline_scope,
+    remaining_time,
+    srm_retry_budget,
+)
+from edge_cloud_management_api.services.srm_cache import InMemoryTTLCache, SrmCache, set_srm_cache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_response(status_code=200, payload=None):
+    response = MagicMock()
+    response.status_code = status_code
+    response.content = json.dumps(payload).encode()
+    return response
+
+
+def no_wait_policy(max_attempts=3, budget=None):
+    return RetryPolicy(max_attempts=max_attempts, base_delay=0, max_delay=0, budget=budget or RetryBudget(min_per_second=100))
+
+
+@pytest.fixture
+def api_client():
+    """
+    Fixture to provide a PiEdgeAPIClient with a mocked session, no read cache, and fresh circuits and retry budget.
+    """
+    srm_circuits.reset()
+    srm_retry_budget.reset()
+    set_srm_cache(SrmCache(InMemoryTTLCache(), ttls={}))
+    client = PiEdgeAPIClient(base_url="http://srm", username="user", password="secret")
+    client.requests_session = MagicMock()
+    yield client
+    set_srm_cache(None)
+    srm_circuits.reset()
+    srm_retry_budget.reset()
+
+
+@pytest.mark.unit
+class TestRetryPolicy:
+    """
+    Test backoff, budget and deadlines.
+    """
+
+    def test_full_jitter_backoff(self):
+        policy = RetryPolicy(max_attempts=10, base_delay=0.1, max_delay=1.0, budget=RetryBudget(), rng=lambda: 1.0)
+        assert [policy.backoff(attempt) for attempt in (1, 2, 3, 5)] == [0.1, 0.2, 0.4, 1.0]
+        assert RetryPolicy(10, 0.1, 1.0, RetryBudget(), rng=lambda: 0.5).backoff(3) == 0.2
+
+    def test_budget_caps_retries_at_a_share_of_requests(self):
+        clock = FakeClock()
+        budget = RetryBudget(ratio=0.1, min_per_second=0, window=10, clock=clock)
+        for _ in range(50):
+            budget.record_request()
+        assert [budget.try_spend() for _ in range(6)] == [True] * 5 + [False]
+        clock.now = 11  # requests and retries of the last window are forgotten
+        assert not budget.try_spend()
+        budget.record_request()
+        assert budget.snapshot() == {"requests": 1, "retries": 0, "exhausted": 2}
+
+    def test_no_retry_past_the_deadline(self):
+        policy = RetryPolicy(max_attempts=5, base_delay=1.0, max_delay=1.0, budget=RetryBudget(), rng=lambda: 1.0)
+        assert remaining_time() is None
+        with deadline_scope(0.5):
+            assert policy.next_delay(1) is None
+        with deadline_scope(10):
+            with deadline_scope(60):
+                assert remaining_time() <= 10
+            assert policy.next_delay(1) == 1.0
+
+    def test_retries_transient_answers(self):
+        responses = iter([make_response(503), make_response(502), make_response(200)])
+        assert call_with_retries(lambda: next(responses), (ConnectionError,), no_wait_policy()).status_code == 200
+
+    def test_last_answer_returned_when_attempts_run_out(self):
+        send = MagicMock(return_value=make_response(503))
+        assert call_with_retries(send, (ConnectionError,), no_wait_policy(max_attempts=2)).status_code == 503
+        assert send.call_count == 2
+
+    def test_client_errors_and_open_circuits_are_not_retried(self):
+        send = MagicMock(return_value=make_response(404))
+        assert call_with_retries(send, (ConnectionError,), no_wait_policy()).status_code == 404
+        assert send.call_count == 1
+
+        class Open(CircuitOpenError, ConnectionError):
+            pass
+
+        send = MagicMock(side_effect=Open("open"))
+        with pytest.raises(Open):
+            call_with_retries(send, (ConnectionError,), no_wait_policy())
+        assert send.call_count == 1
+
+    def test_fan_out_sources_run_under_their_deadline(self):
+        remaining = {}
+
+        def source():
+            remaining["local"] = remaining_time()
+            return []
+
+        fan_out({"local": source}, {"local": 2.0})
+        assert 0 < remaining["local"] <= 2.0
+
+
+@pytest.mark.unit
+class TestClientRetries:
+    """
+    Test which PiEdgeAPIClient calls are retried.
+    """
+
+    def test_get_is_retried(self, api_client):
+        api_client.requests_session.request.side_effect = [ConnectionError("reset"), make_response(payload={"appId": "a"})]
+        assert api_client.get_app("a") == {"appId": "a"}
+        assert api_client.requests_session.request.call_count == 2
+
+    def test_post_is_not_retried(self, api_client):
+        api_client.requests_session.request.side_effect = ConnectionError("reset")
+        assert "error" in api_client.deploy_service_function({"appId": "a"})
+        assert api_client.requests_session.request.call_count == 1
+
+    def test_expired_deadline_does_not_call_the_srm(self, api_client):
+        with deadline_scope(0):
+            assert "timed out" in api_client.get_app("a")["error"]
+        api_client.requests_session.request.assert_not_called()
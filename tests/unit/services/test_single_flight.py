@@ -0,0 +1,174 @@
+import asyncio
+import json
+import threading
+import time
+import httpx
+import pytest
+from unittest.mock import MagicMock, patch
+
+from edge_cloud_management_api.services.pi_edge_async_services import AsyncPiEdgeAPIClient
+from edge_cloud_management_api.services.pi_edge_services import PiEdgeAPIClient, srm_endpoint
+from edge_cloud_management_api.services.single_flight import AsyncSingleFlight, SingleFlight, SingleFlightStats
+from edge_cloud_management_api.services.srm_cache import InMemoryTTLCache, SrmCache, set_srm_cache
+
+
+class TestConfig:
+    SRM_AUTH_ENABLED = False
+    SRM_SINGLE_FLIGHT = True
+
+
+@pytest.fixture
+def no_cache():
+    """
+    Fixture to disable the SRM read cache so that every call reaches the single-flight layer.
+    """
+    set_srm_cache(SrmCache(InMemoryTTLCache(), ttls={}))
+    yield
+    set_srm_cache(None)
+
+
+def run_in_threads(fn, count):
+    results = [None] * count
+
+    def target(index):
+        results[index] = fn()
+
+    threads = [threading.Thread(target=target, args=(index,)) for index in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+@pytest.mark.unit
+class TestSingleFlight:
+    """
+    Test the threaded single-flight group.
+    """
+
+    def test_concurrent_calls_share_one_result(self):
+        stats = SingleFlightStats()
+        group = SingleFlight(stats)
+        calls = []
+
+        def slow_call():
+            calls.append(1)
+            time.sleep(0.1)
+            return object()
+
+        results = run_in_threads(lambda: group.do("key", slow_call, label="/node"), 10)
+        assert len(calls) == 1
+        assert all(result is results[0] for result in results)
+        assert stats.snapshot() == {"/node": {"calls": 1, "collapsed": 9}}
+
+    def test_exception_propagates_to_every_caller(self):
+        group = SingleFlight(SingleFlightStats())
+
+        def failing_call():
+            time.sleep(0.1)
+            raise ValueError("boom")
+
+        def call():
+            try:
+                group.do("key", failing_call)
+            except ValueError as err:
+                return str(err)
+
+        assert run_in_threads(call, 5) == ["boom"] * 5
+
+    def test_sequential_calls_are_not_collapsed(self):
+        stats = SingleFlightStats()
+        group = SingleFlight(stats)
+        assert group.do("key", lambda: 1) == 1
+        assert group.do("key", lambda: 2) == 2
+        assert stats.snapshot()["default"] == {"calls": 2, "collapsed": 0}
+
+
+@pytest.mark.unit
+class TestAsyncSingleFlight:
+    """
+    Test the asyncio single-flight group.
+    """
+
+    def test_concurrent_coroutines_share_one_call(self):
+        stats = SingleFlightStats()
+        calls = []
+
+        async def slow_call():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return "result"
+
+        async def scenario():
+            group = AsyncSingleFlight(stats)
+            return await asyncio.gather(*(group.do("key", slow_call) for _ in range(10)))
+
+        assert asyncio.run(scenario()) == ["result"] * 10
+        assert len(calls) == 1
+        assert stats.snapshot()["default"] == {"calls": 1, "collapsed": 9}
+
+    def test_cancelled_leader_does_not_cancel_followers(self):
+        async def slow_call():
+            await asyncio.sleep(0.02)
+            return "result"
+
+        async def scenario():
+            group = AsyncSingleFlight(SingleFlightStats())
+            leader = asyncio.ensure_future(group.do("key", slow_call))
+            await asyncio.sleep(0)
+            follower = asyncio.ensure_future(group.do("key", slow_call))
+            await asyncio.sleep(0)
+            leader.cancel()
+            return await follower
+
+        assert asyncio.run(scenario()) == "result"
+
+
+@pytest.mark.unit
+class TestClientCoalescing:
+    """
+    Test that the SRM clients coalesce identical GETs only.
+    """
+
+    def test_sync_client_coalesces_identical_gets(self, no_cache):
+        client = PiEdgeAPIClient(base_url="http://srm", username="user", password="secret")
+        client.requests_session = MagicMock()
+
+        def slow_response(*args, **kwargs):
+            time.sleep(0.1)
+            response = MagicMock(status_code=200)
+            response.content = json.dumps([{"id": "zone"}]).encode()
+            return response
+
+        client.requests_session.request.side_effect = slow_response
+        with patch("edge_cloud_management_api.services.pi_edge_services.config", new=TestConfig):
+            results = run_in_threads(client.edge_cloud_zones, 10)
+        assert client.requests_session.request.call_count == 1
+        assert results == [[{"id": "zone"}]] * 10
+
+    def test_async_client_coalesces_gets_but_not_writes(self, no_cache):
+        calls = []
+
+        async def handler(request):
+            calls.append(request.method)
+            await asyncio.sleep(0.01)
+            return httpx.Response(200, json=[])
+
+        async def scenario():
+            client = AsyncPiEdgeAPIClient(base_url="http://srm", username="user", password="secret")
+            client.http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+            await asyncio.gather(*(client.get_app_instances() for _ in range(10)))
+            await asyncio.gather(*(client.deploy_service_function({"appId": "1"}) for _ in range(3)))
+            await client.http_client.aclose()
+
+        with patch("edge_cloud_management_api.services.pi_edge_async_services.config", new=TestConfig):
+            asyncio.run(scenario())
+        assert calls == ["GET", "POST", "POST", "POST"]
+
+
+@pytest.mark.unit
+def test_srm_endpoint():
+    assert srm_endpoint("http://srm", "http://srm/serviceFunction/abc") == "/serviceFunction/{id}"
+    assert srm_endpoint("http://srm", "http://srm/serviceFunction?name=abc") == "/serviceFunction"
+    assert srm_endpoint("http://srm", "http://srm/node") == "/node"
@@ -0,0 +1,161 @@
+import asyncio
+import json
+import pytest
+from unittest.mock import MagicMock, patch
+
+from edge_cloud_management_api.services.pi_edge_services import PiEdgeAPIClient
+from edge_cloud_management_api.services.srm_cache import (
+    InMemoryTTLCache,
+    SrmCache,
+    build_srm_cache,
+    cached_srm_read,
+    invalidates_srm_read,
+    set_srm_cache,
+)
+
+
+TTLS = {"/serviceFunction": 10, "/node": 10, "/deployedServiceFunction": 10}
+
+
+@pytest.fixture
+def srm_cache():
+    """
+    Fixture to install a fresh in-memory SRM cache for the duration of a test.
+    """
+    cache = SrmCache(InMemoryTTLCache(maxsize=16), ttls=dict(TTLS))
+    set_srm_cache(cache)
+    yield cache
+    set_srm_cache(None)
+
+
+@pytest.fixture
+def api_client(srm_cache):
+    client = PiEdgeAPIClient(base_url="http://srm", username="user", password="secret")
+    client.requests_session = MagicMock()
+    client.requests_session.request.return_value.status_code = 200
+    client.requests_session.request.return_value.content = json.dumps([{"id": "1"}]).encode()
+    return client
+
+
+@pytest.mark.unit
+class TestInMemoryTTLCache:
+    """
+    Test the LRU+TTL backend.
+    """
+
+    def test_expired_entry_is_a_miss(self):
+        cache = InMemoryTTLCache()
+        with patch("edge_cloud_management_api.services.srm_cache.time.monotonic", return_value=100.0):
+            cache.set("key", [1], ttl=5)
+        with patch("edge_cloud_management_api.services.srm_cache.time.monotonic", return_value=104.0):
+            assert cache.get("key") == (True, [1])
+        with patch("edge_cloud_management_api.services.srm_cache.time.monotonic", return_value=105.0):
+            assert cache.get("key") == (False, None)
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = InMemoryTTLCache(maxsize=2)
+        cache.set("a", 1, ttl=60)
+        cache.set("b", 2, ttl=60)
+        cache.get("a")
+        cache.set("c", 3, ttl=60)
+        assert cache.get("b") == (False, None)
+        assert cache.get("a") == (True, 1)
+        assert cache.get("c") == (True, 3)
+
+
+@pytest.mark.unit
+class TestSrmCache:
+    """
+    Test the read-through cache wired into PiEdgeAPIClient.
+    """
+
+    def test_listing_served_from_cache(self, api_client, srm_cache):
+        assert api_client.get_app_instances() == [{"id": "1"}]
+        assert api_client.get_app_instances() == [{"id": "1"}]
+        assert api_client.requests_session.request.call_count == 1
+        assert srm_cache.stats()["/deployedServiceFunction"] == {"hits": 1, "misses": 1}
+
+    def test_write_invalidates_listing(self, api_client, srm_cache):
+        api_client.get_service_functions_catalogue()
+        api_client.submit_app({"name": "app"})
+        api_client.get_service_functions_catalogue()
+        assert srm_cache.stats()["/serviceFunction"] == {"hits": 0, "misses": 2}
+
+    def test_delete_instance_invalidates_only_instances(self, api_client, srm_cache):
+        api_client.get_service_functions_catalogue()
+        api_client.get_app_instances()
+        api_client.delete_app_instance("1")
+        api_client.get_service_functions_catalogue()
+        api_client.get_app_instances()
+        assert srm_cache.stats()["/serviceFunction"]["hits"] == 1
+        assert srm_cache.stats()["/deployedServiceFunction"]["hits"] == 0
+
+    def test_errors_are_not_cached(self, api_client, srm_cache):
+        api_client.requests_session.request.return_value.content = json.dumps({"unexpected": "shape"}).encode()
+        assert "error" in api_client.get_service_functions_catalogue()
+        assert "error" in api_client.get_service_functions_catalogue()
+        assert api_client.requests_session.request.call_count == 2
+
+    def test_entries_scoped_per_user(self, api_client, srm_cache):
+        other_user = PiEdgeAPIClient(base_url="http://srm", username="other", password="secret")
+        other_user.requests_session = api_client.requests_session
+        api_client.get_app_instances()
+        other_user.get_app_instances()
+        assert api_client.requests_session.request.call_count == 2
+
+    def test_zero_ttl_disables_endpoint(self, api_client, srm_cache):
+        srm_cache.ttls["/node"] = 0
+        api_client.edge_cloud_zones()
+        api_client.edge_cloud_zones()
+        assert api_client.requests_session.request.call_count == 2
+        assert srm_cache.stats()["/node"] == {"hits": 0, "misses": 0}
+
+    def test_async_methods(self, srm_cache):
+        class FakeAsyncClient:
+            cache_scope = ("http://srm", "user")
+            calls = 0
+
+            @cached_srm_read("/node")
+            async def edge_cloud_zones(self):
+                self.calls += 1
+                return [{"id": "zone"}]
+
+            @invalidates_srm_read("/node")
+            async def change_zones(self):
+                return None
+
+        async def scenario():
+            client = FakeAsyncClient()
+            await client.edge_cloud_zones()
+            await client.edge_cloud_zones()
+            await client.change_zones()
+            await client.edge_cloud_zones()
+            return client.calls
+
+        assert asyncio.run(scenario()) == 2
+
+    def test_none_backend_disables_cache(self):
+        class NoCacheConfig:
+            SRM_CACHE_BACKEND = "none"
+            SRM_CACHE_MAXSIZE = 16
+            SRM_CACHE_TTL_SERVICE_FUNCTION = 10
+            SRM_CACHE_TTL_NODE = 10
+            SRM_CACHE_TTL_DEPLOYED_SERVICE_FUNCTION = 10
+
+        with patch("edge_cloud_management_api.services.srm_cache.config", new=NoCacheConfig):
+            cache = build_srm_cache()
+        assert not any(cache.enabled(endpoint) for endpoint in TTLS)
+
+    @pytest.mark.parametrize("workers, enabled", [(1, True), (2, False)])
+    def test_memory_backend_is_off_with_several_workers(self, workers, enabled):
+        class MemoryCacheConfig:
+            SRM_CACHE_BACKEND = "memory"
+            SRM_CACHE_MAXSIZE = 16
+            SRM_CACHE_TTL_SERVICE_FUNCTION = 10
+            SRM_CACHE_TTL_NODE = 10
+            SRM_CACHE_TTL_DEPLOYED_SERVICE_FUNCTION = 10
+            SERVER_WORKERS = workers
+
+        with patch("edge_cloud_management_api.services.srm_cache.config", new=MemoryCacheConfig):
+            cache = build_srm_cache()
+        assert all(cache.enabled(endpoint) is enabled for endpoint in TTLS)
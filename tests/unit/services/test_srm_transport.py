@@ -0,0 +1,96 @@
+import json
+import pytest
+from unittest.mock import MagicMock, patch
+
+from edge_cloud_management_api.services import pi_edge_services, srm_transport
+from edge_cloud_management_api.services.circuit_breaker import srm_circuits
+from edge_cloud_management_api.services.pi_edge_services import PiEdgeAPIClientFactory
+from edge_cloud_management_api.services.srm_transport import build_srm_session, close_srm_session, get_srm_session
+
+
+@pytest.fixture
+def fresh_srm_session():
+    """
+    Fixture to make sure every test starts and ends without a cached process-wide session, client or circuit.
+    """
+    close_srm_session()
+    PiEdgeAPIClientFactory.clear_clients()
+    srm_circuits.reset()
+    yield
+    close_srm_session()
+    PiEdgeAPIClientFactory.clear_clients()
+    srm_circuits.reset()
+
+
+@pytest.mark.unit
+class TestSrmTransport:
+    """
+    Test the pooled SRM transport.
+    """
+
+    def test_build_srm_session_pool_size(self):
+        """
+        Test that the mounted adapters carry the requested pool configuration.
+        """
+        session = build_srm_session(pool_connections=3, pool_maxsize=7, pool_block=True, proxy="")
+        adapter = session.get_adapter("https://srm.example.com")
+        assert adapter._pool_connections == 3
+        assert adapter._pool_maxsize == 7
+        assert adapter._pool_block is True
+        assert session.proxies == {}
+
+    def test_build_srm_session_proxy(self):
+        """
+        Test that the proxy is applied to both schemes.
+        """
+        session = build_srm_session(proxy="http://proxy.example.com:3128")
+        assert session.proxies == {"http": "http://proxy.example.com:3128", "https": "http://proxy.example.com:3128"}
+
+    def test_get_srm_session_is_shared(self, fresh_srm_session):
+        """
+        Test that the session is created once per process.
+        """
+        assert get_srm_session() is get_srm_session()
+
+    def test_session_recreated_after_fork(self, fresh_srm_session):
+        """
+        Test that a different pid gets a new session instead of the parent's sockets.
+        """
+        parent_session = get_srm_session()
+        with patch.object(srm_transport.os, "getpid", return_value=-1):
+            assert get_srm_session() is not parent_session
+
+    def test_factory_clients_share_session(self, fresh_srm_session):
+        """
+        Test that every client handed out by the factory uses the same pooled session.
+        """
+        factory = PiEdgeAPIClientFactory()
+        first = factory.create_pi_edge_api_client(base_url="http://srm-a")
+        second = PiEdgeAPIClientFactory().create_pi_edge_api_client(base_url="http://srm-b")
+        assert first.requests_session is second.requests_session
+
+    def test_forked_worker_gets_own_session_and_clients(self, fresh_srm_session):
+        """
+        Test that clients cached before a fork are not reused by the child, nor is their session.
+        """
+        parent_client = PiEdgeAPIClientFactory().create_pi_edge_api_client(base_url="http://srm")
+        parent_session = parent_client.requests_session
+        with patch.object(srm_transport.os, "getpid", return_value=-1), patch.object(pi_edge_services.os, "getpid", return_value=-1):
+            assert parent_client.requests_session is not parent_session
+            child_client = PiEdgeAPIClientFactory().create_pi_edge_api_client(base_url="http://srm")
+            assert child_client is not parent_client
+            assert PiEdgeAPIClientFactory().create_pi_edge_api_client(base_url="http://srm") is child_client
+
+    def test_client_requests_use_session_and_timeout(self, fresh_srm_session):
+        """
+        Test that client calls go through the session with the configured timeouts.
+        """
+        client = PiEdgeAPIClientFactory().create_pi_edge_api_client(base_url="http://srm")
+        client.requests_session = MagicMock()
+        client.requests_session.request.return_value.status_code = 200
+        client.requests_session.request.return_value.content = json.dumps([{"id": "node"}]).encode()
+
+        assert client.get_service_functions_catalogue() == [{"id": "node"}]
+        method, url = client.requests_session.request.call_args.args
+        assert (method, url) == ("GET", "http://srm/serviceFunction")
+        assert client.requests_session.request.call_args.kwargs["timeout"] == client.timeout
@@ -0,0 +1,67 @@
+import time
+import pytest
+from unittest.mock import MagicMock
+
+from edge_cloud_management_api.services.zone_snapshot import ZoneRefresher, ZonesUnavailable
+
+
+@pytest.fixture
+def refresher():
+    """
+    Fixture to provide a ZoneRefresher with a mocked loader and a short interval.
+    """
+    loader = MagicMock(return_value=[{"edgeCloudZoneId": "zone-1"}])
+    zone_refresher = ZoneRefresher(loader, interval=0.05)
+    yield zone_refresher
+    zone_refresher.stop()
+
+
+@pytest.mark.unit
+class TestZoneRefresher:
+    """
+    Test the stale-while-revalidate zone snapshot.
+    """
+
+    def test_first_read_loads_synchronously(self, refresher):
+        snapshot = refresher.get()
+        assert snapshot.zones == [{"edgeCloudZoneId": "zone-1"}]
+        assert not snapshot.stale
+        assert snapshot.age < 1
+
+    def test_background_thread_refreshes_snapshot(self, refresher):
+        refresher.get()
+        refresher.loader.return_value = [{"edgeCloudZoneId": "zone-2"}]
+        deadline = time.monotonic() + 2
+        while refresher.current.zones[0]["edgeCloudZoneId"] != "zone-2" and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert refresher.get().zones == [{"edgeCloudZoneId": "zone-2"}]
+
+    def test_failed_refresh_keeps_last_good_snapshot(self, refresher):
+        good = refresher.refresh()
+        refresher.loader.side_effect = ConnectionError("SRM down")
+        snapshot = refresher.refresh()
+        assert snapshot.zones is good.zones
+        assert snapshot.fetched_at == good.fetched_at
+        assert snapshot.stale
+        assert refresher.failures == 1
+
+    def test_recovers_after_failure(self, refresher):
+        refresher.refresh()
+        refresher.loader.side_effect = ConnectionError("SRM down")
+        refresher.refresh()
+        refresher.loader.side_effect = None
+        assert not refresher.refresh().stale
+
+    def test_no_snapshot_yet_and_loader_failing(self, refresher):
+        refresher.loader.side_effect = ConnectionError("SRM down")
+        with pytest.raises(ZonesUnavailable, match="SRM down"):
+            refresher.get()
+        assert refresher.current is None
+
+    def test_disabled_with_zero_interval(self):
+        loader = MagicMock(return_value=[])
+        zone_refresher = ZoneRefresher(loader, interval=0)
+        assert not zone_refresher.enabled
+        zone_refresher.start()
+        assert zone_refresher._thread is None
+        loader.assert_not_called()
@@ -0,0 +1,61 @@
+import pytest
+
+from edge_cloud_management_api.controllers.edge_cloud_controller import validate_zone
+from edge_cloud_management_api.services.zone_store import ZoneStore, zone_store_for
+
+
+def make_zone(zone_id, region, status):
+    return {
+        "edgeCloudZoneId": zone_id,
+        "edgeCloudZoneName": f"zone-{zone_id}",
+        "edgeCloudZoneStatus": status,
+        "edgeCloudProvider": "provider",
+        "edgeCloudRegion": region,
+    }
+
+
+@pytest.fixture
+def zones():
+    return [
+        make_zone("1", "Region1", "active"),
+        make_zone("2", "Region1", "inactive"),
+        make_zone("3", "Region2", "inactive"),
+    ]
+
+
+@pytest.mark.unit
+class TestZoneStore:
+    """
+    Test the indexed zone store.
+    """
+
+    @pytest.mark.parametrize(
+        "region, status, expected_ids",
+        [
+            (None, None, ["1", "2", "3"]),
+            ("Region1", None, ["1", "2"]),
+            (None, "inactive", ["2", "3"]),
+            ("Region1", "inactive", ["2"]),
+            ("Region3", None, []),
+            ("Region2", "active", []),
+        ],
+    )
+    def test_query(self, zones, region, status, expected_ids):
+        store = ZoneStore(zones, validate=validate_zone)
+        assert [zone["edgeCloudZoneId"] for zone in store.query(region=region, status=status)] == expected_ids
+
+    def test_lookup_by_id(self, zones):
+        store = ZoneStore(zones)
+        assert store.get("3")["edgeCloudRegion"] == "Region2"
+        assert store.get("missing") is None
+
+    def test_invalid_zones_are_skipped(self, zones):
+        zones.append(make_zone("4", "Region1", "exploded"))
+        store = ZoneStore(zones, validate=validate_zone)
+        assert len(store) == 3
+        assert store.get("4") is None
+
+    def test_store_reused_for_same_zone_list(self, zones):
+        store = zone_store_for(zones, validate=validate_zone)
+        assert zone_store_for(zones, validate=validate_zone) is store
+        assert zone_store_for(list(zones), validate=validate_zone) is not store
@@ -0,0 +1,64 @@
+import os
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from edge_cloud_management_api import server
+
+
+class TestConfig:
+    MONGO_URI = "mongodb://localhost:27017/test_db"
+    JOB_QUEUE_BACKEND = "mongo"
+
+
+@pytest.fixture(autouse=True)
+def job_store_config():
+    with patch("edge_cloud_management_api.services.deployment_jobs.config", new=TestConfig), patch.dict(os.environ):
+        yield
+
+
+@pytest.fixture(autouse=True)
+def bootstrap_indexes():
+    with patch("edge_cloud_management_api.managers.mongo_indexes.bootstrap_indexes") as bootstrap:
+        yield bootstrap
+
+
+@pytest.mark.unit
+class TestServer:
+    """
+    Test the uvicorn entry point and the worker lifespan.
+    """
+
+    def test_main_runs_the_factory_under_uvicorn(self, bootstrap_indexes):
+        with patch("edge_cloud_management_api.server.uvicorn.run") as run:
+            server.main(["--workers", "4", "--port", "9000", "--keep-alive", "10", "--max-requests", "5000", "--graceful-timeout", "15"])
+        # indexes are created once, before the workers start, not by every app build
+        bootstrap_indexes.assert_called_once_with()
+        args, kwargs = run.call_args
+        assert args == (server.APP_FACTORY,)
+        assert kwargs["factory"] is True
+        assert kwargs["workers"] == 4
+        assert kwargs["port"] == 9000
+        assert kwargs["timeout_keep_alive"] == 10
+        assert kwargs["limit_max_requests"] == 5000
+        assert kwargs["timeout_graceful_shutdown"] == 15
+
+    def test_max_requests_needs_several_workers(self):
+        with patch("edge_cloud_management_api.server.uvicorn.run") as run:
+            server.main(["--workers", "1", "--max-requests", "5000"])
+        assert run.call_args.kwargs["limit_max_requests"] is None
+
+    def test_main_refuses_a_job_store_the_workers_cannot_share(self):
+        with patch("edge_cloud_management_api.server.uvicorn.run") as run, patch.object(TestConfig, "JOB_QUEUE_BACKEND", "memory"):
+            with pytest.raises(RuntimeError):
+                server.main(["--workers", "2"])
+            server.main(["--workers", "1"])
+        run.assert_called_once()
+        assert os.environ["SERVER_WORKERS"] == "1"
+
+    def test_worker_resources_follow_the_lifespan(self):
+        with patch("edge_cloud_management_api.server.start_worker") as start, patch("edge_cloud_management_api.server.stop_worker", new=AsyncMock()) as stop:
+            with server.create_app().test_client() as client:
+                start.assert_called_once()
+                stop.assert_not_called()
+                assert client.get("/metrics").status_code == 200
+            stop.assert_awaited_once()